@@ -0,0 +1,76 @@
+"""Async database setup used when DB_ASYNC=1.
+
+Mirrors ``database.py`` on top of SQLAlchemy's AsyncEngine: asyncpg for
+Postgres and aiosqlite for the SQLite test database. The engine is created
+lazily so the async drivers are only required when the async path is
+switched on.
+"""
+
+import os
+
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+
+from .database import DATABASE_URL, env_bool, env_int, slow_query_log
+from .query_stats import track_queries
+
+
+def async_enabled() -> bool:
+    """Whether routes should be served by the async repository layer."""
+    return env_bool("DB_ASYNC", False)
+
+
+def _async_database_url(url: str) -> str:
+    """Swap the sync driver in ``url`` for its async counterpart."""
+    scheme, _, rest = url.partition("://")
+    dialect = scheme.split("+", 1)[0]
+    if dialect in ("postgresql", "postgres"):
+        return f"postgresql+asyncpg://{rest}"
+    if dialect == "sqlite":
+        return f"sqlite+aiosqlite://{rest}"
+    return url
+
+
+def _async_engine_options(url: str) -> dict:
+    """Pool settings shared with the sync engine (see ``database._engine_options``)."""
+    options: dict = {
+        "pool_pre_ping": env_bool("DB_POOL_PRE_PING", False),
+        "pool_recycle": env_int("DB_POOL_RECYCLE", -1),
+    }
+    if url.startswith("sqlite"):
+        return options
+    options.update(
+        pool_size=env_int("DB_POOL_SIZE", 5),
+        max_overflow=env_int("DB_MAX_OVERFLOW", 10),
+        pool_timeout=env_int("DB_POOL_TIMEOUT", 30),
+    )
+    statement_timeout_ms = env_int("DB_STATEMENT_TIMEOUT_MS", 0)
+    if statement_timeout_ms > 0:
+        options["connect_args"] = {"server_settings": {"statement_timeout": str(statement_timeout_ms)}}
+    return options
+
+
+ASYNC_DATABASE_URL = _async_database_url(os.getenv("ASYNC_DATABASE_URL") or DATABASE_URL)
+
+_async_engine: AsyncEngine | None = None
+_async_sessionmaker: async_sessionmaker[AsyncSession] | None = None
+
+
+def get_async_engine() -> AsyncEngine:
+    """Create the AsyncEngine on first use."""
+    global _async_engine
+    if _async_engine is None:
+        _async_engine = create_async_engine(ASYNC_DATABASE_URL, **_async_engine_options(ASYNC_DATABASE_URL))
+        track_queries(_async_engine.sync_engine, slow_query_log)
+    return _async_engine
+
+
+def AsyncSessionLocal() -> AsyncSession:
+    """Open a new AsyncSession bound to the async engine.
+
+    ``expire_on_commit`` is off because attributes cannot be lazily reloaded
+    once a response is being serialized outside the session's greenlet.
+    """
+    global _async_sessionmaker
+    if _async_sessionmaker is None:
+        _async_sessionmaker = async_sessionmaker(bind=get_async_engine(), autoflush=False, expire_on_commit=False)
+    return _async_sessionmaker()
@@ -0,0 +1,230 @@
+"""Read-through cache for rarely changing API data (currently projects).
+
+Values are stored as JSON strings so the same entries work in-process and
+in a shared Redis. The backend is chosen from the environment:
+
+- ``CACHE_BACKEND``: ``memory`` (default), ``redis`` or ``none``
+- ``CACHE_TTL_SECONDS``: entry lifetime (default 30)
+- ``CACHE_MAX_ENTRIES``: LRU capacity of the in-process backend (default 1024)
+- ``CACHE_REDIS_URL``: Redis connection URL (default ``redis://redis:6379/0``)
+
+Writes invalidate the whole namespace by moving it to a new *generation*;
+entries are keyed by the generation they were read under. A reader takes the
+generation before querying the database and stores its result under that
+generation, so a result read before a concurrent write commits lands in a
+retired generation instead of outliving the invalidation:
+
+    generation = cache.generation()
+    value = cache.get(key, generation)
+    if value is None:
+        value = <query the database>
+        cache.set(key, value, generation)
+
+Coroutines use the ``*_async`` variants of these calls.
+
+With the in-process backend invalidation only reaches the current worker, so
+run Redis when serving from several workers; other workers would otherwise
+see stale entries for up to the TTL.
+"""
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Optional
+
+from .database import env_int
+from .metrics import CACHE_EVICTIONS, CACHE_HITS, CACHE_MISSES
+
+logger = logging.getLogger(__name__)
+
+
+class CacheBackend:
+    """Interface every cache backend implements."""
+
+    def get(self, key: str) -> Optional[str]:
+        raise NotImplementedError
+
+    def set(self, key: str, value: str) -> None:
+        raise NotImplementedError
+
+    def generation(self) -> int:
+        raise NotImplementedError
+
+    def next_generation(self) -> None:
+        """Retire every current entry; they are never read again."""
+        raise NotImplementedError
+
+
+class NullCache(CacheBackend):
+    """Backend that stores nothing; every lookup is a miss."""
+
+    def get(self, key: str) -> Optional[str]:
+        return None
+
+    def set(self, key: str, value: str) -> None:
+        pass
+
+    def generation(self) -> int:
+        return 0
+
+    def next_generation(self) -> None:
+        pass
+
+
+class MemoryCache(CacheBackend):
+    """Thread-safe in-process cache with a TTL and least-recently-used eviction."""
+
+    def __init__(self, name: str, ttl: float, max_entries: int, clock: Callable[[], float] = time.monotonic):
+        self.name = name
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._clock = clock
+        self._entries: "OrderedDict[str, tuple[float, str]]" = OrderedDict()
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= self._clock():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: str) -> None:
+        with self._lock:
+            self._entries[key] = (self._clock() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                CACHE_EVICTIONS.labels(cache=self.name).inc()
+
+    def generation(self) -> int:
+        return self._generation
+
+    def next_generation(self) -> None:
+        with self._lock:
+            self._generation += 1
+            # Nothing reads the old generation again; free it now rather than by LRU
+            self._entries.clear()
+
+
+class RedisCache(CacheBackend):
+    """Cache shared by all workers through Redis; keys live under ``<name>:``."""
+
+    def __init__(self, name: str, ttl: float, client):
+        self.name = name
+        self.ttl = ttl
+        self.client = client
+
+    def get(self, key: str) -> Optional[str]:
+        value = self.client.get(f"{self.name}:{key}")
+        return value.decode("utf-8") if isinstance(value, bytes) else value
+
+    def set(self, key: str, value: str) -> None:
+        self.client.set(f"{self.name}:{key}", value, px=int(self.ttl * 1000))
+
+    def generation(self) -> int:
+        return int(self.client.get(f"{self.name}:generation") or 0)
+
+    def next_generation(self) -> None:
+        # Entries of the retired generation expire on their own within the TTL
+        self.client.incr(f"{self.name}:generation")
+
+
+class Cache:
+    """Named cache in front of a backend that records hits and misses and never fails a request.
+
+    Backend errors (e.g. Redis being down) are logged and treated as misses,
+    so the caller falls back to the database.
+    """
+
+    def __init__(self, name: str, backend: CacheBackend):
+        self.name = name
+        self.backend = backend
+
+    def generation(self) -> Optional[int]:
+        """Return the current generation, or None when the backend is unavailable (bypass the cache)."""
+        try:
+            return self.backend.generation()
+        except Exception:
+            logger.warning("Cache %s: generation lookup failed", self.name, exc_info=True)
+            return None
+
+    def get(self, key: str, generation: Optional[int]) -> Optional[str]:
+        """Return the value cached for ``key`` in ``generation`` or None on a miss."""
+        value = None
+        try:
+            if generation is not None:
+                value = self.backend.get(f"{generation}:{key}")
+        except Exception:
+            logger.warning("Cache %s: get failed", self.name, exc_info=True)
+            value = None
+        if value is None:
+            CACHE_MISSES.labels(cache=self.name).inc()
+        else:
+            CACHE_HITS.labels(cache=self.name).inc()
+        return value
+
+    def set(self, key: str, value: str, generation: Optional[int]) -> None:
+        """Store ``value`` under the generation it was read in (from :meth:`generation`)."""
+        if generation is None:
+            return
+        try:
+            self.backend.set(f"{generation}:{key}", value)
+        except Exception:
+            logger.warning("Cache %s: set failed", self.name, exc_info=True)
+
+    def invalidate(self) -> None:
+        """Retire every entry in this cache; called after writes commit."""
+        try:
+            self.backend.next_generation()
+        except Exception:
+            logger.error("Cache %s: invalidation failed", self.name, exc_info=True)
+
+    # Coroutine variants for the async repositories: a Redis round trip runs on
+    # a worker thread instead of blocking the event loop, in-process backends inline.
+
+    async def _call(self, method: Callable, *args):
+        if isinstance(self.backend, RedisCache):
+            return await asyncio.to_thread(method, *args)
+        return method(*args)
+
+    async def generation_async(self) -> Optional[int]:
+        return await self._call(self.generation)
+
+    async def get_async(self, key: str, generation: Optional[int]) -> Optional[str]:
+        return await self._call(self.get, key, generation)
+
+    async def set_async(self, key: str, value: str, generation: Optional[int]) -> None:
+        await self._call(self.set, key, value, generation)
+
+    async def invalidate_async(self) -> None:
+        await self._call(self.invalidate)
+
+
+def make_backend(name: str) -> CacheBackend:
+    """Build the backend selected by ``CACHE_BACKEND``."""
+    kind = os.getenv("CACHE_BACKEND", "memory").strip().lower()
+    ttl = float(env_int("CACHE_TTL_SECONDS", 30))
+    if kind == "none" or ttl <= 0:
+        return NullCache()
+    if kind == "redis":
+        try:
+            import redis
+        except ImportError:
+            logger.warning("CACHE_BACKEND=redis but the redis package is not installed; using memory")
+        else:
+            url = os.getenv("CACHE_REDIS_URL", "redis://redis:6379/0")
+            return RedisCache(name, ttl, redis.Redis.from_url(url, socket_timeout=0.5, socket_connect_timeout=0.5))
+    return MemoryCache(name, ttl, env_int("CACHE_MAX_ENTRIES", 1024))
+
+
+project_cache = Cache("projects", make_backend("projects"))
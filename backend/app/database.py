@@ -6,9 +6,15 @@ DATABASE_URL is explicitly provided. This keeps tests self-contained and
 fast while production/dev continue to use Postgres.
 """
 
-from sqlalchemy import create_engine, text
+from sqlalchemy import create_engine, exc, text
 from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.pool import QueuePool
 import os
+import time
+
+from .metrics import DB_POOL_CHECKOUT_TIMEOUTS, DB_POOL_CHECKOUT_WAIT, observe_db_pool
+from .query_stats import track_queries
+from .slow_queries import SlowQueryLog
 
 
 def _select_database_url() -> str:
@@ -30,16 +36,98 @@ def _select_database_url() -> str:
 
 DATABASE_URL = _select_database_url()
 
-# Provide SQLite specific connect_args
-if DATABASE_URL.startswith("sqlite"):
-    engine = create_engine(
-        DATABASE_URL,
-        connect_args={"check_same_thread": False},  # Needed for FastAPI TestClient multithreading
+
+def env_int(name: str, default: int) -> int:
+    """Read an integer setting from the environment, falling back on bad values."""
+    try:
+        return int(os.getenv(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+def env_bool(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that records how long each checkout waits for a connection."""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            DB_POOL_CHECKOUT_TIMEOUTS.inc()
+            raise
+        finally:
+            DB_POOL_CHECKOUT_WAIT.observe(time.perf_counter() - start)
+
+
+def _engine_options(url: str) -> dict:
+    """Build create_engine() keyword arguments from environment settings.
+
+    - DB_POOL_SIZE: persistent connections kept in the pool (default 5)
+    - DB_MAX_OVERFLOW: extra connections allowed under burst load (default 10)
+    - DB_POOL_TIMEOUT: seconds to wait for a free connection (default 30)
+    - DB_POOL_PRE_PING: test connections on checkout, "1"/"0" (default off)
+    - DB_POOL_RECYCLE: recycle connections older than N seconds, -1 disables (default -1)
+    - DB_STATEMENT_TIMEOUT_MS: per-connection Postgres statement_timeout, 0 disables (default 0)
+    """
+    options: dict = {
+        "pool_pre_ping": env_bool("DB_POOL_PRE_PING", False),
+        "pool_recycle": env_int("DB_POOL_RECYCLE", -1),
+    }
+    connect_args: dict = {}
+
+    if url.startswith("sqlite"):
+        connect_args["check_same_thread"] = False  # Needed for FastAPI TestClient multithreading
+        if ":memory:" in url or url in ("sqlite://", "sqlite:///"):
+            # In-memory databases use a per-thread singleton pool; sizing does not apply
+            options["connect_args"] = connect_args
+            return options
+    else:
+        statement_timeout_ms = env_int("DB_STATEMENT_TIMEOUT_MS", 0)
+        if statement_timeout_ms > 0:
+            connect_args["options"] = f"-c statement_timeout={statement_timeout_ms}"
+
+    options.update(
+        poolclass=InstrumentedQueuePool,
+        pool_size=env_int("DB_POOL_SIZE", 5),
+        max_overflow=env_int("DB_MAX_OVERFLOW", 10),
+        pool_timeout=env_int("DB_POOL_TIMEOUT", 30),
+        connect_args=connect_args,
+    )
+    return options
+
+
+def _slow_query_log() -> SlowQueryLog | None:
+    """Build the slow query log from environment settings (see ``slow_queries.py``).
+
+    - DB_SLOW_QUERY_MS: log statements taking at least this long, 0 disables (default 200)
+    - DB_SLOW_QUERY_EXPLAIN: attach the plan of slow SELECTs, "1"/"0" (default off)
+    - DB_SLOW_QUERY_EXPLAIN_INTERVAL: seconds between plans of the same statement (default 60)
+    """
+    threshold_ms = env_int("DB_SLOW_QUERY_MS", 200)
+    if threshold_ms <= 0:
+        return None
+    return SlowQueryLog(
+        threshold_ms,
+        explain=env_bool("DB_SLOW_QUERY_EXPLAIN", False),
+        explain_interval=env_int("DB_SLOW_QUERY_EXPLAIN_INTERVAL", 60),
     )
-else:
-    engine = create_engine(DATABASE_URL)
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+engine = create_engine(DATABASE_URL, **_engine_options(DATABASE_URL))
+observe_db_pool(engine.pool)
+slow_query_log = _slow_query_log()
+track_queries(engine, slow_query_log)
+
+# expire_on_commit=False: write paths return the objects they just committed, and
+# expiring them would cost a SELECT per row when the response is serialized
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
 
 Base = declarative_base()
 
@@ -61,5 +149,21 @@ def ensure_completed_at_column():
             print(f"[migration] Could not ensure completed_at column: {e}")
 
 
+def ensure_indexes():
+    """Create model-declared indexes missing from existing tables (idempotent).
+
+    ``create_all`` only emits CREATE INDEX for tables it creates, so indexes
+    added to a model later would never reach an existing database. Must run
+    after the models are imported so they are registered on ``Base.metadata``.
+    """
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            try:
+                index.create(bind=engine, checkfirst=True)
+            except Exception as e:
+                # Log but don't crash app startup
+                print(f"[migration] Could not ensure index {index.name}: {e}")
+
+
 # Attempt lightweight migration on import (skip in test mode / sqlite)
 ensure_completed_at_column()
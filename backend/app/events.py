@@ -0,0 +1,253 @@
+"""Change events for todos and projects, fanned out to streaming clients.
+
+The repositories call :func:`publish` (or :func:`publish_async` from the
+async repositories) after each committed write. Events
+carry what changed (entity, action, ids and, when known, the table
+revision) rather than full rows; clients fetch the data with
+``GET /todos/changes`` or the regular reads.
+
+Delivery goes through a transport chosen by ``EVENTS_BACKEND``:
+
+- ``memory`` (default): fan out inside this process only
+- ``redis``: Redis pub/sub on ``EVENTS_REDIS_URL``, for several workers
+- ``postgres``: LISTEN/NOTIFY on the application database; an event whose
+  id list does not fit a NOTIFY payload is sent as ``resync`` instead
+
+Subscribers each get a bounded queue (``EVENTS_QUEUE_SIZE``). A consumer
+that falls behind loses its queued events and receives a single
+``resync`` event instead, telling it to catch up through delta sync; a slow
+client therefore never holds memory or blocks publishers.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import select
+import threading
+from typing import Any, Callable, Optional
+
+from .database import DATABASE_URL, engine, env_int
+from .metrics import EVENT_SUBSCRIBERS, EVENTS_DROPPED
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "mytodoapp_events"
+
+RESYNC = {"type": "resync"}
+
+# Postgres rejects NOTIFY payloads of 8000 bytes or more, e.g. a reorder of ~1000 ids
+NOTIFY_PAYLOAD_LIMIT = 7999
+
+
+class Subscription:
+    """One consumer's bounded event queue, owned by the event loop that created it."""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, max_size: int):
+        self.loop = loop
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_size)
+
+    def deliver(self, event: dict) -> None:
+        """Enqueue ``event``; runs on the subscription's loop."""
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            dropped = 1
+            while not self.queue.empty():
+                if self.queue.get_nowait() is not RESYNC:
+                    dropped += 1
+            EVENTS_DROPPED.inc(dropped)
+            self.queue.put_nowait(RESYNC)
+
+    async def get(self) -> dict:
+        return await self.queue.get()
+
+
+class EventBroker:
+    """In-process fan-out to every subscription, safe to publish from any thread."""
+
+    def __init__(self, max_queue_size: int = 100):
+        self.max_queue_size = max_queue_size
+        self._subscriptions: set[Subscription] = set()
+        self._lock = threading.Lock()
+
+    def subscribe(self) -> Subscription:
+        """Register a subscription on the running event loop."""
+        subscription = Subscription(asyncio.get_running_loop(), self.max_queue_size)
+        with self._lock:
+            self._subscriptions.add(subscription)
+        EVENT_SUBSCRIBERS.inc()
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            if subscription not in self._subscriptions:
+                return
+            self._subscriptions.discard(subscription)
+        EVENT_SUBSCRIBERS.dec()
+
+    def fan_out(self, event: dict) -> None:
+        with self._lock:
+            subscriptions = list(self._subscriptions)
+        for subscription in subscriptions:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.deliver, event)
+            except RuntimeError:
+                # The subscriber's loop is closed
+                self.unsubscribe(subscription)
+
+
+class MemoryTransport:
+    """Delivers straight to the local broker."""
+
+    def __init__(self, broker: EventBroker):
+        self.broker = broker
+
+    def publish(self, event: dict) -> None:
+        self.broker.fan_out(event)
+
+
+class _ListenerTransport:
+    """Base for transports that publish to a shared channel and fan in on a listener thread."""
+
+    def __init__(self, broker: EventBroker):
+        self.broker = broker
+        self._listener: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+
+    def ensure_listening(self) -> None:
+        with self._start_lock:
+            if self._listener is None or not self._listener.is_alive():
+                self._listener = threading.Thread(target=self._listen_forever, name="events-listener", daemon=True)
+                self._listener.start()
+
+    def _listen_forever(self) -> None:
+        while True:
+            try:
+                self.listen(self._receive)
+            except Exception:
+                logger.warning("Event listener disconnected; retrying", exc_info=True)
+                threading.Event().wait(1.0)
+
+    def _receive(self, payload: str) -> None:
+        try:
+            self.broker.fan_out(json.loads(payload))
+        except ValueError:
+            logger.warning("Ignoring malformed event payload")
+
+    def listen(self, receive: Callable[[str], None]) -> None:
+        raise NotImplementedError
+
+
+class RedisTransport(_ListenerTransport):
+    def __init__(self, broker: EventBroker, client):
+        super().__init__(broker)
+        self.client = client
+
+    def publish(self, event: dict) -> None:
+        self.client.publish(CHANNEL, json.dumps(event))
+
+    def listen(self, receive: Callable[[str], None]) -> None:
+        pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+        pubsub.subscribe(CHANNEL)
+        for message in pubsub.listen():
+            data = message.get("data")
+            receive(data.decode("utf-8") if isinstance(data, bytes) else data)
+
+
+def notify_payload(event: dict) -> str:
+    """JSON for ``pg_notify``; an event too big for NOTIFY is sent as ``resync``."""
+    payload = json.dumps(event)
+    if len(payload.encode("utf-8")) > NOTIFY_PAYLOAD_LIMIT:
+        return json.dumps(RESYNC)
+    return payload
+
+
+class PostgresTransport(_ListenerTransport):
+    def publish(self, event: dict) -> None:
+        with engine.begin() as conn:
+            conn.exec_driver_sql("SELECT pg_notify(%s, %s)", (CHANNEL, notify_payload(event)))
+
+    def listen(self, receive: Callable[[str], None]) -> None:
+        # A dedicated connection detached from the pool, kept in autocommit for LISTEN
+        raw = engine.raw_connection()
+        raw.detach()
+        conn = raw.driver_connection
+        conn.autocommit = True
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute(f"LISTEN {CHANNEL}")
+            while True:
+                if select.select([conn], [], [], 30.0)[0]:
+                    conn.poll()
+                    while conn.notifies:
+                        receive(conn.notifies.pop(0).payload)
+        finally:
+            raw.close()
+
+
+def make_transport(broker: EventBroker):
+    kind = os.getenv("EVENTS_BACKEND", "memory").strip().lower()
+    if kind == "redis":
+        try:
+            import redis
+        except ImportError:
+            logger.warning("EVENTS_BACKEND=redis but the redis package is not installed; using memory")
+        else:
+            url = os.getenv("EVENTS_REDIS_URL", "redis://redis:6379/0")
+            return RedisTransport(broker, redis.Redis.from_url(url, socket_connect_timeout=0.5))
+    elif kind == "postgres":
+        if DATABASE_URL.startswith("postgresql"):
+            return PostgresTransport(broker)
+        logger.warning("EVENTS_BACKEND=postgres needs a Postgres DATABASE_URL; using memory")
+    return MemoryTransport(broker)
+
+
+broker = EventBroker(max_queue_size=env_int("EVENTS_QUEUE_SIZE", 100))
+transport = make_transport(broker)
+
+
+def subscribe() -> Subscription:
+    """Subscribe the running event loop to change events."""
+    if isinstance(transport, _ListenerTransport):
+        transport.ensure_listening()
+    return broker.subscribe()
+
+
+def unsubscribe(subscription: Subscription) -> None:
+    broker.unsubscribe(subscription)
+
+
+def _event(entity: str, action: str, ids: list[Any], revision: Optional[int]) -> dict:
+    event = {"type": f"{entity}.{action}", "ids": ids}
+    if revision is not None:
+        event["revision"] = revision
+    return event
+
+
+def _send(event: dict) -> None:
+    try:
+        transport.publish(event)
+    except Exception:
+        logger.warning("Could not publish %s event", event["type"], exc_info=True)
+
+
+def publish(entity: str, action: str, ids: list[Any], revision: Optional[int] = None) -> None:
+    """Announce a committed write, e.g. ``publish("todo", "updated", [todo.id], todo.revision)``.
+
+    Never raises: a failing transport is logged and the write still succeeds.
+    """
+    _send(_event(entity, action, ids, revision))
+
+
+async def publish_async(entity: str, action: str, ids: list[Any], revision: Optional[int] = None) -> None:
+    """:func:`publish` for coroutines.
+
+    The Redis and Postgres transports make a blocking network round trip, so
+    they run on a worker thread instead of stalling the event loop.
+    """
+    event = _event(entity, action, ids, revision)
+    if isinstance(transport, MemoryTransport):
+        _send(event)
+    else:
+        await asyncio.to_thread(_send, event)
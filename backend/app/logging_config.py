@@ -5,13 +5,68 @@ Structured JSON logging configuration for FastAPI.
 import json
 import logging
 import os
+import random
 import socket
 import sys
+import threading
+import time
+from collections import deque
 from datetime import datetime, timezone
-from typing import Any, Dict, Optional, Union
-
-from fastapi import FastAPI, Request
-from starlette.middleware.base import BaseHTTPMiddleware
+from typing import Any, Deque, Dict, List, Optional, Tuple, Union
+
+from fastapi import FastAPI
+from starlette.datastructures import QueryParams
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from .metrics import LOG_RECORDS_DROPPED, LOG_REQUESTS_SAMPLED_OUT
+from .query_stats import STATE_KEY as QUERY_STATS_KEY
+
+try:
+    import orjson
+except ImportError:  # optional, faster JSON encoding for log records
+    orjson = None
+
+
+# LogRecord attributes that are not copied into "metadata"
+_STANDARD_ATTRS = frozenset(
+    {
+        "name",
+        "msg",
+        "args",
+        "levelname",
+        "levelno",
+        "pathname",
+        "filename",
+        "module",
+        "exc_info",
+        "exc_text",
+        "lineno",
+        "funcName",
+        "created",
+        "asctime",
+        "msecs",
+        "relativeCreated",
+        "thread",
+        "threadName",
+        "processName",
+        "process",
+        "service",
+        "request_id",
+        "project_id",
+        "user_id",
+    }
+)
+
+
+if orjson is not None:
+
+    def _dumps_json(data: Dict[str, Any]) -> str:
+        # Values orjson cannot serialize natively fall back to str(); the
+        # stdlib encoder would raise on them instead
+        return orjson.dumps(data, default=str).decode("utf-8")
+
+else:
+    _dumps_json = json.dumps
 
 
 class JSONLogFormatter(logging.Formatter):
@@ -20,31 +75,36 @@ class JSONLogFormatter(logging.Formatter):
 
     This allows structured logging with consistent fields for better
     parsing in Elasticsearch and other log management systems.
+
+    The host name is looked up once per formatter, and records are
+    serialized with orjson when it is installed (same fields, compact
+    separators).
     """
 
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.host = socket.gethostname()
+
     def format(self, record: logging.LogRecord) -> str:
         """Format the log record as a JSON string."""
+        attrs = record.__dict__
         log_data = {
             "timestamp": datetime.now(timezone.utc).isoformat(),
-            "service": getattr(record, "service", "mytodoapp"),
+            "service": attrs.get("service", "mytodoapp"),
             "level": record.levelname,
             "message": record.getMessage(),
             "logger": record.name,
-            "host": socket.gethostname(),
+            "host": self.host,
         }
 
-        # Include request_id if available
-        request_id = getattr(record, "request_id", None)
+        # Include request_id, project_id and user_id if available
+        request_id = attrs.get("request_id")
         if request_id:
             log_data["request_id"] = request_id
-
-        # Include project_id if available
-        project_id = getattr(record, "project_id", None)
+        project_id = attrs.get("project_id")
         if project_id:
             log_data["project_id"] = project_id
-
-        # Include user_id if available
-        user_id = getattr(record, "user_id", None)
+        user_id = attrs.get("user_id")
         if user_id:
             log_data["user_id"] = user_id
 
@@ -52,71 +112,154 @@ class JSONLogFormatter(logging.Formatter):
         if record.exc_info:
             log_data["stack_trace"] = self.formatException(record.exc_info)
 
-        # Include any additional fields from record.__dict__
-        # Exclude standard LogRecord attributes to avoid duplication
-        standard_attrs = {
-            "name",
-            "msg",
-            "args",
-            "levelname",
-            "levelno",
-            "pathname",
-            "filename",
-            "module",
-            "exc_info",
-            "exc_text",
-            "lineno",
-            "funcName",
-            "created",
-            "asctime",
-            "msecs",
-            "relativeCreated",
-            "thread",
-            "threadName",
-            "processName",
-            "process",
-            "service",
-            "request_id",
-            "project_id",
-            "user_id",
-        }
-
         # Add any extra attributes as metadata
-        metadata = {}
-        for key, value in record.__dict__.items():
-            if key not in standard_attrs and not key.startswith("_"):
-                metadata[key] = value
-
+        metadata = {
+            key: value for key, value in attrs.items() if key not in _STANDARD_ATTRS and not key.startswith("_")
+        }
         if metadata:
             log_data["metadata"] = metadata
 
-        return json.dumps(log_data)
+        return _dumps_json(log_data)
 
 
 class TCPLogHandler(logging.Handler):
     """
     Custom handler that sends logs to a TCP endpoint (like Filebeat).
+
+    ``emit`` only formats the record and appends it to an in-memory queue;
+    a background thread ships queued records as newline-delimited batches
+    over one persistent connection, reconnecting with exponential backoff
+    when the endpoint goes away. The queue is bounded: when it is full the
+    oldest record is dropped and counted in ``log_records_dropped_total``,
+    so a slow or absent endpoint never blocks requests or grows memory.
+
+    At process exit (``logging.shutdown``) ``flush`` and ``close`` give up at
+    once while the endpoint is unreachable instead of stalling the exit.
     """
 
-    def __init__(self, host: str, port: int):
-        """Initialize the TCP log handler."""
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        max_queue_size: int = 10000,
+        batch_size: int = 500,
+        connect_timeout: float = 2.0,
+        max_backoff: float = 30.0,
+        close_timeout: float = 5.0,
+    ):
+        """Initialize the TCP log handler and start its writer thread."""
         super().__init__()
         self.host = host
         self.port = port
-        self.encoder = json.JSONEncoder()
+        self.batch_size = batch_size
+        self.connect_timeout = connect_timeout
+        self.max_backoff = max_backoff
+        self.close_timeout = close_timeout
+        self._queue: Deque[bytes] = deque(maxlen=max_queue_size)
+        self._pending: List[bytes] = []
+        self._sock: Optional[socket.socket] = None
+        self._closing = False
+        # Set while the endpoint is unreachable (between a failed and a successful send)
+        self._failing = False
+        self._flush_timed_out = False
+        self._wakeup = threading.Condition()
+        self._writer = threading.Thread(target=self._run, name="tcp-log-writer", daemon=True)
+        self._writer.start()
 
     def emit(self, record: logging.LogRecord) -> None:
-        """Send the log record to the TCP endpoint."""
+        """Queue the log record for the writer thread."""
         try:
             # Format the log record
-            formatted_log = self.format(record)
-
-            # Create a socket and send the log
-            with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
-                sock.connect((self.host, self.port))
-                sock.sendall(formatted_log.encode("utf-8") + b"\n")
+            line = self.format(record).encode("utf-8") + b"\n"
         except Exception:
             self.handleError(record)
+            return
+
+        with self._wakeup:
+            if len(self._queue) == self._queue.maxlen:
+                LOG_RECORDS_DROPPED.inc()
+            self._queue.append(line)
+            self._wakeup.notify_all()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until everything queued so far was sent; returns False on timeout.
+
+        Without a ``timeout`` (as ``logging.shutdown`` calls it) this waits up
+        to ``close_timeout`` but gives up at once while the endpoint is unreachable.
+        """
+        give_up_when_failing = timeout is None
+        deadline = time.monotonic() + (self.close_timeout if timeout is None else timeout)
+        with self._wakeup:
+            while self._queue or self._pending:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or (give_up_when_failing and self._failing) or not self._writer.is_alive():
+                    self._flush_timed_out = True
+                    return False
+                self._wakeup.wait(min(remaining, 0.05))
+        self._flush_timed_out = False
+        return True
+
+    def close(self) -> None:
+        """Ship what is still queued (up to ``close_timeout``), then stop the writer thread.
+
+        Skips both waits when the endpoint is unreachable or a preceding
+        ``flush`` (as in ``logging.shutdown``) already gave up; the writer is a
+        daemon thread and whatever is left is dropped.
+        """
+        if not self._flush_timed_out:
+            self.flush()
+        with self._wakeup:
+            self._closing = True
+            self._wakeup.notify_all()
+            delivering = not (self._failing or self._flush_timed_out)
+        if delivering:
+            self._writer.join(timeout=self.connect_timeout + 1)
+        super().close()
+
+    def _run(self) -> None:
+        backoff = 0.1
+        while True:
+            with self._wakeup:
+                while not self._pending and not self._queue and not self._closing:
+                    self._wakeup.wait()
+                if self._closing:
+                    break
+                if not self._pending:
+                    count = min(len(self._queue), self.batch_size)
+                    self._pending = [self._queue.popleft() for _ in range(count)]
+
+            try:
+                self._send(b"".join(self._pending))
+            except OSError:
+                # Keep the batch and retry it once the endpoint is back
+                self._disconnect()
+                with self._wakeup:
+                    self._failing = True
+                    self._wakeup.notify_all()
+                    self._wakeup.wait(backoff)
+                backoff = min(backoff * 2, self.max_backoff)
+                continue
+
+            backoff = 0.1
+            with self._wakeup:
+                self._pending = []
+                self._failing = self._flush_timed_out = False
+                self._wakeup.notify_all()
+
+        self._disconnect()
+
+    def _send(self, payload: bytes) -> None:
+        if self._sock is None:
+            self._sock = socket.create_connection((self.host, self.port), timeout=self.connect_timeout)
+        self._sock.sendall(payload)
+
+    def _disconnect(self) -> None:
+        if self._sock is not None:
+            try:
+                self._sock.close()
+            except OSError:
+                pass
+            self._sock = None
 
 
 class ElasticsearchLogHandler:
@@ -156,82 +299,187 @@ class ElasticsearchLogHandler:
         return handler
 
 
-class RequestLoggingMiddleware(BaseHTTPMiddleware):
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+def parse_route_sample_rates(value: str) -> Dict[str, float]:
+    """
+    Parse per-route sample rates such as ``"/healthz=0,/todos=0.1"``.
+
+    Keys are path prefixes matched on segment boundaries; malformed entries
+    are skipped.
+    """
+    rates: Dict[str, float] = {}
+    for entry in value.split(","):
+        prefix, sep, rate = entry.strip().partition("=")
+        if not sep or not prefix.startswith("/"):
+            continue
+        try:
+            rates[prefix.rstrip("/") or "/"] = min(max(float(rate), 0.0), 1.0)
+        except ValueError:
+            continue
+    return rates
+
+
+def _query_stats_fields(scope: Scope) -> Dict[str, Any]:
+    """``db_queries`` and ``db_time_ms`` log fields from the request's QueryStats, if any."""
+    stats = scope.get("state", {}).get(QUERY_STATS_KEY)
+    if stats is None:
+        return {}
+    return {"db_queries": stats.count, "db_time_ms": round(stats.duration_ms, 3)}
+
+
+class RequestLoggingMiddleware:
     """
     Middleware to log requests with correlation IDs and timing.
 
     This middleware logs the start and end of each request, including
-    the request_id, method, path, status code, and duration.
+    the request_id, method, path, status code, and duration. It is plain
+    ASGI middleware: the response is passed through untouched and only the
+    status code is read from the ``http.response.start`` message.
+
+    Successful requests can be sampled, globally (``LOG_SAMPLE_RATE``) or
+    per path prefix (``LOG_ROUTE_SAMPLE_RATES``); failed requests (status
+    400 and up, or an exception) and requests slower than
+    ``LOG_SLOW_REQUEST_MS`` are always logged, except on ``stream_paths``
+    (``/events`` by default) whose duration is the life of the stream.
+    ``LOG_REQUEST_MODE=completion`` drops the "Request started" line.
+    Sampled-out requests are counted in ``log_requests_sampled_out_total``.
+
+    When ``QueryStatsMiddleware`` wraps it, the completion and failure lines
+    carry ``db_queries`` and ``db_time_ms`` for the request.
     """
 
-    async def dispatch(self, request: Request, call_next):
+    def __init__(
+        self,
+        app: ASGIApp,
+        sample_rate: Optional[float] = None,
+        route_sample_rates: Optional[Dict[str, float]] = None,
+        slow_request_ms: Optional[float] = None,
+        completion_only: Optional[bool] = None,
+        stream_paths: Optional[List[str]] = None,
+    ):
+        self.app = app
+        self.sample_rate = _env_float("LOG_SAMPLE_RATE", 1.0) if sample_rate is None else sample_rate
+        if route_sample_rates is None:
+            route_sample_rates = parse_route_sample_rates(os.getenv("LOG_ROUTE_SAMPLE_RATES", ""))
+        # Longest prefix wins
+        self.route_sample_rates = sorted(route_sample_rates.items(), key=lambda item: len(item[0]), reverse=True)
+        self.slow_request_ms = _env_float("LOG_SLOW_REQUEST_MS", 1000.0) if slow_request_ms is None else slow_request_ms
+        if completion_only is None:
+            completion_only = os.getenv("LOG_REQUEST_MODE", "full").strip().lower() == "completion"
+        self.completion_only = completion_only
+        self.stream_paths = ["/events"] if stream_paths is None else stream_paths
+
+    def _sample_rule(self, path: str) -> Tuple[str, float]:
+        """Return the sampling rule (prefix, or "default") and rate for a path."""
+        for prefix, rate in self.route_sample_rates:
+            if path == prefix or path.startswith(prefix if prefix == "/" else prefix + "/"):
+                return prefix, rate
+        return "default", self.sample_rate
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """Process the request and log request information."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
         # Get start time
         start_time = datetime.now(timezone.utc)
+        method = scope["method"]
+        path = scope["path"]
 
         # Extract request_id from request state (set by RequestIDMiddleware)
-        request_id = getattr(request.state, "request_id", None)
+        request_id = scope.get("state", {}).get("request_id")
 
         # Extract project_id from request path or query params if available
-        project_id = None
-        if "project_id" in request.path_params:
-            project_id = request.path_params["project_id"]
-        elif "project_id" in request.query_params:
-            project_id = request.query_params["project_id"]
+        project_id = scope.get("path_params", {}).get("project_id")
+        if project_id is None and b"project_id" in scope.get("query_string", b""):
+            project_id = QueryParams(scope["query_string"]).get("project_id")
 
-        # Log request start
+        # Decide up front whether a successful request is logged, so both lines agree
         logger = logging.getLogger("api")
-        logger.info(
-            f"Request started: {request.method} {request.url.path}",
-            extra={
-                "request_id": request_id,
-                "project_id": project_id,
-                "http_method": request.method,
-                "path": request.url.path,
-            },
-        )
+        info_enabled = logger.isEnabledFor(logging.INFO)
+        rule, rate = self._sample_rule(path)
+        sampled = info_enabled and (rate >= 1.0 or random.random() < rate)
 
-        try:
-            # Process the request
-            response = await call_next(request)
-
-            # Calculate duration
-            duration_ms = (datetime.now(timezone.utc) - start_time).total_seconds() * 1000
-
-            # Log request completion
+        # Log request start
+        if sampled and not self.completion_only:
             logger.info(
-                f"Request completed: {request.method} {request.url.path} {response.status_code} ({duration_ms:.2f}ms)",
+                f"Request started: {method} {path}",
                 extra={
                     "request_id": request_id,
                     "project_id": project_id,
-                    "http_method": request.method,
-                    "path": request.url.path,
-                    "status_code": response.status_code,
-                    "duration_ms": duration_ms,
+                    "http_method": method,
+                    "path": path,
                 },
             )
 
-            return response
+        status_code = None
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
 
-        except Exception as exc:
+        try:
+            # Process the request
+            await self.app(scope, receive, send_wrapper)
+        except Exception:
             # Calculate duration
             duration_ms = (datetime.now(timezone.utc) - start_time).total_seconds() * 1000
 
             # Log exception
             logger.exception(
-                f"Request failed: {request.method} {request.url.path} ({duration_ms:.2f}ms)",
+                f"Request failed: {method} {path} ({duration_ms:.2f}ms)",
                 extra={
                     "request_id": request_id,
                     "project_id": project_id,
-                    "http_method": request.method,
-                    "path": request.url.path,
+                    "http_method": method,
+                    "path": path,
                     "duration_ms": duration_ms,
+                    **_query_stats_fields(scope),
                 },
             )
 
             # Re-raise the exception
             raise
 
+        if not info_enabled:
+            return
+
+        # Calculate duration
+        duration_ms = (datetime.now(timezone.utc) - start_time).total_seconds() * 1000
+
+        # Errors and slow requests are logged regardless of sampling
+        if not (
+            sampled
+            or status_code is None
+            or status_code >= 400
+            or (self.slow_request_ms > 0 and duration_ms >= self.slow_request_ms and path not in self.stream_paths)
+        ):
+            LOG_REQUESTS_SAMPLED_OUT.labels(rule=rule).inc()
+            return
+
+        # Log request completion
+        logger.info(
+            f"Request completed: {method} {path} {status_code} ({duration_ms:.2f}ms)",
+            extra={
+                "request_id": request_id,
+                "project_id": project_id,
+                "http_method": method,
+                "path": path,
+                "status_code": status_code,
+                "duration_ms": duration_ms,
+                **_query_stats_fields(scope),
+            },
+        )
+
 
 def setup_logging(service_name: str = "mytodoapp") -> None:
     """
@@ -240,9 +488,10 @@ def setup_logging(service_name: str = "mytodoapp") -> None:
     Args:
         service_name: Name of the service for logging context
     """
-    # Configure root logger
+    # Configure root logger; LOG_LEVEL takes a level name such as DEBUG or WARNING
     root_logger = logging.getLogger()
-    root_logger.setLevel(logging.INFO)
+    level = logging.getLevelName(os.getenv("LOG_LEVEL", "INFO").strip().upper())
+    root_logger.setLevel(level if isinstance(level, int) else logging.INFO)
 
     # Remove existing handlers to avoid duplication
     for handler in root_logger.handlers[:]:
@@ -1,8 +1,11 @@
 from fastapi import FastAPI
 from starlette.middleware.cors import CORSMiddleware
-from .routes import todos, projects, flaky
+from .routes import todos, projects, flaky, events
 
-from .database import engine, Base
+from .database import engine, Base, ensure_indexes
+from .migrations import run_migrations
+from .async_database import async_enabled
+from .middleware.query_stats import add_query_stats_middleware
 from .middleware.request_id import add_request_id_middleware
 from .metrics import setup_metrics
 from .logging_config import setup_logging, setup_request_logging
@@ -45,6 +48,10 @@ def create_tables_with_retry(max_retries=30, delay=1):
 
 # Create database tables with retry logic
 create_tables_with_retry()
+# One-time migrations (recorded in schema_versions), keeping request paths read-only;
+# they run before ensure_indexes() because indexes may cover columns they add
+run_migrations(engine)
+ensure_indexes()
 
 app = FastAPI(
     title="MyTodoApp API",
@@ -93,14 +100,17 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Let the SPA read pagination cursors from list responses
+    expose_headers=["X-Next-Cursor", "ETag"],
 )
 
-# Add request_id middleware (must come before request logging)
-add_request_id_middleware(app)
-
 # Add request logging middleware
 setup_request_logging(app)
 
+# Add request_id middleware; added after request logging so it wraps it and
+# the request_id is already set when the request is logged
+add_request_id_middleware(app)
+
 # Setup Prometheus metrics endpoint and middleware
 setup_metrics(
     app,
@@ -109,10 +119,21 @@ setup_metrics(
     exclude_paths=["/metrics", "/", "/docs", "/redoc", "/openapi.json"],
 )
 
-# Include API routers
-app.include_router(todos.router)
-app.include_router(projects.router)
+# Per-request SQL statement counts and DB time; outermost so the metrics and
+# request logging middleware can report them after the request
+add_query_stats_middleware(app)
+
+# Include API routers; DB_ASYNC=1 serves the same routes from the AsyncSession layer
+if async_enabled():
+    from .routes import async_projects, async_todos
+
+    app.include_router(async_todos.router)
+    app.include_router(async_projects.router)
+else:
+    app.include_router(todos.router)
+    app.include_router(projects.router)
 app.include_router(flaky.router)
+app.include_router(events.router)
 
 
 @app.get("/")
@@ -126,8 +147,6 @@ def read_root():
 
 @app.get("/healthz")
 def health_check():
-    # Log messages of different levels to demonstrate Elasticsearch integration
-    logger.debug("This is a debug message from the health check endpoint")
-    logger.info("Health check endpoint accessed")
-    logger.warning("This is a warning message from the health check endpoint")
+    # Hit by the container healthcheck every 30s; keep it out of the logs by default
+    logger.debug("Health check endpoint accessed")
     return {"status": "healthy", "Logs": "Check Elasticsearch/Kibana for logs"}
@@ -3,17 +3,25 @@ Prometheus metrics instrumentation for FastAPI.
 """
 
 import time
-from typing import Callable, List, Optional
+from functools import lru_cache
+from typing import List, Optional, Pattern, Tuple
 
 from fastapi import FastAPI, Request, Response
-from prometheus_client import Counter, Histogram, CollectorRegistry, generate_latest, CONTENT_TYPE_LATEST
-from starlette.middleware.base import BaseHTTPMiddleware
+from prometheus_client import Counter, Gauge, Histogram, CollectorRegistry, generate_latest, CONTENT_TYPE_LATEST
 from starlette.responses import Response as StarletteResponse
-from starlette.routing import Match
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from .query_stats import STATE_KEY as QUERY_STATS_KEY
 
 # Define OpenMetrics content type if not available in current prometheus_client version
 CONTENT_TYPE_OPENMETRICS = "application/openmetrics-text; version=1.0.0; charset=utf-8"
 
+# Endpoint label for requests that match no route, so 404 scans share one series
+UNMATCHED_ENDPOINT = "<unmatched>"
+
+# Number of raw paths remembered by the route template fallback
+TEMPLATE_CACHE_SIZE = 1024
+
 # Create a registry for metrics (can be default or custom)
 REGISTRY = CollectorRegistry()
 
@@ -33,52 +41,199 @@ REQUEST_DURATION = Histogram(
     buckets=[0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 0.75, 1, 2.5, 5, 10],
 )
 
+DB_QUERIES_PER_REQUEST = Histogram(
+    "db_queries_per_request",
+    "SQL statements executed while serving a request",
+    ["service", "endpoint", "method"],
+    registry=REGISTRY,
+    buckets=[0, 1, 2, 3, 5, 10, 20, 50, 100, 250],
+)
 
-class PrometheusMiddleware(BaseHTTPMiddleware):
-    """Middleware to collect metrics for each request."""
+DB_TIME_PER_REQUEST = Histogram(
+    "db_time_per_request_seconds",
+    "Time spent executing SQL statements while serving a request",
+    ["service", "endpoint", "method"],
+    registry=REGISTRY,
+    buckets=[0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5],
+)
+
+DB_SLOW_QUERIES = Counter(
+    "db_slow_queries",
+    "SQL statements slower than the DB_SLOW_QUERY_MS threshold",
+    registry=REGISTRY,
+)
+
+LOG_RECORDS_DROPPED = Counter(
+    "log_records_dropped",
+    "Log records discarded because the log shipping queue was full",
+    registry=REGISTRY,
+)
 
-    def __init__(self, app, service_name: str = "fastapi", exclude_paths: Optional[List[str]] = None):
-        super().__init__(app)
+LOG_REQUESTS_SAMPLED_OUT = Counter(
+    "log_requests_sampled_out",
+    "Successful requests whose request log lines were skipped by sampling",
+    ["rule"],
+    registry=REGISTRY,
+)
+
+CACHE_HITS = Counter(
+    "cache_hits",
+    "Lookups answered from the response cache",
+    ["cache"],
+    registry=REGISTRY,
+)
+
+CACHE_MISSES = Counter(
+    "cache_misses",
+    "Lookups that fell through the response cache to the database",
+    ["cache"],
+    registry=REGISTRY,
+)
+
+CACHE_EVICTIONS = Counter(
+    "cache_evictions",
+    "Entries evicted from the in-process cache to stay within its size limit",
+    ["cache"],
+    registry=REGISTRY,
+)
+
+EVENT_SUBSCRIBERS = Gauge(
+    "event_stream_subscribers",
+    "Clients currently connected to the change event stream",
+    registry=REGISTRY,
+)
+
+EVENTS_DROPPED = Counter(
+    "event_stream_events_dropped",
+    "Change events discarded for subscribers that fell behind (replaced by a resync event)",
+    registry=REGISTRY,
+)
+
+DB_POOL_CHECKOUT_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time spent waiting to check a connection out of the SQLAlchemy pool",
+    registry=REGISTRY,
+    buckets=[0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30],
+)
+
+DB_POOL_CHECKOUT_TIMEOUTS = Counter(
+    "db_pool_checkout_timeouts",
+    "Number of pool checkouts that gave up after the pool timeout",
+    registry=REGISTRY,
+)
+
+DB_POOL_IN_USE = Gauge(
+    "db_pool_connections_in_use",
+    "Connections currently checked out of the SQLAlchemy pool",
+    registry=REGISTRY,
+)
+
+DB_POOL_SIZE = Gauge(
+    "db_pool_size",
+    "Configured number of persistent connections in the SQLAlchemy pool",
+    registry=REGISTRY,
+)
+
+DB_POOL_OVERFLOW = Gauge(
+    "db_pool_overflow",
+    "Overflow connections currently open beyond the pool size",
+    registry=REGISTRY,
+)
+
+
+def observe_db_pool(pool) -> None:
+    """Report a SQLAlchemy QueuePool's occupancy through the pool gauges at scrape time."""
+    if not all(hasattr(pool, attr) for attr in ("checkedout", "size", "overflow")):
+        return
+    DB_POOL_IN_USE.set_function(pool.checkedout)
+    DB_POOL_SIZE.set_function(pool.size)
+    # overflow() starts at -pool_size until the pool is full; only count real overflow connections
+    DB_POOL_OVERFLOW.set_function(lambda: max(pool.overflow(), 0))
+
+
+class PrometheusMiddleware:
+    """Middleware to collect metrics for each request.
+
+    Requests on ``stream_paths`` (long-lived streams such as ``/events``) are
+    counted but kept out of the duration histogram, where their connection
+    lifetime would swamp the latency of ordinary requests.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        service_name: str = "fastapi",
+        exclude_paths: Optional[List[str]] = None,
+        stream_paths: Optional[List[str]] = None,
+    ):
+        self.app = app
         self.service_name = service_name
         self.exclude_paths = exclude_paths or ["/metrics"]
+        self.stream_paths = ["/events"] if stream_paths is None else stream_paths
+        self._route_patterns: Optional[List[Tuple[Pattern[str], str]]] = None
+        self._template_for_path = lru_cache(maxsize=TEMPLATE_CACHE_SIZE)(self._match_template)
 
-    async def dispatch(self, request: Request, call_next) -> Response:
-        # Skip metrics collection for excluded paths
-        if request.url.path in self.exclude_paths:
-            return await call_next(request)
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        # Skip metrics collection for non-HTTP traffic and excluded paths
+        if scope["type"] != "http" or scope["path"] in self.exclude_paths:
+            await self.app(scope, receive, send)
+            return
 
-        # Get route pattern or path if no matching route found
-        endpoint = self._get_endpoint(request)
-        method = request.method
+        method = scope["method"]
 
         # Start timer for request duration
-        start_time = time.time()
+        start_time = time.perf_counter()
+        status = "500"
 
-        # Process the request
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = str(message["status"])
+            await send(message)
+
+        # Process the request; an exception before the response started counts as a 500
         try:
-            response = await call_next(request)
-            status = str(response.status_code)
-        except Exception as e:
-            status = "500"
-            raise e
+            await self.app(scope, receive, send_wrapper)
         finally:
             # Record metrics
-            duration = time.time() - start_time
+            duration = time.perf_counter() - start_time
+
+            # Resolved after dispatch so the router has already recorded the matched route
+            endpoint = self._get_endpoint(scope)
 
             REQUEST_COUNT.labels(service=self.service_name, endpoint=endpoint, method=method, status=status).inc()
 
-            REQUEST_DURATION.labels(service=self.service_name, endpoint=endpoint, method=method).observe(duration)
+            if scope["path"] not in self.stream_paths:
+                REQUEST_DURATION.labels(service=self.service_name, endpoint=endpoint, method=method).observe(duration)
+
+            # Filled in by QueryStatsMiddleware when it is installed
+            stats = scope.get("state", {}).get(QUERY_STATS_KEY)
+            if stats is not None:
+                DB_QUERIES_PER_REQUEST.labels(service=self.service_name, endpoint=endpoint, method=method).observe(
+                    stats.count
+                )
+                DB_TIME_PER_REQUEST.labels(service=self.service_name, endpoint=endpoint, method=method).observe(
+                    stats.duration
+                )
 
-        return response
+    def _get_endpoint(self, scope: Scope) -> str:
+        """Get the route template for the request, e.g. ``/todos/{todo_id}``."""
+        # FastAPI routes put themselves in the scope when they match
+        route = scope.get("route")
+        if route is not None:
+            return route.path
+        return self._template_for_path(scope["app"], scope["path"])
 
-    @staticmethod
-    def _get_endpoint(request: Request) -> str:
-        """Get the request endpoint name from router match."""
-        for route in request.app.routes:
-            match, scope = route.matches(request.scope)
-            if match == Match.FULL:
-                return route.path
-        return request.url.path
+    def _match_template(self, app: ASGIApp, path: str) -> str:
+        """Fallback for plain Starlette routes and unmatched paths, cached per path."""
+        if self._route_patterns is None:
+            self._route_patterns = [
+                (route.path_regex, route.path) for route in app.routes if hasattr(route, "path_regex")
+            ]
+        for pattern, template in self._route_patterns:
+            if pattern.match(path):
+                return template
+        return UNMATCHED_ENDPOINT
 
 
 def metrics_endpoint(request: Request) -> StarletteResponse:
@@ -100,6 +255,7 @@ def setup_metrics(
     service_name: str = "fastapi",
     endpoint_path: str = "/metrics",
     exclude_paths: Optional[List[str]] = None,
+    stream_paths: Optional[List[str]] = None,
 ) -> None:
     """
     Setup Prometheus metrics collection and endpoint.
@@ -109,6 +265,7 @@ def setup_metrics(
         service_name: Name of the service for metrics labels
         endpoint_path: Path where metrics will be exposed
         exclude_paths: List of paths to exclude from metrics
+        stream_paths: Long-lived streaming paths left out of the duration histogram
     """
     # Ensure metrics endpoint is in excluded paths
     exclude_paths = exclude_paths or []
@@ -119,4 +276,6 @@ def setup_metrics(
     app.add_route(endpoint_path, metrics_endpoint)
 
     # Add the metrics middleware
-    app.add_middleware(PrometheusMiddleware, service_name=service_name, exclude_paths=exclude_paths)
+    app.add_middleware(
+        PrometheusMiddleware, service_name=service_name, exclude_paths=exclude_paths, stream_paths=stream_paths
+    )
@@ -0,0 +1,60 @@
+# Middleware that collects per-request SQL statement counts and database time
+
+import time
+from typing import Optional
+
+from fastapi import FastAPI
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from ..database import env_bool
+from ..query_stats import STATE_KEY, QueryStats, activate, deactivate
+
+SERVER_TIMING_HEADER_KEY = "Server-Timing"
+
+
+class QueryStatsMiddleware:
+    """
+    Middleware that gives each request a QueryStats for the tracked engines to fill.
+
+    The stats are stored in ``scope["state"]`` so the metrics and request
+    logging middleware can report them once the request has finished; it
+    must therefore be the outermost of the three. With ``SERVER_TIMING=1``
+    the statement count and database time so far are also sent in a
+    ``Server-Timing`` response header (visible in browser dev tools).
+    """
+
+    def __init__(self, app: ASGIApp, server_timing: Optional[bool] = None):
+        self.app = app
+        self.server_timing = env_bool("SERVER_TIMING", False) if server_timing is None else server_timing
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats()
+        scope.setdefault("state", {})[STATE_KEY] = stats
+        start_time = time.perf_counter()
+
+        async def send_with_server_timing(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers.append(SERVER_TIMING_HEADER_KEY, stats.server_timing(time.perf_counter() - start_time))
+            await send(message)
+
+        token = activate(stats)
+        try:
+            await self.app(scope, receive, send_with_server_timing if self.server_timing else send)
+        finally:
+            deactivate(token)
+
+
+def add_query_stats_middleware(app: FastAPI) -> None:
+    """
+    Add the QueryStatsMiddleware to the FastAPI application.
+
+    Args:
+        app: The FastAPI application instance
+    """
+    app.add_middleware(QueryStatsMiddleware)
@@ -1,42 +1,64 @@
 # Middleware to add request_id to every request
 
 import uuid
+from contextvars import ContextVar
 from typing import Optional
-from fastapi import FastAPI, Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.types import ASGIApp
+from fastapi import FastAPI, Request
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 REQUEST_ID_HEADER_KEY = "X-Request-Id"
+_REQUEST_ID_HEADER_RAW = REQUEST_ID_HEADER_KEY.lower().encode("latin-1")
 
+# The request ID for code without access to the request, e.g. engine event hooks
+_current_request_id: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
 
-class RequestIDMiddleware(BaseHTTPMiddleware):
+
+class RequestIDMiddleware:
     """
     Middleware to ensure each request has a unique ID in X-Request-Id header.
 
     If the header is already present, it will be preserved.
     If not, a new UUID4 will be generated and added.
-    The ID is also made available in the request state for logging.
+    The ID is also made available in the request state for logging, and
+    through current_request_id() while the request is being handled.
+
+    Implemented as plain ASGI middleware so it adds no task or stream
+    wrapping on top of the request.
     """
 
     def __init__(self, app: ASGIApp):
-        super().__init__(app)
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
 
-    async def dispatch(self, request: Request, call_next) -> Response:
         # Get request_id from header or generate a new one
-        request_id = request.headers.get(REQUEST_ID_HEADER_KEY)
+        request_id = None
+        for name, value in scope["headers"]:
+            if name == _REQUEST_ID_HEADER_RAW:
+                request_id = value.decode("latin-1")
+                break
         if not request_id:
             request_id = str(uuid.uuid4())
 
-        # Store in request state for logging
-        request.state.request_id = request_id
+        # Store in request state for logging (backs request.state.request_id)
+        scope.setdefault("state", {})["request_id"] = request_id
 
-        # Process the request
-        response = await call_next(request)
+        async def send_with_request_id(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                # Add or update the header in the response
+                headers = MutableHeaders(scope=message)
+                headers[REQUEST_ID_HEADER_KEY] = request_id
+            await send(message)
 
-        # Add or update the header in the response
-        response.headers[REQUEST_ID_HEADER_KEY] = request_id
-
-        return response
+        token = _current_request_id.set(request_id)
+        try:
+            await self.app(scope, receive, send_with_request_id)
+        finally:
+            _current_request_id.reset(token)
 
 
 def add_request_id_middleware(app: FastAPI) -> None:
@@ -60,3 +82,13 @@ def get_request_id(request: Request) -> Optional[str]:
         The request ID or None if not present
     """
     return getattr(request.state, "request_id", None)
+
+
+def current_request_id() -> Optional[str]:
+    """
+    Get the ID of the request being handled in the current context.
+
+    Returns:
+        The request ID or None outside a request
+    """
+    return _current_request_id.get()
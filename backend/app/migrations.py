@@ -0,0 +1,116 @@
+"""Versioned, run-once data migrations.
+
+Each migration is applied at most once per database: applied versions are
+recorded in the ``schema_versions`` table and skipped afterwards. Migrations
+run at application startup (see ``main.py``) and can also be applied ahead
+of a deploy with::
+
+    python -m app.migrations
+"""
+
+import logging
+from datetime import datetime, timezone
+from typing import Callable
+
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, inspect, select, text
+from sqlalchemy.engine import Connection, Engine
+
+from .models.table_version import TableVersion
+
+logger = logging.getLogger(__name__)
+
+_metadata = MetaData()
+
+schema_versions = Table(
+    "schema_versions",
+    _metadata,
+    Column("version", Integer, primary_key=True),
+    Column("name", String, nullable=False),
+    Column("applied_at", DateTime, nullable=False),
+)
+
+
+def migrate_legacy_project_statuses(conn: Connection) -> None:
+    """Convert lingering 'undone'/'done' project statuses to the current enum values.
+
+    Compares as text so Postgres does not reject the legacy literals against
+    the project_status_enum type.
+    """
+    conn.execute(text("UPDATE projects SET status='active' WHERE CAST(status AS VARCHAR)='undone'"))
+    conn.execute(text("UPDATE projects SET status='completed' WHERE CAST(status AS VARCHAR)='done'"))
+
+
+def seed_table_versions(conn: Connection) -> None:
+    """Create the per-table version counters behind the ETags, starting at 0."""
+    table = TableVersion.__table__
+    table.create(conn, checkfirst=True)
+    existing = set(conn.execute(select(table.c.name)).scalars())
+    for name in ("todos", "projects"):
+        if name not in existing:
+            conn.execute(table.insert().values(name=name, version=0))
+
+
+def add_revision_columns(conn: Connection) -> None:
+    """Add the per-row ``revision`` used by delta sync to tables created before it existed."""
+    inspector = inspect(conn)
+    for table in ("todos", "projects"):
+        if table not in inspector.get_table_names():
+            continue
+        if "revision" not in {column["name"] for column in inspector.get_columns(table)}:
+            conn.execute(text(f"ALTER TABLE {table} ADD COLUMN revision INTEGER NOT NULL DEFAULT 0"))
+
+
+def drop_pending_deadline_index(conn: Connection) -> None:
+    """Drop the pending-only deadline index; ``ix_todos_deadline`` (all dated todos) replaces it."""
+    conn.execute(text("DROP INDEX IF EXISTS ix_todos_pending_deadline"))
+
+
+# (version, name, step) in application order; never renumber or remove entries.
+MIGRATIONS: list[tuple[int, str, Callable[[Connection], None]]] = [
+    (1, "legacy_project_statuses", migrate_legacy_project_statuses),
+    (2, "table_versions", seed_table_versions),
+    (3, "revision_columns", add_revision_columns),
+    (4, "drop_pending_deadline_index", drop_pending_deadline_index),
+]
+
+
+def applied_versions(conn: Connection) -> set[int]:
+    """Return the set of migration versions already recorded for this database."""
+    return set(conn.execute(select(schema_versions.c.version)).scalars())
+
+
+def run_migrations(engine: Engine) -> list[int]:
+    """Apply pending migrations, each in its own transaction.
+
+    Returns the versions applied by this call. A failing migration is logged
+    and stops the run without being recorded, so it is retried on the next
+    startup.
+    """
+    _metadata.create_all(bind=engine, checkfirst=True)
+    with engine.connect() as conn:
+        done = applied_versions(conn)
+
+    applied = []
+    for version, name, step in MIGRATIONS:
+        if version in done:
+            continue
+        try:
+            with engine.begin() as conn:
+                step(conn)
+                conn.execute(
+                    schema_versions.insert().values(version=version, name=name, applied_at=datetime.now(timezone.utc))
+                )
+        except Exception as e:
+            # Another worker may have applied it concurrently; either way don't crash startup
+            logger.error(f"Migration {version} ({name}) failed: {e}")
+            break
+        logger.info(f"Applied migration {version} ({name})")
+        applied.append(version)
+    return applied
+
+
+if __name__ == "__main__":
+    from .database import engine
+
+    versions = run_migrations(engine)
+    print(f"Applied migrations: {versions or 'none (up to date)'}")
@@ -11,5 +11,7 @@ class Project(Base):
     description = Column(String, nullable=True)
     # Original production enum values retained in DB
     status = Column(Enum("active", "completed", "cancelled", name="project_status_enum"), default="active")
+    # projects table version (see repository/versions.py) of the last write to this row
+    revision = Column(Integer, nullable=False, default=0, server_default="0")
 
     todos = relationship("Todo", back_populates="project")
@@ -0,0 +1,11 @@
+from sqlalchemy import Column, Integer, String
+from ..database import Base
+
+
+class TableVersion(Base):
+    """Per-table change counter, bumped in the same transaction as every write to that table."""
+
+    __tablename__ = "table_versions"
+
+    name = Column(String, primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Enum, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, Enum, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from ..database import Base
 from .tag import todo_tags  # Import association table explicitly for SQLAlchemy mapper resolution
@@ -17,6 +17,34 @@ class Todo(Base):
     order = Column(Integer)
     project_id = Column(Integer, ForeignKey("projects.id"))
     completed_at = Column(DateTime, nullable=True)
+    # todos table version (see repository/versions.py) of the last write to this row
+    revision = Column(Integer, nullable=False, default=0, server_default="0")
 
     project = relationship("Project", back_populates="todos")
     tags = relationship("Tag", secondary=todo_tags, back_populates="todos")
+
+    # Back the hot list/filter queries in todo_repo.get_todos; created on existing
+    # databases by database.ensure_indexes().
+    __table_args__ = (
+        Index("ix_todos_order_id", "order", "id"),
+        Index("ix_todos_project_order_id", "project_id", "order", "id"),
+        Index("ix_todos_status_completed_at", "status", "completed_at"),
+        Index("ix_todos_revision", "revision"),
+        Index(
+            "ix_todos_deadline",
+            "deadline_at",
+            postgresql_where=deadline_at.isnot(None),
+            sqlite_where=deadline_at.isnot(None),
+        ),
+    )
+
+
+class TodoDeletion(Base):
+    """Tombstone left by a deleted todo so delta sync clients can drop it."""
+
+    __tablename__ = "todo_deletions"
+
+    id = Column(Integer, primary_key=True)
+    todo_id = Column(Integer, nullable=False)
+    revision = Column(Integer, nullable=False, index=True)
+    deleted_at = Column(DateTime, nullable=False)
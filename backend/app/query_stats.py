@@ -0,0 +1,104 @@
+"""Per-request SQL statement counts and database time.
+
+``track_queries(engine)`` hooks an engine's cursor events; every statement
+it executes is added to the :class:`QueryStats` of the request being served,
+found through a context variable that ``QueryStatsMiddleware`` sets. The
+variable is copied into the threadpool for sync endpoints and followed by
+the async engine's greenlets, so both session layers are covered. Statements
+run outside a request (startup, migrations) are not counted.
+"""
+
+import time
+import weakref
+from contextvars import ContextVar, Token
+from typing import TYPE_CHECKING, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+if TYPE_CHECKING:
+    from .slow_queries import SlowQueryLog
+
+# Key under which the middleware exposes the request's QueryStats in ``scope["state"]``
+STATE_KEY = "query_stats"
+
+_current: ContextVar[Optional["QueryStats"]] = ContextVar("query_stats", default=None)
+
+_tracked: "weakref.WeakSet[Engine]" = weakref.WeakSet()
+
+
+class QueryStats:
+    """Statements executed and seconds spent in the database for one request."""
+
+    __slots__ = ("count", "duration")
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+    def add(self, duration: float) -> None:
+        self.count += 1
+        self.duration += duration
+
+    @property
+    def duration_ms(self) -> float:
+        return self.duration * 1000
+
+    def server_timing(self, total: Optional[float] = None) -> str:
+        """``Server-Timing`` header value, e.g. ``db;dur=1.52;desc="3 queries", app;dur=4.10``."""
+        value = f'db;dur={self.duration_ms:.2f};desc="{self.count} queries"'
+        if total is not None:
+            value += f", app;dur={total * 1000:.2f}"
+        return value
+
+
+def activate(stats: QueryStats) -> Token:
+    """Make ``stats`` collect the statements run in the current context."""
+    return _current.set(stats)
+
+
+def deactivate(token: Token) -> None:
+    _current.reset(token)
+
+
+def current() -> Optional[QueryStats]:
+    return _current.get()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+def _finish(conn) -> float:
+    """Pop the statement's start time, add it to the current request's stats and return its duration."""
+    duration = time.perf_counter() - conn.info["query_start"].pop()
+    stats = _current.get()
+    if stats is not None:
+        stats.add(duration)
+    return duration
+
+
+def track_queries(engine: Engine, slow_log: Optional["SlowQueryLog"] = None) -> None:
+    """Count ``engine``'s statements and their duration into the current request's stats.
+
+    Statements slower than ``slow_log.threshold`` are also passed to
+    ``slow_log``. For an AsyncEngine pass ``async_engine.sync_engine``.
+    """
+    if engine in _tracked:
+        return
+    _tracked.add(engine)
+
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        duration = _finish(conn)
+        if slow_log is not None and duration >= slow_log.threshold:
+            slow_log.record(conn, statement, parameters, executemany, duration)
+
+    def handle_error(context):
+        # Failed statements still count, with the time they took to fail
+        conn = context.connection
+        if conn is not None and conn.info.get("query_start"):
+            _finish(conn)
+
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", after_cursor_execute)
+    event.listen(engine, "handle_error", handle_error)
@@ -1 +1 @@
-from . import todo_repo, project_repo
\ No newline at end of file
+from . import todo_repo, project_repo, async_todo_repo, async_project_repo
@@ -0,0 +1,75 @@
+"""AsyncSession counterpart of ``project_repo``."""
+
+from fastapi import HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .. import events
+from ..cache import project_cache
+from ..models.project import Project
+from ..schemas.project import Project as ProjectSchema, ProjectCreate
+from .project_repo import (
+    apply_project_update,
+    dump_project,
+    dump_projects,
+    load_project,
+    load_projects,
+    new_project,
+    pack_versioned,
+    project_key,
+    projects_key,
+    projects_statement,
+    unpack_versioned,
+)
+from .versions import PROJECTS, bump_version_async, get_version_async
+
+
+async def get_project(db: AsyncSession, project_id: int) -> tuple[int, ProjectSchema | None]:
+    key = project_key(project_id)
+    generation = await project_cache.generation_async()
+    cached = await project_cache.get_async(key, generation)
+    if cached is None:
+        version = await get_version_async(db, PROJECTS)
+        body = dump_project(await db.get(Project, project_id))
+        if body is None:
+            return version, None
+        cached = pack_versioned(version, body)
+        await project_cache.set_async(key, cached, generation)
+    version, body = unpack_versioned(cached)
+    return version, load_project(body)
+
+
+async def get_projects(
+    db: AsyncSession, skip: int = 0, limit: int = 100, cursor: str | None = None
+) -> tuple[int, list[ProjectSchema]]:
+    key = projects_key(skip, limit, cursor)
+    generation = await project_cache.generation_async()
+    cached = await project_cache.get_async(key, generation)
+    if cached is None:
+        version = await get_version_async(db, PROJECTS)
+        result = await db.execute(projects_statement(skip=skip, limit=limit, cursor=cursor))
+        cached = pack_versioned(version, dump_projects(result.scalars().all()))
+        await project_cache.set_async(key, cached, generation)
+    version, body = unpack_versioned(cached)
+    return version, load_projects(body)
+
+
+async def create_project(db: AsyncSession, project: ProjectCreate):
+    db_project = new_project(project)
+    db_project.revision = await bump_version_async(db, PROJECTS)  # type: ignore[assignment]
+    db.add(db_project)
+    await db.commit()
+    await project_cache.invalidate_async()
+    await events.publish_async("project", "created", [db_project.id], db_project.revision)
+    return db_project
+
+
+async def update_project(db: AsyncSession, project_id: int, project: ProjectCreate):
+    db_project = await db.get(Project, project_id)
+    if not db_project:
+        raise HTTPException(status_code=404, detail="Project not found")
+    apply_project_update(db_project, project)
+    db_project.revision = await bump_version_async(db, PROJECTS)  # type: ignore[assignment]
+    await db.commit()
+    await project_cache.invalidate_async()
+    await events.publish_async("project", "updated", [db_project.id], db_project.revision)
+    return db_project
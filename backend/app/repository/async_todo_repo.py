@@ -0,0 +1,221 @@
+"""AsyncSession counterpart of ``todo_repo``.
+
+Statements and row-building helpers are shared with the sync repository so
+both paths behave identically; only the I/O is awaited here.
+"""
+
+from fastapi import HTTPException
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .. import events
+from ..models.todo import Todo, TodoDeletion
+from ..schemas.todo import TodoBatch, TodoCreate, TodoUpdate
+from .pagination import nulls_sort_high
+from .todo_repo import (
+    DEFAULT_SYNC_LIMIT,
+    SNAPSHOT,
+    BatchReport,
+    apply_todo_patch,
+    apply_todo_update,
+    batch_create_rows,
+    batch_delete_statements,
+    batch_insert_statement,
+    batch_tombstone_rows,
+    bulk_orders_statement,
+    changed_todos_statement,
+    changes_page,
+    check_neighbour,
+    decode_sync_token,
+    deletions_statement,
+    gap_running_low,
+    live_ids_statement,
+    maybe_prune_todo_deletions,
+    new_todo,
+    new_tombstone,
+    patch_statement,
+    plan_move,
+    scope_ids_statement,
+    spread_ranks,
+    sync_target,
+    todos_statement,
+)
+from .versions import TODOS, TODOS_SYNC_FLOOR, bump_version_async, versions_statement
+
+
+async def get_todo(db: AsyncSession, todo_id: int):
+    return await db.get(Todo, todo_id)
+
+
+async def get_todos(db: AsyncSession, **params):
+    """List todos; accepts the same parameters as ``todo_repo.get_todos``."""
+    result = await db.execute(todos_statement(nulls_sort_high(db), **params))
+    return result.scalars().all()
+
+
+async def create_todo(db: AsyncSession, todo: TodoCreate):
+    db_todo = new_todo(todo)
+    db_todo.revision = await bump_version_async(db, TODOS)  # type: ignore[assignment]
+    db.add(db_todo)
+    await db.commit()
+    await events.publish_async("todo", "created", [db_todo.id], db_todo.revision)
+    return db_todo
+
+
+async def update_todo(db: AsyncSession, todo_id: int, todo: TodoCreate):
+    db_todo = await db.get(Todo, todo_id)
+    if not db_todo:
+        raise HTTPException(status_code=404, detail="Todo not found")
+    apply_todo_update(db_todo, todo)
+    db_todo.revision = await bump_version_async(db, TODOS)  # type: ignore[assignment]
+    await db.commit()
+    await events.publish_async("todo", "updated", [db_todo.id], db_todo.revision)
+    return db_todo
+
+
+async def patch_todo(db: AsyncSession, todo_id: int, patch: TodoUpdate):
+    stmt = patch_statement(todo_id, patch, await bump_version_async(db, TODOS))
+    if db.get_bind().dialect.update_returning:
+        row = (await db.execute(stmt.returning(*Todo.__table__.c))).mappings().first()
+    else:
+        await db.execute(stmt)
+        row = (await db.execute(select(*Todo.__table__.c).where(Todo.id == todo_id))).mappings().first()
+    if row is None:
+        raise HTTPException(status_code=404, detail="Todo not found")
+    await db.commit()
+    await events.publish_async("todo", "updated", [todo_id], row["revision"])
+    return row
+
+
+async def delete_todo(db: AsyncSession, todo_id: int):
+    db_todo = await db.get(Todo, todo_id)
+    if not db_todo:
+        raise HTTPException(status_code=404, detail="Todo not found")
+    await db.delete(db_todo)
+    tombstone = new_tombstone(db_todo, await bump_version_async(db, TODOS))
+    db.add(tombstone)
+    await db.commit()
+    await events.publish_async("todo", "deleted", [todo_id], tombstone.revision)
+    await db.run_sync(maybe_prune_todo_deletions)
+    return db_todo
+
+
+async def get_todo_changes(db: AsyncSession, since: str | None = None, limit: int = DEFAULT_SYNC_LIMIT) -> dict:
+    """Async ``todo_repo.get_todo_changes``."""
+    cursor = decode_sync_token(since) if since else SNAPSHOT
+    versions = dict((await db.execute(versions_statement(TODOS, TODOS_SYNC_FLOOR))).tuples().all())
+    target = sync_target(cursor, versions)
+    todos = (await db.execute(changed_todos_statement(target, cursor.todo_after, limit))).scalars().all()
+    deletions, live_ids = [], set()
+    if cursor.deletion_after is not None:
+        deletions = (await db.execute(deletions_statement(target, cursor.deletion_after, limit))).all()
+        if deletions:
+            live_ids = set((await db.execute(live_ids_statement({row.todo_id for row in deletions}))).scalars())
+    return changes_page(cursor, target, limit, todos, deletions, live_ids)
+
+
+async def apply_todo_batch(db: AsyncSession, batch: TodoBatch) -> dict:
+    report = BatchReport()
+    revision = await bump_version_async(db, TODOS)
+
+    if batch.create:
+        created = (await db.scalars(batch_insert_statement(), batch_create_rows(batch, revision))).all()
+        for index, db_todo in enumerate(created):
+            report.created(index, db_todo)
+
+    if batch.update:
+        ids = {patch.id for patch in batch.update}
+        rows = {db_todo.id: db_todo for db_todo in await db.scalars(select(Todo).where(Todo.id.in_(ids)))}
+        for index, patch in enumerate(batch.update):
+            db_todo = rows.get(patch.id)
+            if db_todo is None:
+                report.missing("update", index, patch.id)
+                continue
+            apply_todo_patch(db_todo, patch)
+            db_todo.revision = revision  # type: ignore[assignment]
+            report.updated(index, db_todo)
+        await db.flush()
+
+    if batch.delete:
+        ids = list(dict.fromkeys(batch.delete))
+        found = set(await db.scalars(select(Todo.id).where(Todo.id.in_(ids))))
+        if found:
+            for stmt in batch_delete_statements(list(found)):
+                await db.execute(stmt)
+            await db.execute(insert(TodoDeletion), batch_tombstone_rows(found, revision))
+        for index, todo_id in enumerate(batch.delete):
+            report.deleted(index, todo_id, todo_id in found)
+
+    await db.commit()
+    await report.publish_async(revision)
+    if batch.delete:
+        await db.run_sync(maybe_prune_todo_deletions)
+    return report.summary()
+
+
+async def _bulk_set_orders(db: AsyncSession, new_orders: dict[int, int]) -> set[int]:
+    ids = list(new_orders)
+    stmt = bulk_orders_statement(new_orders, await bump_version_async(db, TODOS))
+    if db.get_bind().dialect.update_returning:
+        return set((await db.execute(stmt.returning(Todo.id))).scalars())
+    updated = set((await db.execute(select(Todo.id).where(Todo.id.in_(ids)))).scalars())
+    await db.execute(stmt)
+    return updated
+
+
+async def update_todo_orders(db: AsyncSession, todo_orders: list[dict]):
+    """Async ``todo_repo.update_todo_orders``: one bulk UPDATE, reporting missing ids."""
+    new_orders = {todo_order["id"]: todo_order["order"] for todo_order in todo_orders}
+    if not new_orders:
+        return {"message": "Todo orders updated successfully", "updated": 0, "missing_ids": []}
+
+    updated = await _bulk_set_orders(db, new_orders)
+    await db.commit()
+    await events.publish_async("todo", "reordered", sorted(updated))
+
+    missing_ids = [todo_id for todo_id in new_orders if todo_id not in updated]
+    return {"message": "Todo orders updated successfully", "updated": len(updated), "missing_ids": missing_ids}
+
+
+async def _rebalance(db: AsyncSession, project_id: int | None) -> list[int]:
+    ids = list((await db.execute(scope_ids_statement(project_id))).scalars())
+    if ids:
+        await _bulk_set_orders(db, spread_ranks(ids))
+    return ids
+
+
+async def rebalance_orders(db: AsyncSession, project_id: int | None) -> int:
+    ids = await _rebalance(db, project_id)
+    await db.commit()
+    if ids:
+        await events.publish_async("todo", "reordered", ids)
+    return len(ids)
+
+
+async def move_todo(db: AsyncSession, todo_id: int, after_id: int | None = None, before_id: int | None = None):
+    """Async ``todo_repo.move_todo``; returns ``(todo, needs_rebalance)``."""
+    db_todo = await db.get(Todo, todo_id)
+    if not db_todo:
+        raise HTTPException(status_code=404, detail="Todo not found")
+
+    neighbours = {}
+    for neighbour_id in (after_id, before_id):
+        if neighbour_id is not None:
+            neighbour = await db.get(Todo, neighbour_id)
+            neighbours[neighbour_id] = check_neighbour(db_todo, neighbour_id, neighbour)
+
+    lower, upper, new_order = plan_move(neighbours, after_id, before_id)
+    if new_order is None:
+        await _rebalance(db, db_todo.project_id)
+        # The bulk UPDATE bypasses the identity map; lazy loads are not available here
+        for neighbour in neighbours.values():
+            await db.refresh(neighbour)
+        lower, upper, new_order = plan_move(neighbours, after_id, before_id)
+        if new_order is None:
+            raise HTTPException(status_code=400, detail="after_id must come before before_id")
+
+    db_todo.order = new_order  # type: ignore[attr-defined]
+    db_todo.revision = await bump_version_async(db, TODOS)  # type: ignore[assignment]
+    await db.commit()
+    await events.publish_async("todo", "reordered", [db_todo.id], db_todo.revision)
+    return db_todo, gap_running_low(lower, upper)
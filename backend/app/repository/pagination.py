@@ -0,0 +1,88 @@
+"""Keyset (cursor) pagination helpers shared by the repositories.
+
+A cursor is an opaque, URL-safe token encoding the sort key of the last row
+on the previous page. Seeking past it with a WHERE predicate keeps deep pages
+as cheap as the first one, unlike OFFSET which scans every skipped row.
+"""
+
+import base64
+import json
+from datetime import datetime
+from typing import Any
+
+from fastapi import HTTPException
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Session
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(*values: Any) -> str:
+    """Encode sort key values (e.g. ``(order, id)``) into an opaque cursor."""
+    payload = [v.isoformat() if isinstance(v, datetime) else v for v in values]
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def values_match(values: list, types: tuple[tuple[type, ...], ...]) -> bool:
+    """True when each of ``values`` is an instance of its entry in ``types``.
+
+    ``bool`` is an int subclass, but true/false is never a valid integer key.
+    """
+    return all(
+        isinstance(value, t) and not (isinstance(value, bool) and bool not in t) for value, t in zip(values, types)
+    )
+
+
+def decode_payload(cursor: str) -> Any:
+    """Decode the JSON inside a token produced by :func:`encode_cursor`; 400 when malformed."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        return json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (ValueError, UnicodeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def decode_cursor(cursor: str, size: int, types: tuple[tuple[type, ...], ...] | None = None) -> list:
+    """Decode a cursor produced by :func:`encode_cursor`.
+
+    Raises a 400 HTTPException when the token is malformed, does not carry
+    ``size`` sort key values or, given ``types``, a value is not an instance
+    of its entry (e.g. ``((int, type(None)), (int,))`` for ``(order, id)``).
+    A wrong type would otherwise reach the database and fail there with a 500.
+    """
+    values = decode_payload(cursor)
+    if not isinstance(values, list) or len(values) != size:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if types is not None and not values_match(values, types):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return values
+
+
+def nulls_sort_high(db: Session) -> bool:
+    """Return True when the backend sorts NULL above every value (Postgres)."""
+    return db.get_bind().dialect.name == "postgresql"
+
+
+def seek_after(column, tiebreaker, value, tiebreaker_value, descending: bool, nulls_high: bool):
+    """Build the WHERE predicate selecting rows after ``(value, tiebreaker_value)``.
+
+    ``column`` may be nullable; the predicate follows the database's native
+    NULL placement so that it matches a plain ``ORDER BY column, tiebreaker``
+    without NULLS FIRST/LAST clauses (which would defeat the indexes).
+    """
+    tie_after = tiebreaker < tiebreaker_value if descending else tiebreaker > tiebreaker_value
+    # NULLs come last when they sort high and we walk ascending, or sort low and we walk descending
+    nulls_at_end = nulls_high != descending
+
+    if value is None:
+        same_bucket = and_(column.is_(None), tie_after)
+        if nulls_at_end:
+            return same_bucket
+        return or_(same_bucket, column.is_not(None))
+
+    col_after = column < value if descending else column > value
+    predicate = or_(col_after, and_(column == value, tie_after))
+    if nulls_at_end:
+        return or_(predicate, column.is_(None))
+    return predicate
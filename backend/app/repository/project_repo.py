@@ -1,8 +1,16 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import text
+from sqlalchemy import select
 from fastapi import HTTPException
+from pydantic import TypeAdapter
+from .. import events
+from ..cache import project_cache
 from ..models.project import Project
-from ..schemas.project import ProjectCreate, ProjectStatus
+from ..schemas.project import Project as ProjectSchema, ProjectCreate, ProjectStatus
+from .pagination import decode_cursor, encode_cursor
+from .versions import PROJECTS, bump_version, get_version
+
+# Cached reads return schema objects (the same shape the routes serialize), not ORM rows
+_project_list = TypeAdapter(list[ProjectSchema])
 
 
 def _normalize_status(status: ProjectStatus | str | None) -> str | None:
@@ -32,38 +40,113 @@ def _normalize_status(status: ProjectStatus | str | None) -> str | None:
     return synonym_map.get(s, "active")
 
 
-def _migrate_legacy_statuses(db: Session):
-    """Convert any lingering 'undone'/'done' values to new DB enum values.
+def project_key(project_id: int) -> str:
+    return f"project:{project_id}"
+
+
+def projects_key(skip: int, limit: int, cursor: str | None) -> str:
+    return f"list:{skip}:{limit}:{cursor or ''}"
+
+
+def dump_project(db_project: Project | None) -> str | None:
+    return ProjectSchema.model_validate(db_project).model_dump_json() if db_project is not None else None
+
+
+def load_project(cached: str | None) -> ProjectSchema | None:
+    return ProjectSchema.model_validate_json(cached) if cached is not None else None
+
+
+def dump_projects(db_projects) -> str:
+    return _project_list.dump_json(_project_list.validate_python(db_projects, from_attributes=True)).decode()
+
+
+def load_projects(cached: str) -> list[ProjectSchema]:
+    return _project_list.validate_json(cached)
+
+
+def pack_versioned(version: int, body: str) -> str:
+    """One cache entry holding a body and the projects version it was read at."""
+    return f"{version}:{body}"
+
+
+def unpack_versioned(cached: str) -> tuple[int, str]:
+    version, body = cached.split(":", 1)
+    return int(version), body
+
 
-    Safe to run each request; will no-op when values already migrated.
+def get_project(db: Session, project_id: int) -> tuple[int, ProjectSchema | None]:
+    """Return ``(projects version, project)`` (cached); the project is None if it does not exist.
+
+    The version and the body share one cache entry, so an ETag built from the
+    version always describes the body served with it.
     """
-    try:
-        db.execute(text("UPDATE projects SET status='active' WHERE status='undone'"))
-        db.execute(text("UPDATE projects SET status='completed' WHERE status='done'"))
-        db.commit()
-    except Exception:
-        db.rollback()
+    key = project_key(project_id)
+    generation = project_cache.generation()
+    cached = project_cache.get(key, generation)
+    if cached is None:
+        version = get_version(db, PROJECTS)
+        body = dump_project(db.query(Project).filter(Project.id == project_id).first())
+        if body is None:
+            return version, None
+        cached = pack_versioned(version, body)
+        project_cache.set(key, cached, generation)
+    version, body = unpack_versioned(cached)
+    return version, load_project(body)
 
 
-def get_project(db: Session, project_id: int):
-    _migrate_legacy_statuses(db)
-    return db.query(Project).filter(Project.id == project_id).first()
+def projects_statement(skip: int = 0, limit: int = 100, cursor: str | None = None):
+    """Build the SELECT listing projects by id; ``cursor`` switches from OFFSET to keyset pagination."""
+    query = select(Project).order_by(Project.id)
+    if cursor:
+        (project_id,) = decode_cursor(cursor, 1, types=((int,),))
+        return query.where(Project.id > project_id).limit(limit)
+    return query.offset(skip).limit(limit)
 
 
-def get_projects(db: Session, skip: int = 0, limit: int = 100):
-    _migrate_legacy_statuses(db)
-    return db.query(Project).offset(skip).limit(limit).all()
+def get_projects(
+    db: Session, skip: int = 0, limit: int = 100, cursor: str | None = None
+) -> tuple[int, list[ProjectSchema]]:
+    """Return ``(projects version, one page of projects)`` (cached together, see :func:`get_project`)."""
+    key = projects_key(skip, limit, cursor)
+    generation = project_cache.generation()
+    cached = project_cache.get(key, generation)
+    if cached is None:
+        version = get_version(db, PROJECTS)
+        rows = db.execute(projects_statement(skip=skip, limit=limit, cursor=cursor)).scalars().all()
+        cached = pack_versioned(version, dump_projects(rows))
+        project_cache.set(key, cached, generation)
+    version, body = unpack_versioned(cached)
+    return version, load_projects(body)
 
 
-def create_project(db: Session, project: ProjectCreate):
-    db_project = Project(
+def project_cursor(project: Project | ProjectSchema) -> str:
+    """Return the cursor pointing just after ``project``."""
+    return encode_cursor(project.id)
+
+
+def new_project(project: ProjectCreate) -> Project:
+    """Build (but do not add) a Project row from a create payload."""
+    return Project(
         name=project.name,
         description=project.description,
         status=_normalize_status(project.status) or "active",
     )
+
+
+def apply_project_update(db_project: Project, project: ProjectCreate) -> None:
+    """Copy an update payload onto ``db_project``, keeping the status when none is given."""
+    db_project.name = project.name  # type: ignore[assignment]
+    db_project.description = project.description  # type: ignore[assignment]
+    db_project.status = _normalize_status(project.status) or db_project.status  # type: ignore[assignment]
+
+
+def create_project(db: Session, project: ProjectCreate):
+    db_project = new_project(project)
     db.add(db_project)
+    db_project.revision = bump_version(db, PROJECTS)  # type: ignore[assignment]
     db.commit()
-    db.refresh(db_project)
+    project_cache.invalidate()
+    events.publish("project", "created", [db_project.id], db_project.revision)
     return db_project
 
 
@@ -71,9 +154,9 @@ def update_project(db: Session, project_id: int, project: ProjectCreate):
     db_project = db.query(Project).filter(Project.id == project_id).first()
     if not db_project:
         raise HTTPException(status_code=404, detail="Project not found")
-    db_project.name = project.name  # type: ignore[assignment]
-    db_project.description = project.description  # type: ignore[assignment]
-    db_project.status = _normalize_status(project.status) or db_project.status  # type: ignore[assignment]
+    apply_project_update(db_project, project)
+    db_project.revision = bump_version(db, PROJECTS)  # type: ignore[assignment]
     db.commit()
-    db.refresh(db_project)
+    project_cache.invalidate()
+    events.publish("project", "updated", [db_project.id], db_project.revision)
     return db_project
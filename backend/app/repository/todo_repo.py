@@ -1,50 +1,174 @@
 from sqlalchemy.orm import Session
+from sqlalchemy import and_, case, delete, func, insert, or_, select, update
 from fastapi import HTTPException
-from ..models.todo import Todo
-from datetime import datetime, timezone
+from .. import events
+from ..database import env_int
+from ..models.todo import Todo, TodoDeletion
+from datetime import datetime, timedelta, timezone
+import logging
+import time
+from typing import NamedTuple
+from .pagination import decode_cursor, decode_payload, encode_cursor, nulls_sort_high, seek_after, values_match
+from .versions import TODOS, TODOS_SYNC_FLOOR, bump_version, set_version, versions_statement
 
 # NOTE: SQLAlchemy model attributes are dynamically instrumented; static type
 # checkers may flag direct assignment. These are valid runtime operations.
 # type: ignore
-from ..schemas.todo import TodoCreate
+from ..schemas.todo import Todo as TodoSchema, TodoBatch, TodoCreate, TodoUpdate
+from ..models.tag import todo_tags
+
+logger = logging.getLogger(__name__)
+
+
+def utcnow() -> datetime:
+    """Current UTC time as the naive value the DateTime columns store and read back."""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
 
 
 def get_todo(db: Session, todo_id: int):
     return db.query(Todo).filter(Todo.id == todo_id).first()
 
 
-def get_todos(db: Session, skip: int = 0, limit: int = 100, sort: str = "asc"):
+def todos_statement(
+    nulls_high: bool,
+    skip: int = 0,
+    limit: int = 100,
+    sort: str = "asc",
+    cursor: str | None = None,
+    order_by: str = "order",
+    status: str | None = None,
+    status_ne: str | None = None,
+    project_id: int | None = None,
+    inbox: bool = False,
+    scheduled_from: datetime | None = None,
+    scheduled_before: datetime | None = None,
+    deadline_from: datetime | None = None,
+    deadline_before: datetime | None = None,
+    completed_from: datetime | None = None,
+    completed_before: datetime | None = None,
+):
+    """Build the SELECT listing todos sorted by ``(order, id)`` or ``(completed_at, id)``.
+
+    All filters are pushed into SQL. ``status_ne`` excludes one status (todos
+    without a status are kept). ``inbox=True`` selects todos without a
+    project and takes precedence over ``project_id``. Date ranges are
+    inclusive of ``*_from`` and exclusive of ``*_before``.
+
+    When ``cursor`` is given the page starts right after the row it encodes
+    (keyset pagination) and ``skip`` is ignored; otherwise OFFSET is used for
+    backwards compatibility. ``nulls_high`` is the dialect's NULL placement
+    (see :func:`nulls_sort_high`) so cursors seek consistently with ORDER BY.
+    """
+    base_query = select(Todo)
+
+    if status is not None:
+        base_query = base_query.where(Todo.status == status)
+    if status_ne is not None:
+        base_query = base_query.where(or_(Todo.status != status_ne, Todo.status.is_(None)))
+    if inbox:
+        base_query = base_query.where(Todo.project_id.is_(None))
+    elif project_id is not None:
+        base_query = base_query.where(Todo.project_id == project_id)
+    for column, lower, upper in (
+        (Todo.scheduled_at, scheduled_from, scheduled_before),
+        (Todo.deadline_at, deadline_from, deadline_before),
+        (Todo.completed_at, completed_from, completed_before),
+    ):
+        if lower is not None:
+            base_query = base_query.where(column >= lower)
+        if upper is not None:
+            base_query = base_query.where(column < upper)
+
     # Order primary by id to reflect creation order; 'order' is secondary for project-specific display.
-    base_query = db.query(Todo)
-    if sort == "desc":
-        base_query = base_query.order_by(Todo.order.desc(), Todo.id.desc())
+    descending = sort == "desc"
+    sort_column = Todo.completed_at if order_by == "completed_at" else Todo.order
+    if descending:
+        base_query = base_query.order_by(sort_column.desc(), Todo.id.desc())
     else:
-        base_query = base_query.order_by(Todo.order, Todo.id)
-    return base_query.offset(skip).limit(limit).all()
+        base_query = base_query.order_by(sort_column, Todo.id)
+    if cursor:
+        key_type = str if order_by == "completed_at" else int
+        key, todo_id = decode_cursor(cursor, 2, types=((key_type, type(None)), (int,)))
+        if order_by == "completed_at" and key is not None:
+            try:
+                key = datetime.fromisoformat(key)
+            except ValueError:
+                raise HTTPException(status_code=400, detail="Invalid cursor")
+        base_query = base_query.where(
+            seek_after(sort_column, Todo.id, key, todo_id, descending=descending, nulls_high=nulls_high)
+        )
+        return base_query.limit(limit)
+    return base_query.offset(skip).limit(limit)
 
 
-def create_todo(db: Session, todo: TodoCreate):
-    db_todo = Todo(
-        title=todo.title,
-        description=todo.description,
-        scheduled_at=todo.scheduled_at,
-        deadline_at=todo.deadline_at,
-        priority=todo.priority,
-        status=todo.status,
-        order=todo.order,
-        project_id=todo.project_id,
-        completed_at=(datetime.utcnow() if todo.status == "completed" else None),
+def get_todos(
+    db: Session,
+    skip: int = 0,
+    limit: int = 100,
+    sort: str = "asc",
+    cursor: str | None = None,
+    order_by: str = "order",
+    status: str | None = None,
+    status_ne: str | None = None,
+    project_id: int | None = None,
+    inbox: bool = False,
+    scheduled_from: datetime | None = None,
+    scheduled_before: datetime | None = None,
+    deadline_from: datetime | None = None,
+    deadline_before: datetime | None = None,
+    completed_from: datetime | None = None,
+    completed_before: datetime | None = None,
+):
+    """List todos; see :func:`todos_statement` for the filters and pagination."""
+    stmt = todos_statement(
+        nulls_sort_high(db),
+        skip=skip,
+        limit=limit,
+        sort=sort,
+        cursor=cursor,
+        order_by=order_by,
+        status=status,
+        status_ne=status_ne,
+        project_id=project_id,
+        inbox=inbox,
+        scheduled_from=scheduled_from,
+        scheduled_before=scheduled_before,
+        deadline_from=deadline_from,
+        deadline_before=deadline_before,
+        completed_from=completed_from,
+        completed_before=completed_before,
     )
-    db.add(db_todo)
-    db.commit()
-    db.refresh(db_todo)
-    return db_todo
+    return db.execute(stmt).scalars().all()
 
 
-def update_todo(db: Session, todo_id: int, todo: TodoCreate):
-    db_todo = db.query(Todo).filter(Todo.id == todo_id).first()
-    if not db_todo:
-        raise HTTPException(status_code=404, detail="Todo not found")
+def todo_cursor(todo: Todo, order_by: str = "order") -> str:
+    """Return the cursor pointing just after ``todo`` in the given sort."""
+    key = todo.completed_at if order_by == "completed_at" else todo.order
+    return encode_cursor(key, todo.id)
+
+
+def todo_values(todo: TodoCreate) -> dict:
+    """Column values for a new Todo row from a create payload."""
+    return {
+        "title": todo.title,
+        "description": todo.description,
+        "scheduled_at": todo.scheduled_at,
+        "deadline_at": todo.deadline_at,
+        "priority": todo.priority,
+        "status": todo.status,
+        "order": todo.order,
+        "project_id": todo.project_id,
+        "completed_at": (utcnow() if todo.status == "completed" else None),
+    }
+
+
+def new_todo(todo: TodoCreate) -> Todo:
+    """Build (but do not add) a Todo row from a create payload."""
+    return Todo(**todo_values(todo))
+
+
+def apply_todo_update(db_todo: Todo, todo: TodoCreate) -> None:
+    """Copy a full update payload onto ``db_todo``, maintaining ``completed_at``."""
     db_todo.title = todo.title  # type: ignore[attr-defined]
     db_todo.description = todo.description  # type: ignore[attr-defined]
     db_todo.scheduled_at = todo.scheduled_at  # type: ignore[attr-defined]
@@ -56,32 +180,567 @@ def update_todo(db: Session, todo_id: int, todo: TodoCreate):
     db_todo.project_id = todo.project_id  # type: ignore[attr-defined]
     # Auto timestamp completed_at when transitioning to completed; clear if leaving
     if prev_status != "completed" and todo.status == "completed" and not db_todo.completed_at:  # type: ignore[attr-defined]
-        db_todo.completed_at = datetime.now(timezone.utc)  # type: ignore[attr-defined]
+        db_todo.completed_at = utcnow()  # type: ignore[attr-defined]
     elif todo.status != "completed":
         db_todo.completed_at = None  # type: ignore[attr-defined]
+
+
+def apply_todo_patch(db_todo: Todo, patch: TodoUpdate) -> None:
+    """Copy only the fields set on ``patch`` onto ``db_todo``, maintaining ``completed_at``."""
+    fields = patch.model_dump(exclude_unset=True, exclude={"id"})
+    prev_status = db_todo.status
+    for name, value in fields.items():
+        setattr(db_todo, name, value)
+    if "status" in fields:
+        status = fields["status"]
+        if prev_status != "completed" and status == "completed" and not db_todo.completed_at:  # type: ignore[attr-defined]
+            db_todo.completed_at = utcnow()  # type: ignore[attr-defined]
+        elif status != "completed":
+            db_todo.completed_at = None  # type: ignore[attr-defined]
+
+
+def create_todo(db: Session, todo: TodoCreate):
+    db_todo = new_todo(todo)
+    db.add(db_todo)
+    db_todo.revision = bump_version(db, TODOS)  # type: ignore[assignment]
     db.commit()
-    db.refresh(db_todo)
+    events.publish("todo", "created", [db_todo.id], db_todo.revision)
     return db_todo
 
 
+def update_todo(db: Session, todo_id: int, todo: TodoCreate):
+    db_todo = db.query(Todo).filter(Todo.id == todo_id).first()
+    if not db_todo:
+        raise HTTPException(status_code=404, detail="Todo not found")
+    apply_todo_update(db_todo, todo)
+    db_todo.revision = bump_version(db, TODOS)  # type: ignore[assignment]
+    db.commit()
+    events.publish("todo", "updated", [db_todo.id], db_todo.revision)
+    return db_todo
+
+
+def patch_values(patch: TodoUpdate, revision: int) -> dict:
+    """SET clause for a partial update: the supplied fields, ``revision`` and the ``completed_at`` transition.
+
+    Completing keeps an existing ``completed_at`` and otherwise stamps it now;
+    any other status clears it. The CASE reads the row's pre-update values.
+    """
+    values = patch.model_dump(exclude_unset=True, exclude={"id"})
+    if "status" in values:
+        if values["status"] == "completed":
+            values["completed_at"] = case(
+                (
+                    and_(Todo.completed_at.is_(None), Todo.status.is_distinct_from("completed")),
+                    utcnow(),
+                ),
+                else_=Todo.completed_at,
+            )
+        else:
+            values["completed_at"] = None
+    values["revision"] = revision
+    return values
+
+
+def patch_statement(todo_id: int, patch: TodoUpdate, revision: int):
+    """One ``UPDATE todos SET <supplied columns> WHERE id = :id``."""
+    return (
+        update(Todo)
+        .where(Todo.id == todo_id)
+        .values(patch_values(patch, revision))
+        .execution_options(synchronize_session=False)
+    )
+
+
+def patch_todo(db: Session, todo_id: int, patch: TodoUpdate):
+    """Write only the fields set on ``patch`` and return the updated row.
+
+    Uses UPDATE ... RETURNING where the database supports it, so the write
+    and the read-back are a single statement.
+    """
+    stmt = patch_statement(todo_id, patch, bump_version(db, TODOS))
+    if db.get_bind().dialect.update_returning:
+        row = db.execute(stmt.returning(*Todo.__table__.c)).mappings().first()
+    else:
+        db.execute(stmt)
+        row = db.execute(select(*Todo.__table__.c).where(Todo.id == todo_id)).mappings().first()
+    if row is None:
+        raise HTTPException(status_code=404, detail="Todo not found")
+    db.commit()
+    events.publish("todo", "updated", [todo_id], row["revision"])
+    return row
+
+
 def delete_todo(db: Session, todo_id: int):
     db_todo = db.query(Todo).filter(Todo.id == todo_id).first()
     if not db_todo:
         raise HTTPException(status_code=404, detail="Todo not found")
     db.delete(db_todo)
+    tombstone = new_tombstone(db_todo, bump_version(db, TODOS))
+    db.add(tombstone)
     db.commit()
+    events.publish("todo", "deleted", [todo_id], tombstone.revision)
+    maybe_prune_todo_deletions(db)
     return db_todo
 
 
+def new_tombstone(db_todo: Todo, revision: int) -> TodoDeletion:
+    """Build (but do not add) the deletion log entry for ``db_todo``."""
+    return TodoDeletion(todo_id=db_todo.id, revision=revision, deleted_at=utcnow())
+
+
+# Page size of GET /todos/changes when the client does not ask for one, and its upper bound
+DEFAULT_SYNC_LIMIT = 1000
+MAX_SYNC_LIMIT = 10000
+# Tombstones are kept at least this long; older sync tokens get a 410 and must resync
+SYNC_RETENTION_DAYS = env_int("SYNC_RETENTION_DAYS", 30)
+# How often (per process) a delete also prunes expired tombstones
+SYNC_PRUNE_INTERVAL_SECONDS = 3600
+_next_prune = 0.0
+
+
+class SyncCursor(NamedTuple):
+    """Where a sync pass stands.
+
+    ``target`` is the todos version the pass converges on (None until the
+    first page reads it); ``todo_after`` and ``deletion_after`` are the
+    ``(revision, id)`` keyset positions already returned in each stream, with
+    a None id meaning "after the whole revision". ``deletion_after`` is None
+    for a full snapshot, which needs no deletions.
+    """
+
+    target: int | None
+    todo_after: tuple[int, int | None]
+    deletion_after: tuple[int, int | None] | None
+
+
+SNAPSHOT = SyncCursor(None, (-1, None), None)
+
+_PAGE_TOKEN_TYPES = ((int,), (int,), (int, type(None)), (int, type(None)), (int, type(None)))
+
+
+def encode_sync_token(version: int) -> str:
+    """Token of a finished pass: everything up to todos ``version`` has been seen."""
+    return encode_cursor(version)
+
+
+def encode_sync_page_token(cursor: SyncCursor) -> str:
+    """Token continuing an unfinished pass on its next page."""
+    return encode_cursor(cursor.target, *cursor.todo_after, *(cursor.deletion_after or (None, None)))
+
+
+def decode_sync_token(token: str) -> SyncCursor:
+    values = decode_payload(token)
+    if isinstance(values, list) and len(values) == 1 and values_match(values, ((int,),)):
+        (version,) = values
+        return SyncCursor(None, (version, None), (version, None))
+    if isinstance(values, list) and len(values) == 5 and values_match(values, _PAGE_TOKEN_TYPES):
+        target, todo_revision, todo_id, deletion_revision, deletion_id = values
+        deletion_after = None if deletion_revision is None else (deletion_revision, deletion_id)
+        return SyncCursor(target, (todo_revision, todo_id), deletion_after)
+    raise HTTPException(status_code=400, detail="Invalid sync token")
+
+
+def after_position(revision_column, id_column, position: tuple[int, int | None]):
+    revision, last_id = position
+    if last_id is None:
+        return revision_column > revision
+    return or_(revision_column > revision, and_(revision_column == revision, id_column > last_id))
+
+
+def changed_todos_statement(target: int, after: tuple[int, int | None], limit: int):
+    """Up to ``limit + 1`` todos written after ``after`` and no later than version ``target``, oldest first."""
+    return (
+        select(Todo)
+        .where(Todo.revision <= target, after_position(Todo.revision, Todo.id, after))
+        .order_by(Todo.revision, Todo.id)
+        .limit(limit + 1)
+    )
+
+
+def deletions_statement(target: int, after: tuple[int, int | None], limit: int):
+    """Up to ``limit + 1`` tombstones after ``after`` and no later than version ``target``, oldest first."""
+    return (
+        select(TodoDeletion.revision, TodoDeletion.id, TodoDeletion.todo_id)
+        .where(TodoDeletion.revision <= target, after_position(TodoDeletion.revision, TodoDeletion.id, after))
+        .order_by(TodoDeletion.revision, TodoDeletion.id)
+        .limit(limit + 1)
+    )
+
+
+def live_ids_statement(ids):
+    return select(Todo.id).where(Todo.id.in_(ids))
+
+
+def sync_target(cursor: SyncCursor, versions: dict[str, int]) -> int:
+    """The version this pass converges on, or 410 when tombstones it still needs were pruned."""
+    floor = versions.get(TODOS_SYNC_FLOOR, 0)
+    if cursor.deletion_after is not None and cursor.deletion_after[0] < floor:
+        raise HTTPException(status_code=410, detail="Sync token expired; fetch a full snapshot without a token")
+    return cursor.target if cursor.target is not None else versions.get(TODOS, 0)
+
+
+def changes_page(cursor: SyncCursor, target: int, limit: int, todos, deletions, live_ids) -> dict:
+    """Assemble a ``TodoChanges`` page from up to ``limit + 1`` rows of each stream.
+
+    Deleted ids whose todo exists again (reused ids) are not reported; the
+    live row is, or will be, sent as an upsert.
+    """
+    has_more = len(todos) > limit or len(deletions) > limit
+    todos, deletions = todos[:limit], deletions[:limit]
+    if has_more:
+        token = encode_sync_page_token(
+            SyncCursor(
+                target,
+                (todos[-1].revision, todos[-1].id) if todos else cursor.todo_after,
+                (deletions[-1].revision, deletions[-1].id) if deletions else cursor.deletion_after,
+            )
+        )
+    else:
+        token = encode_sync_token(target)
+    return {
+        "todos": todos,
+        "deleted_ids": list(dict.fromkeys(row.todo_id for row in deletions if row.todo_id not in live_ids)),
+        "token": token,
+        "has_more": has_more,
+    }
+
+
+def get_todo_changes(db: Session, since: str | None = None, limit: int = DEFAULT_SYNC_LIMIT) -> dict:
+    """One page of the todos created or updated, and ids deleted, since a sync token.
+
+    Without a token every todo is returned. A pass converges on the table
+    version read *before* the rows: versions are bumped under the counter's
+    row lock and so become visible in order, meaning everything up to it has
+    been seen. While ``has_more`` is set, ``token`` continues the same pass;
+    writes made meanwhile are left to the next one. Rows may be reported
+    again next time, which clients treat as an idempotent upsert.
+    """
+    cursor = decode_sync_token(since) if since else SNAPSHOT
+    target = sync_target(cursor, dict(db.execute(versions_statement(TODOS, TODOS_SYNC_FLOOR)).tuples().all()))
+    todos = db.execute(changed_todos_statement(target, cursor.todo_after, limit)).scalars().all()
+    deletions, live_ids = [], set()
+    if cursor.deletion_after is not None:
+        deletions = db.execute(deletions_statement(target, cursor.deletion_after, limit)).all()
+        if deletions:
+            live_ids = set(db.execute(live_ids_statement({row.todo_id for row in deletions})).scalars())
+    return changes_page(cursor, target, limit, todos, deletions, live_ids)
+
+
+def expired_deletions_statement(cutoff: datetime):
+    """Highest revision among tombstones older than ``cutoff``."""
+    return select(func.max(TodoDeletion.revision)).where(TodoDeletion.deleted_at < cutoff)
+
+
+def prune_todo_deletions(db: Session, now: datetime | None = None) -> int:
+    """Drop tombstones older than ``SYNC_RETENTION_DAYS`` and raise the sync floor past them.
+
+    Returns how many were removed. Tokens older than the floor get a 410 from
+    :func:`get_todo_changes`, since deletions they never saw are gone.
+    """
+    cutoff = (now or utcnow()) - timedelta(days=SYNC_RETENTION_DAYS)
+    floor = db.execute(expired_deletions_statement(cutoff)).scalar()
+    if floor is None:
+        return 0
+    removed = db.execute(delete(TodoDeletion).where(TodoDeletion.revision <= floor)).rowcount
+    set_version(db, TODOS_SYNC_FLOOR, floor)
+    db.commit()
+    return removed
+
+
+def maybe_prune_todo_deletions(db: Session) -> None:
+    """Run :func:`prune_todo_deletions` at most once per ``SYNC_PRUNE_INTERVAL_SECONDS`` in this process.
+
+    Called after deletes, the only writes that add tombstones. Failures are
+    logged and left for the next attempt; they never fail the request.
+    """
+    global _next_prune
+    now = time.monotonic()
+    if now < _next_prune:
+        return
+    _next_prune = now + SYNC_PRUNE_INTERVAL_SECONDS
+    try:
+        removed = prune_todo_deletions(db)
+    except Exception as e:
+        db.rollback()
+        logger.warning(f"Could not prune todo tombstones: {e}")
+        return
+    if removed:
+        logger.info(f"Pruned {removed} todo tombstones older than {SYNC_RETENTION_DAYS} days")
+
+
+def batch_insert_statement():
+    """Bulk INSERT returning the new rows in parameter order (executemany with RETURNING)."""
+    return insert(Todo).returning(Todo, sort_by_parameter_order=True)
+
+
+def batch_create_rows(batch: TodoBatch, revision: int) -> list[dict]:
+    return [{**todo_values(todo), "revision": revision} for todo in batch.create]
+
+
+def batch_delete_statements(ids: list[int]):
+    """DELETEs for the todos' tag links and the todos themselves (Core deletes skip ORM cascades)."""
+    return (
+        delete(todo_tags).where(todo_tags.c.todo_id.in_(ids)),
+        delete(Todo).where(Todo.id.in_(ids)).execution_options(synchronize_session=False),
+    )
+
+
+def batch_tombstone_rows(ids, revision: int) -> list[dict]:
+    deleted_at = utcnow()
+    return [{"todo_id": todo_id, "revision": revision, "deleted_at": deleted_at} for todo_id in ids]
+
+
+class BatchReport:
+    """Collects the per-item results and changed ids of a batch."""
+
+    def __init__(self):
+        self.results: list[dict] = []
+        self.created_ids: list[int] = []
+        self.updated_ids: list[int] = []
+        self.deleted_ids: list[int] = []
+
+    def created(self, index: int, db_todo: Todo) -> None:
+        self.created_ids.append(db_todo.id)
+        self.results.append(
+            {"op": "create", "index": index, "id": db_todo.id, "status": 201, "todo": TodoSchema.model_validate(db_todo)}
+        )
+
+    def updated(self, index: int, db_todo: Todo) -> None:
+        if db_todo.id not in self.updated_ids:
+            self.updated_ids.append(db_todo.id)
+        self.results.append(
+            {"op": "update", "index": index, "id": db_todo.id, "status": 200, "todo": TodoSchema.model_validate(db_todo)}
+        )
+
+    def deleted(self, index: int, todo_id: int, found: bool) -> None:
+        if found and todo_id not in self.deleted_ids:
+            self.deleted_ids.append(todo_id)
+        result = {"op": "delete", "index": index, "id": todo_id, "status": 200 if found else 404}
+        if not found:
+            result["detail"] = "Todo not found"
+        self.results.append(result)
+
+    def missing(self, op: str, index: int, todo_id: int) -> None:
+        self.results.append({"op": op, "index": index, "id": todo_id, "status": 404, "detail": "Todo not found"})
+
+    def changes(self) -> list[tuple[str, list[int]]]:
+        actions = (("created", self.created_ids), ("updated", self.updated_ids), ("deleted", self.deleted_ids))
+        return [(action, ids) for action, ids in actions if ids]
+
+    def publish(self, revision: int) -> None:
+        for action, ids in self.changes():
+            events.publish("todo", action, ids, revision)
+
+    async def publish_async(self, revision: int) -> None:
+        for action, ids in self.changes():
+            await events.publish_async("todo", action, ids, revision)
+
+    def summary(self) -> dict:
+        return {
+            "created": len(self.created_ids),
+            "updated": len(self.updated_ids),
+            "deleted": len(self.deleted_ids),
+            "results": self.results,
+        }
+
+
+def apply_todo_batch(db: Session, batch: TodoBatch) -> dict:
+    """Apply creates, then partial updates, then deletes in one transaction.
+
+    Creates are one executemany INSERT ... RETURNING, updates load their rows
+    with one SELECT and flush together, and deletes are one DELETE. Unknown
+    ids are reported per item with status 404 and do not abort the batch;
+    any database error rolls the whole batch back.
+    """
+    report = BatchReport()
+    revision = bump_version(db, TODOS)
+
+    if batch.create:
+        created = db.scalars(batch_insert_statement(), batch_create_rows(batch, revision)).all()
+        for index, db_todo in enumerate(created):
+            report.created(index, db_todo)
+
+    if batch.update:
+        ids = {patch.id for patch in batch.update}
+        rows = {db_todo.id: db_todo for db_todo in db.scalars(select(Todo).where(Todo.id.in_(ids)))}
+        for index, patch in enumerate(batch.update):
+            db_todo = rows.get(patch.id)
+            if db_todo is None:
+                report.missing("update", index, patch.id)
+                continue
+            apply_todo_patch(db_todo, patch)
+            db_todo.revision = revision  # type: ignore[assignment]
+            report.updated(index, db_todo)
+        db.flush()
+
+    if batch.delete:
+        ids = list(dict.fromkeys(batch.delete))
+        found = set(db.scalars(select(Todo.id).where(Todo.id.in_(ids))))
+        if found:
+            for stmt in batch_delete_statements(list(found)):
+                db.execute(stmt)
+            db.execute(insert(TodoDeletion), batch_tombstone_rows(found, revision))
+        for index, todo_id in enumerate(batch.delete):
+            report.deleted(index, todo_id, todo_id in found)
+
+    db.commit()
+    report.publish(revision)
+    if batch.delete:
+        maybe_prune_todo_deletions(db)
+    return report.summary()
+
+
+# Spacing between consecutive ranks after a rebalance; a move takes the midpoint
+# of its neighbours, so a run of ~10 moves into the same slot fits before the
+# gap is exhausted and the list has to be renumbered.
+ORDER_GAP = 1024
+
+
+def bulk_orders_statement(new_orders: dict[int, int], revision: int):
+    """One ``UPDATE ... SET order = CASE id ...`` writing every ``{id: order}`` at ``revision``."""
+    return (
+        update(Todo)
+        .where(Todo.id.in_(list(new_orders)))
+        .values(order=case(new_orders, value=Todo.id), revision=revision)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def _bulk_set_orders(db: Session, new_orders: dict[int, int]) -> set[int]:
+    """Write ``{id: order}`` in one statement and return the ids that matched."""
+    ids = list(new_orders)
+    stmt = bulk_orders_statement(new_orders, bump_version(db, TODOS))
+    if db.get_bind().dialect.update_returning:
+        return set(db.execute(stmt.returning(Todo.id)).scalars())
+    updated = set(db.execute(select(Todo.id).where(Todo.id.in_(ids))).scalars())
+    db.execute(stmt)
+    return updated
+
+
 def update_todo_orders(db: Session, todo_orders: list[dict]):
     """
     Update the order of multiple todos
     todo_orders: list of {"id": int, "order": int}
+
+    All rows are written by a single ``UPDATE ... SET order = CASE id ...``
+    in one transaction. Ids that do not exist are reported back in
+    ``missing_ids`` instead of being silently skipped.
+    """
+    new_orders = {todo_order["id"]: todo_order["order"] for todo_order in todo_orders}
+    if not new_orders:
+        return {"message": "Todo orders updated successfully", "updated": 0, "missing_ids": []}
+
+    updated = _bulk_set_orders(db, new_orders)
+    db.commit()
+    events.publish("todo", "reordered", sorted(updated))
+
+    missing_ids = [todo_id for todo_id in new_orders if todo_id not in updated]
+    return {"message": "Todo orders updated successfully", "updated": len(updated), "missing_ids": missing_ids}
+
+
+def scope_ids_statement(project_id: int | None):
+    """Ids of a project's todos (or the inbox when ``project_id`` is None) in display order."""
+    scope = Todo.project_id.is_(None) if project_id is None else Todo.project_id == project_id
+    return select(Todo.id).where(scope).order_by(Todo.order, Todo.id)
+
+
+def spread_ranks(ids: list[int]) -> dict[int, int]:
+    """Evenly gapped ranks for ``ids`` in their current order."""
+    return {todo_id: (n + 1) * ORDER_GAP for n, todo_id in enumerate(ids)}
+
+
+def _rebalance(db: Session, project_id: int | None) -> list[int]:
+    """Renumber a project's todos to ``ORDER_GAP`` multiples, keeping their current order; returns their ids."""
+    ids = list(db.execute(scope_ids_statement(project_id)).scalars())
+    if ids:
+        _bulk_set_orders(db, spread_ranks(ids))
+        # The bulk UPDATE bypasses the identity map; reload ranks on next access
+        db.expire_all()
+    return ids
+
+
+def rebalance_orders(db: Session, project_id: int | None) -> int:
+    """Spread a project's ranks back out; returns the number of renumbered todos."""
+    ids = _rebalance(db, project_id)
+    db.commit()
+    if ids:
+        events.publish("todo", "reordered", ids)
+    return len(ids)
+
+
+def rank_between(lower: int | None, upper: int | None) -> int | None:
+    """Pick a rank strictly between two neighbour ranks, or None when no integer fits."""
+    if lower is None and upper is None:
+        return ORDER_GAP
+    if lower is None:
+        return upper - ORDER_GAP
+    if upper is None:
+        return lower + ORDER_GAP
+    if upper - lower < 2:
+        return None
+    return (lower + upper) // 2
+
+
+def check_neighbour(db_todo: Todo, neighbour_id: int, neighbour: Todo | None) -> Todo:
+    """Validate a move neighbour, raising 400/404 HTTPExceptions."""
+    if neighbour_id == db_todo.id:
+        raise HTTPException(status_code=400, detail="A todo cannot be moved relative to itself")
+    if not neighbour:
+        raise HTTPException(status_code=404, detail=f"Todo {neighbour_id} not found")
+    if neighbour.project_id != db_todo.project_id:
+        raise HTTPException(status_code=400, detail="Neighbours must belong to the same project")
+    return neighbour
+
+
+def plan_move(neighbours: dict[int, Todo], after_id: int | None, before_id: int | None):
+    """Return ``(lower, upper, new_order)``; ``new_order`` is None when a rebalance is needed."""
+    after = neighbours.get(after_id) if after_id is not None else None
+    before = neighbours.get(before_id) if before_id is not None else None
+    lower = after.order if after else None
+    upper = before.order if before else None
+    if (after and lower is None) or (before and upper is None):
+        # Unranked neighbours cannot be placed against
+        return lower, upper, None
+    return lower, upper, rank_between(lower, upper)
+
+
+def gap_running_low(lower: int | None, upper: int | None) -> bool:
+    """True when the next move into this slot would need a rebalance."""
+    return lower is not None and upper is not None and upper - lower < 4
+
+
+def move_todo(db: Session, todo_id: int, after_id: int | None = None, before_id: int | None = None):
+    """Move a todo between two neighbours by updating only its own rank.
+
+    ``after_id`` is the todo that should precede it and ``before_id`` the one
+    that should follow; either may be omitted at the ends of the list. Both
+    must belong to the same project as the moved todo. When the neighbours
+    have no free rank between them (or are unranked) the project is
+    renumbered inline first.
+
+    Returns ``(todo, needs_rebalance)``; the flag is set when the gap used was
+    nearly exhausted so the caller can schedule :func:`rebalance_orders`.
     """
-    for todo_order in todo_orders:
-        db_todo = db.query(Todo).filter(Todo.id == todo_order["id"]).first()
-        if db_todo:
-            db_todo.order = todo_order["order"]  # type: ignore[attr-defined]
+    db_todo = db.query(Todo).filter(Todo.id == todo_id).first()
+    if not db_todo:
+        raise HTTPException(status_code=404, detail="Todo not found")
+
+    neighbours = {}
+    for neighbour_id in (after_id, before_id):
+        if neighbour_id is not None:
+            neighbour = db.query(Todo).filter(Todo.id == neighbour_id).first()
+            neighbours[neighbour_id] = check_neighbour(db_todo, neighbour_id, neighbour)
 
+    lower, upper, new_order = plan_move(neighbours, after_id, before_id)
+    if new_order is None:
+        _rebalance(db, db_todo.project_id)
+        lower, upper, new_order = plan_move(neighbours, after_id, before_id)
+        if new_order is None:
+            raise HTTPException(status_code=400, detail="after_id must come before before_id")
+
+    db_todo.order = new_order  # type: ignore[attr-defined]
+    db_todo.revision = bump_version(db, TODOS)  # type: ignore[assignment]
     db.commit()
-    return {"message": "Todo orders updated successfully"}
+    events.publish("todo", "reordered", [db_todo.id], db_todo.revision)
+
+    return db_todo, gap_running_low(lower, upper)
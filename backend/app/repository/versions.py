@@ -0,0 +1,113 @@
+"""Per-table version counters and the weak ETags derived from them.
+
+Every write to ``todos`` or ``projects`` bumps that table's row in
+``table_versions`` inside the same transaction, so the counter changes
+whenever any row of the table may have changed. Reads send it as a weak
+ETag and can answer ``If-None-Match`` with 304 before running the real
+query or serializing the body.
+
+Reads must fetch the version *before* the data: a write committing in
+between then leaves the ETag older than the body, which only costs the
+client one extra full response later. A cached body must be stored with the
+version it was read at (see ``project_repo.get_projects``); caching the two
+separately can pair a new ETag with an old body and answer 304 to stale data.
+
+Trade-off: the counter row is updated inside every write transaction, so on
+Postgres concurrent writes to the same table queue on that row's lock until
+the writer commits. That is deliberate: versions then become visible strictly
+in order, which is what lets a sync token or ETag at version N stand for
+"every write up to N". A sequence (or bumping in a separate transaction)
+would remove the contention but allow a lower version to commit after a
+higher one is seen, silently skipping it. Keep write transactions short; if
+write throughput on one table ever hits this ceiling, that guarantee has to
+be rebuilt differently first.
+"""
+
+from fastapi import Request, Response
+from sqlalchemy import insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from ..models.table_version import TableVersion
+
+TODOS = "todos"
+PROJECTS = "projects"
+# Not a change counter: the highest todos version whose tombstones have been
+# pruned. Sync tokens older than it can no longer see every deletion.
+TODOS_SYNC_FLOOR = "todos_sync_floor"
+
+
+def version_statement(name: str):
+    return select(TableVersion.version).where(TableVersion.name == name)
+
+
+def bump_statement(name: str):
+    return update(TableVersion).where(TableVersion.name == name).values(version=TableVersion.version + 1)
+
+
+def versions_statement(*names: str):
+    """``(name, version)`` of several counters in one round-trip; missing counters are absent."""
+    return select(TableVersion.name, TableVersion.version).where(TableVersion.name.in_(names))
+
+
+def set_version(db: Session, name: str, version: int) -> None:
+    """Set ``name`` to ``version`` in the current transaction, creating the row if needed."""
+    if not db.execute(update(TableVersion).where(TableVersion.name == name).values(version=version)).rowcount:
+        db.execute(insert(TableVersion).values(name=name, version=version))
+
+
+def seed_statement(name: str):
+    """INSERT used when the counter row is missing (it is normally seeded by a migration)."""
+    return insert(TableVersion).values(name=name, version=1)
+
+
+def get_version(db: Session, name: str) -> int:
+    return db.execute(version_statement(name)).scalar() or 0
+
+
+def bump_version(db: Session, name: str) -> int:
+    """Increment ``name``'s version in the current transaction and return the new value.
+
+    One ``UPDATE ... RETURNING`` where supported, otherwise UPDATE then SELECT.
+    """
+    if db.get_bind().dialect.update_returning:
+        version = db.execute(bump_statement(name).returning(TableVersion.version)).scalar()
+        if version is not None:
+            return version
+    elif db.execute(bump_statement(name)).rowcount:
+        return get_version(db, name)
+    db.execute(seed_statement(name))
+    return 1
+
+
+async def get_version_async(db: AsyncSession, name: str) -> int:
+    return (await db.execute(version_statement(name))).scalar() or 0
+
+
+async def bump_version_async(db: AsyncSession, name: str) -> int:
+    """Async :func:`bump_version`."""
+    if db.get_bind().dialect.update_returning:
+        version = (await db.execute(bump_statement(name).returning(TableVersion.version))).scalar()
+        if version is not None:
+            return version
+    elif (await db.execute(bump_statement(name))).rowcount:
+        return await get_version_async(db, name)
+    await db.execute(seed_statement(name))
+    return 1
+
+
+def weak_etag(name: str, version: int) -> str:
+    return f'W/"{name}-{version}"'
+
+
+def not_modified(request: Request, response: Response, etag: str) -> Response | None:
+    """Set ``etag`` on ``response``; return a 304 response if the client already has it."""
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "no-cache"
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        # Weak comparison: ignore W/ prefixes
+        candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        if "*" in candidates or etag.removeprefix("W/") in candidates:
+            return Response(status_code=304, headers={"ETag": etag, "Cache-Control": "no-cache"})
+    return None
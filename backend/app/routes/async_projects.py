@@ -0,0 +1,63 @@
+"""Async variants of the project routes, served instead of ``projects`` when DB_ASYNC=1."""
+
+import inspect
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .. import repository
+from ..async_database import AsyncSessionLocal
+from ..repository.pagination import NEXT_CURSOR_HEADER
+from ..repository.versions import PROJECTS, not_modified, weak_etag
+from ..schemas.project import Project, ProjectCreate
+from . import projects
+
+router = APIRouter()
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def _doc(endpoint) -> str:
+    return inspect.cleandoc(endpoint.__doc__ or "")
+
+
+@router.post("/projects", response_model=Project, description=_doc(projects.create_project_endpoint))
+async def create_project_endpoint(project: ProjectCreate, db: AsyncSession = Depends(get_async_db)):
+    return await repository.async_project_repo.create_project(db=db, project=project)
+
+
+@router.get("/projects", response_model=list[Project], description=_doc(projects.read_projects))
+async def read_projects(
+    request: Request,
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: str | None = Query(None, description="Opaque cursor from a previous page's X-Next-Cursor header"),
+    db: AsyncSession = Depends(get_async_db),
+):
+    version, project_list = await repository.async_project_repo.get_projects(db, skip=skip, limit=limit, cursor=cursor)
+    cached = not_modified(request, response, weak_etag(PROJECTS, version))
+    if cached:
+        return cached
+    if project_list and len(project_list) == limit:
+        response.headers[NEXT_CURSOR_HEADER] = repository.project_repo.project_cursor(project_list[-1])
+    return project_list
+
+
+@router.get("/projects/{project_id}", response_model=Project, description=_doc(projects.read_project))
+async def read_project(project_id: int, request: Request, response: Response, db: AsyncSession = Depends(get_async_db)):
+    version, db_project = await repository.async_project_repo.get_project(db, project_id=project_id)
+    if db_project is None:
+        raise HTTPException(status_code=404, detail="Project not found")
+    cached = not_modified(request, response, weak_etag(PROJECTS, version))
+    if cached:
+        return cached
+    return db_project
+
+
+@router.put("/projects/{project_id}", response_model=Project, description=_doc(projects.update_project_endpoint))
+async def update_project_endpoint(project_id: int, project: ProjectCreate, db: AsyncSession = Depends(get_async_db)):
+    return await repository.async_project_repo.update_project(db=db, project_id=project_id, project=project)
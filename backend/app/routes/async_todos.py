@@ -0,0 +1,128 @@
+"""Async variants of the todo routes, served instead of ``todos`` when DB_ASYNC=1.
+
+Handlers await an AsyncSession instead of blocking a threadpool worker for
+the whole database round-trip. Paths, parameters, responses and API docs
+match the sync routes exactly.
+"""
+
+import inspect
+
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .. import repository
+from ..async_database import AsyncSessionLocal
+from ..repository.versions import TODOS, get_version_async, not_modified, weak_etag
+from ..schemas.todo import (
+    Todo,
+    TodoBatch,
+    TodoBatchResult,
+    TodoChanges,
+    TodoCreate,
+    TodoMove,
+    TodoOrdersUpdate,
+    TodoUpdate,
+)
+from . import todos
+from .todos import set_next_cursor, todo_list_params
+
+router = APIRouter()
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def _doc(endpoint) -> str:
+    return inspect.cleandoc(endpoint.__doc__ or "")
+
+
+@router.post("/todos", response_model=Todo, status_code=201, description=_doc(todos.create_todo_endpoint))
+async def create_todo_endpoint(todo: TodoCreate, db: AsyncSession = Depends(get_async_db)):
+    return await repository.async_todo_repo.create_todo(db=db, todo=todo)
+
+
+@router.get("/todos", response_model=list[Todo], description=_doc(todos.read_todos))
+async def read_todos(
+    request: Request,
+    response: Response,
+    params: dict = Depends(todo_list_params),
+    db: AsyncSession = Depends(get_async_db),
+):
+    cached = not_modified(request, response, weak_etag(TODOS, await get_version_async(db, TODOS)))
+    if cached:
+        return cached
+    todo_list = await repository.async_todo_repo.get_todos(db, **params)
+    set_next_cursor(response, todo_list, params)
+    return todo_list
+
+
+@router.get("/todos/changes", response_model=TodoChanges, description=_doc(todos.read_todo_changes))
+async def read_todo_changes(
+    since: str | None = Query(None, description="Sync token from a previous response; omit for a full snapshot"),
+    limit: int = Query(
+        repository.todo_repo.DEFAULT_SYNC_LIMIT,
+        ge=1,
+        le=repository.todo_repo.MAX_SYNC_LIMIT,
+        description="Todos and deleted ids per page",
+    ),
+    db: AsyncSession = Depends(get_async_db),
+):
+    return await repository.async_todo_repo.get_todo_changes(db, since=since, limit=limit)
+
+
+@router.post("/todos/batch", response_model=TodoBatchResult, description=_doc(todos.batch_todos_endpoint))
+async def batch_todos_endpoint(batch: TodoBatch, db: AsyncSession = Depends(get_async_db)):
+    return await repository.async_todo_repo.apply_todo_batch(db, batch)
+
+
+@router.put("/todos/reorder", description=_doc(todos.update_todo_orders_endpoint))
+async def update_todo_orders_endpoint(orders: TodoOrdersUpdate, db: AsyncSession = Depends(get_async_db)):
+    todo_orders = [{"id": order.id, "order": order.order} for order in orders.todo_orders]
+    return await repository.async_todo_repo.update_todo_orders(db=db, todo_orders=todo_orders)
+
+
+async def _rebalance_orders_task(project_id: int | None):
+    async with AsyncSessionLocal() as db:
+        await repository.async_todo_repo.rebalance_orders(db, project_id)
+
+
+@router.put("/todos/{todo_id}/move", response_model=Todo, description=_doc(todos.move_todo_endpoint))
+async def move_todo_endpoint(
+    todo_id: int, move: TodoMove, background_tasks: BackgroundTasks, db: AsyncSession = Depends(get_async_db)
+):
+    db_todo, needs_rebalance = await repository.async_todo_repo.move_todo(
+        db, todo_id=todo_id, after_id=move.after_id, before_id=move.before_id
+    )
+    if needs_rebalance:
+        background_tasks.add_task(_rebalance_orders_task, db_todo.project_id)
+    return db_todo
+
+
+@router.get("/todos/{todo_id}", response_model=Todo, description=_doc(todos.read_todo))
+async def read_todo(todo_id: int, request: Request, response: Response, db: AsyncSession = Depends(get_async_db)):
+    version = await get_version_async(db, TODOS)
+    db_todo = await repository.async_todo_repo.get_todo(db, todo_id=todo_id)
+    if db_todo is None:
+        raise HTTPException(status_code=404, detail="Todo not found")
+    cached = not_modified(request, response, weak_etag(TODOS, version))
+    if cached:
+        return cached
+    return db_todo
+
+
+@router.put("/todos/{todo_id}", response_model=Todo, description=_doc(todos.update_todo_endpoint))
+async def update_todo_endpoint(todo_id: int, todo: TodoCreate, db: AsyncSession = Depends(get_async_db)):
+    return await repository.async_todo_repo.update_todo(db=db, todo_id=todo_id, todo=todo)
+
+
+@router.patch("/todos/{todo_id}", response_model=Todo, description=_doc(todos.patch_todo_endpoint))
+async def patch_todo_endpoint(todo_id: int, patch: TodoUpdate, db: AsyncSession = Depends(get_async_db)):
+    return await repository.async_todo_repo.patch_todo(db=db, todo_id=todo_id, patch=patch)
+
+
+@router.delete("/todos/{todo_id}", description=_doc(todos.delete_todo_endpoint))
+async def delete_todo_endpoint(todo_id: int, db: AsyncSession = Depends(get_async_db)):
+    await repository.async_todo_repo.delete_todo(db=db, todo_id=todo_id)
+    return {"message": "Todo deleted successfully"}
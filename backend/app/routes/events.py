@@ -0,0 +1,57 @@
+import asyncio
+import json
+
+from fastapi import APIRouter, Request
+from fastapi.responses import StreamingResponse
+
+from .. import events
+
+router = APIRouter()
+
+# Comment line sent when idle, so proxies keep the connection and disconnects are noticed
+HEARTBEAT_SECONDS = 15
+
+
+def format_event(event: dict) -> str:
+    """Render one change event in text/event-stream format."""
+    lines = []
+    if "revision" in event:
+        lines.append(f"id: {event['revision']}")
+    lines.append(f"event: {event['type']}")
+    lines.append(f"data: {json.dumps(event)}")
+    return "\n".join(lines) + "\n\n"
+
+
+async def event_stream(request: Request, subscription: events.Subscription, heartbeat: float = HEARTBEAT_SECONDS):
+    try:
+        yield "retry: 3000\n\n"
+        while True:
+            try:
+                event = await asyncio.wait_for(subscription.get(), timeout=heartbeat)
+            except asyncio.TimeoutError:
+                if await request.is_disconnected():
+                    break
+                yield ": keep-alive\n\n"
+                continue
+            yield format_event(event)
+    finally:
+        events.unsubscribe(subscription)
+
+
+@router.get("/events", response_class=StreamingResponse)
+async def stream_events(request: Request):
+    """
+    Stream todo and project changes as Server-Sent Events.
+
+    Event types are `todo.created`, `todo.updated`, `todo.deleted`, `todo.reordered`,
+    `project.created` and `project.updated`; each `data` payload holds the affected
+    `ids` and, when known, the table `revision`. Clients that fall behind receive a
+    single `resync` event in place of the events they missed and should catch up
+    with `GET /todos/changes`.
+    """
+    subscription = events.subscribe()
+    return StreamingResponse(
+        event_stream(request, subscription),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
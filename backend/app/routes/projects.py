@@ -1,7 +1,9 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.orm import Session
 from .. import repository
 from ..database import SessionLocal
+from ..repository.pagination import NEXT_CURSOR_HEADER
+from ..repository.versions import PROJECTS, not_modified, weak_etag
 from ..schemas.project import Project, ProjectCreate
 
 router = APIRouter()
@@ -30,31 +32,52 @@ def create_project_endpoint(project: ProjectCreate, db: Session = Depends(get_db
 
 
 @router.get("/projects", response_model=list[Project])
-def read_projects(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
+def read_projects(
+    request: Request,
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: str | None = Query(None, description="Opaque cursor from a previous page's X-Next-Cursor header"),
+    db: Session = Depends(get_db),
+):
     """
     Retrieve all projects with optional pagination.
 
     - **skip**: Number of projects to skip (default: 0)
     - **limit**: Maximum number of projects to return (default: 100)
+    - **cursor**: Continue after the last project of a previous page (keyset pagination; `skip` is ignored)
 
-    Returns a list of all projects.
+    Returns a list of all projects ordered by id.
+    When the page is full, the `X-Next-Cursor` response header carries the cursor for the next page.
+    Responses carry a weak `ETag` that changes with any project write; send it back
+    in `If-None-Match` to get `304 Not Modified` instead of the body.
     """
-    projects = repository.project_repo.get_projects(db, skip=skip, limit=limit)
+    version, projects = repository.project_repo.get_projects(db, skip=skip, limit=limit, cursor=cursor)
+    cached = not_modified(request, response, weak_etag(PROJECTS, version))
+    if cached:
+        return cached
+    if projects and len(projects) == limit:
+        response.headers[NEXT_CURSOR_HEADER] = repository.project_repo.project_cursor(projects[-1])
     return projects
 
 
 @router.get("/projects/{project_id}", response_model=Project)
-def read_project(project_id: int, db: Session = Depends(get_db)):
+def read_project(project_id: int, request: Request, response: Response, db: Session = Depends(get_db)):
     """
     Retrieve a specific project by ID.
 
     - **project_id**: The ID of the project to retrieve
 
     Returns the project if found, otherwise raises 404.
+    Responses carry a weak `ETag` that changes with any project write; send it back
+    in `If-None-Match` to get `304 Not Modified` instead of the body.
     """
-    db_project = repository.project_repo.get_project(db, project_id=project_id)
+    version, db_project = repository.project_repo.get_project(db, project_id=project_id)
     if db_project is None:
         raise HTTPException(status_code=404, detail="Project not found")
+    cached = not_modified(request, response, weak_etag(PROJECTS, version))
+    if cached:
+        return cached
     return db_project
 
 
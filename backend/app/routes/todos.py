@@ -1,8 +1,22 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.orm import Session
 from .. import repository
 from ..database import SessionLocal
-from ..schemas.todo import Todo, TodoCreate, TodoOrdersUpdate
+from ..repository.pagination import NEXT_CURSOR_HEADER
+from ..repository.versions import TODOS, get_version, not_modified, weak_etag
+from ..schemas.todo import (
+    Todo,
+    TodoBatch,
+    TodoBatchResult,
+    TodoChanges,
+    TodoCreate,
+    TodoMove,
+    TodoOrdersUpdate,
+    TodoStatus,
+    TodoUpdate,
+)
+from datetime import datetime
+from typing import Literal
 
 router = APIRouter()
 
@@ -33,25 +47,129 @@ def create_todo_endpoint(todo: TodoCreate, db: Session = Depends(get_db)):
     return repository.todo_repo.create_todo(db=db, todo=todo)
 
 
-@router.get("/todos", response_model=list[Todo])
-def read_todos(
+def todo_list_params(
     skip: int = 0,
     limit: int = 100,
     sort: str = Query("asc", description="Sort by creation id: 'asc' or 'desc'"),
-    db: Session = Depends(get_db),
+    cursor: str | None = Query(None, description="Opaque cursor from a previous page's X-Next-Cursor header"),
+    order_by: Literal["order", "completed_at"] = Query("order", description="Sort key: 'order' or 'completed_at'"),
+    status: TodoStatus | None = Query(None, description="Only todos with this status"),
+    status_ne: TodoStatus | None = Query(None, description="Only todos without this status"),
+    project_id: str | None = Query(None, description="Only todos in this project; 'null' for the inbox"),
+    scheduled_from: datetime | None = Query(None, description="scheduled_at >= this value"),
+    scheduled_before: datetime | None = Query(None, description="scheduled_at < this value"),
+    deadline_from: datetime | None = Query(None, description="deadline_at >= this value"),
+    deadline_before: datetime | None = Query(None, description="deadline_at < this value"),
+    completed_from: datetime | None = Query(None, description="completed_at >= this value"),
+    completed_before: datetime | None = Query(None, description="completed_at < this value"),
+) -> dict:
+    """Parse GET /todos query parameters into ``todo_repo.get_todos`` keyword arguments."""
+    inbox = project_id is not None and project_id.lower() == "null"
+    project_filter = None
+    if project_id is not None and not inbox:
+        try:
+            project_filter = int(project_id)
+        except ValueError:
+            raise HTTPException(status_code=422, detail="project_id must be an integer or 'null'")
+
+    return {
+        "skip": skip,
+        "limit": limit,
+        "sort": sort,
+        "cursor": cursor,
+        "order_by": order_by,
+        "status": status.value if status else None,
+        "status_ne": status_ne.value if status_ne else None,
+        "project_id": project_filter,
+        "inbox": inbox,
+        "scheduled_from": scheduled_from,
+        "scheduled_before": scheduled_before,
+        "deadline_from": deadline_from,
+        "deadline_before": deadline_before,
+        "completed_from": completed_from,
+        "completed_before": completed_before,
+    }
+
+
+def set_next_cursor(response: Response, todos: list, params: dict) -> None:
+    """Advertise the next page's cursor when this page came back full."""
+    if todos and len(todos) == params["limit"]:
+        response.headers[NEXT_CURSOR_HEADER] = repository.todo_repo.todo_cursor(todos[-1], order_by=params["order_by"])
+
+
+@router.get("/todos", response_model=list[Todo])
+def read_todos(
+    request: Request, response: Response, params: dict = Depends(todo_list_params), db: Session = Depends(get_db)
 ):
     """
-    Retrieve all todos with optional pagination.
+    Retrieve all todos with optional pagination and filtering.
 
     - **skip**: Number of todos to skip (default: 0)
     - **limit**: Maximum number of todos to return (default: 100)
+    - **cursor**: Continue after the last todo of a previous page (keyset pagination; `skip` is ignored)
+    - **order_by**: `order` (default) or `completed_at` (e.g. for the logbook)
+    - **status**: Filter by status (pending, completed, cancelled)
+    - **status_ne**: Exclude one status, e.g. `completed` for open and cancelled todos
+    - **project_id**: Filter by project; pass `null` for unassigned (inbox) todos
+    - **scheduled_from / scheduled_before**, **deadline_from / deadline_before**,
+      **completed_from / completed_before**: Date ranges (inclusive lower bound, exclusive upper bound)
 
     Returns a list of todos ordered by id ascending (default) or descending when `sort=desc`.
+    When the page is full, the `X-Next-Cursor` response header carries the cursor for the next page.
+    Responses carry a weak `ETag` that changes with any todo write; send it back
+    in `If-None-Match` to get `304 Not Modified` instead of the body.
     """
-    todos = repository.todo_repo.get_todos(db, skip=skip, limit=limit, sort=sort)
+    cached = not_modified(request, response, weak_etag(TODOS, get_version(db, TODOS)))
+    if cached:
+        return cached
+    todos = repository.todo_repo.get_todos(db, **params)
+    set_next_cursor(response, todos, params)
     return todos
 
 
+@router.get("/todos/changes", response_model=TodoChanges)
+def read_todo_changes(
+    since: str | None = Query(None, description="Sync token from a previous response; omit for a full snapshot"),
+    limit: int = Query(
+        repository.todo_repo.DEFAULT_SYNC_LIMIT,
+        ge=1,
+        le=repository.todo_repo.MAX_SYNC_LIMIT,
+        description="Todos and deleted ids per page",
+    ),
+    db: Session = Depends(get_db),
+):
+    """
+    Retrieve the todos created or updated, and the ids deleted, since a sync token.
+
+    - **since**: `token` from the previous call; omit it to get every todo and a first token
+    - **limit**: Maximum todos, and separately deleted ids, per page (default: 1000)
+
+    Returns `todos` (changed todos, oldest change first), `deleted_ids`, `has_more` and
+    the `token` to pass next time. While `has_more` is true, call again with `token` right
+    away to fetch the rest of the pass. A todo may be reported again on a later call;
+    apply changes as upserts. Raises 400 for a malformed token and 410 for a token older
+    than the deletion log retention (`SYNC_RETENTION_DAYS`), after which the client
+    must start over without a token.
+    """
+    return repository.todo_repo.get_todo_changes(db, since=since, limit=limit)
+
+
+@router.post("/todos/batch", response_model=TodoBatchResult)
+def batch_todos_endpoint(batch: TodoBatch, db: Session = Depends(get_db)):
+    """
+    Create, partially update and delete many todos in one request and transaction.
+
+    - **create**: New todos, with the same fields as `POST /todos`
+    - **update**: Partial updates; each needs an `id` and only the fields given are changed
+    - **delete**: IDs of todos to delete
+
+    Operations run in that order, up to 1000 of each kind. Returns counts and one
+    result per item (`op`, `index` within its list, `id`, `status` and the `todo`);
+    unknown ids get status 404 without failing the rest of the batch.
+    """
+    return repository.todo_repo.apply_todo_batch(db, batch)
+
+
 @router.put("/todos/reorder")
 def update_todo_orders_endpoint(orders: TodoOrdersUpdate, db: Session = Depends(get_db)):
     """
@@ -60,24 +178,64 @@ def update_todo_orders_endpoint(orders: TodoOrdersUpdate, db: Session = Depends(
     - **todo_orders**: List of todo IDs with their new order values
 
     Use this endpoint to reorder todos by drag-and-drop in the UI.
-    Returns success message after updating orders.
+    All orders are applied in one statement and transaction. Returns a success
+    message with the number of updated todos and any `missing_ids` that were not found.
     """
     todo_orders = [{"id": order.id, "order": order.order} for order in orders.todo_orders]
     return repository.todo_repo.update_todo_orders(db=db, todo_orders=todo_orders)
 
 
+def _rebalance_orders_task(project_id: int | None):
+    """Background pass spreading a project's ranks out after its gaps ran low."""
+    db = SessionLocal()
+    try:
+        repository.todo_repo.rebalance_orders(db, project_id)
+    finally:
+        db.close()
+
+
+@router.put("/todos/{todo_id}/move", response_model=Todo)
+def move_todo_endpoint(
+    todo_id: int, move: TodoMove, background_tasks: BackgroundTasks, db: Session = Depends(get_db)
+):
+    """
+    Move a todo between two neighbours, e.g. after a drag-and-drop.
+
+    - **todo_id**: The ID of the todo to move
+    - **after_id**: The todo that should come right before it (omit to move to the start)
+    - **before_id**: The todo that should come right after it (omit to move to the end)
+
+    Only the moved todo's order is written. When the ranks around it run low,
+    the project's orders are spread out again in the background.
+    Returns the moved todo.
+    """
+    db_todo, needs_rebalance = repository.todo_repo.move_todo(
+        db, todo_id=todo_id, after_id=move.after_id, before_id=move.before_id
+    )
+    if needs_rebalance:
+        background_tasks.add_task(_rebalance_orders_task, db_todo.project_id)
+    return db_todo
+
+
 @router.get("/todos/{todo_id}", response_model=Todo)
-def read_todo(todo_id: int, db: Session = Depends(get_db)):
+def read_todo(todo_id: int, request: Request, response: Response, db: Session = Depends(get_db)):
     """
     Retrieve a specific todo by ID.
 
     - **todo_id**: The ID of the todo to retrieve
 
     Returns the todo if found, otherwise raises 404.
+    Responses carry a weak `ETag` that changes with any todo write; send it back
+    in `If-None-Match` to get `304 Not Modified` instead of the body.
     """
+    # Version first, so the ETag never claims a newer state than the row read after it
+    version = get_version(db, TODOS)
     db_todo = repository.todo_repo.get_todo(db, todo_id=todo_id)
     if db_todo is None:
         raise HTTPException(status_code=404, detail="Todo not found")
+    cached = not_modified(request, response, weak_etag(TODOS, version))
+    if cached:
+        return cached
     return db_todo
 
 
@@ -94,6 +252,20 @@ def update_todo_endpoint(todo_id: int, todo: TodoCreate, db: Session = Depends(g
     return repository.todo_repo.update_todo(db=db, todo_id=todo_id, todo=todo)
 
 
+@router.patch("/todos/{todo_id}", response_model=Todo)
+def patch_todo_endpoint(todo_id: int, patch: TodoUpdate, db: Session = Depends(get_db)):
+    """
+    Partially update a todo; only the fields present in the body are changed.
+
+    - **todo_id**: The ID of the todo to update
+    - **patch**: Any of the todo fields, e.g. `{"status": "completed"}`
+
+    `completed_at` follows `status` as with PUT. Returns the updated todo if
+    found, otherwise raises 404.
+    """
+    return repository.todo_repo.patch_todo(db=db, todo_id=todo_id, patch=patch)
+
+
 @router.delete("/todos/{todo_id}")
 def delete_todo_endpoint(todo_id: int, db: Session = Depends(get_db)):
     """
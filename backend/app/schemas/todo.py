@@ -1,6 +1,6 @@
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field, field_validator, model_validator
 from datetime import datetime
-from typing import Optional
+from typing import Literal, Optional
 from enum import Enum
 
 
@@ -33,11 +33,51 @@ class TodoCreate(TodoBase):
     pass
 
 
+class TodoUpdate(BaseModel):
+    """Partial update: only the fields present in the request are written.
+
+    ``completed_at`` is not accepted; it follows ``status`` as in full updates.
+    An explicit null clears the nullable fields; it is rejected for the rest.
+    """
+
+    title: Optional[str] = None
+    description: Optional[str] = None
+    scheduled_at: Optional[datetime] = None
+    deadline_at: Optional[datetime] = None
+    priority: Optional[TodoPriority] = None
+    status: Optional[TodoStatus] = None
+    order: Optional[int] = None
+    project_id: Optional[int] = None
+
+    @field_validator("title", "priority", "status")
+    def reject_null(cls, v):  # type: ignore[override]
+        """Only called for supplied values, so an omitted field still means "leave as is".
+
+        ``order`` is left out: it is nullable, and ``null`` unranks the todo.
+        """
+        if v is None:
+            raise ValueError("may be omitted but not null")
+        return v
+
+
 class Todo(TodoBase):
     id: int
+    revision: int = 0
     model_config = ConfigDict(from_attributes=True)
 
 
+class TodoChanges(BaseModel):
+    """One page of the delta since a sync token: upserted todos, deleted ids, and the token to send next.
+
+    ``has_more`` means the pass is unfinished and ``token`` fetches its next page.
+    """
+
+    todos: list[Todo]
+    deleted_ids: list[int]
+    token: str
+    has_more: bool = False
+
+
 class TodoOrderUpdate(BaseModel):
     id: int
     order: int
@@ -45,3 +85,49 @@ class TodoOrderUpdate(BaseModel):
 
 class TodoOrdersUpdate(BaseModel):
     todo_orders: list[TodoOrderUpdate]
+
+
+class TodoMove(BaseModel):
+    """Place a todo between two neighbours; omit one side to move to the start/end."""
+
+    after_id: Optional[int] = None
+    before_id: Optional[int] = None
+
+    @model_validator(mode="after")
+    def require_neighbour(self):
+        # Without either neighbour there is nothing to rank against
+        if self.after_id is None and self.before_id is None:
+            raise ValueError("after_id or before_id is required")
+        return self
+
+
+# Upper bound on each list in a batch request
+MAX_BATCH_ITEMS = 1000
+
+
+class TodoBatchUpdate(TodoUpdate):
+    id: int
+
+
+class TodoBatch(BaseModel):
+    """Creates, partial updates and deletes applied together in one transaction."""
+
+    create: list[TodoCreate] = Field(default_factory=list, max_length=MAX_BATCH_ITEMS)
+    update: list[TodoBatchUpdate] = Field(default_factory=list, max_length=MAX_BATCH_ITEMS)
+    delete: list[int] = Field(default_factory=list, max_length=MAX_BATCH_ITEMS)
+
+
+class TodoBatchItemResult(BaseModel):
+    op: Literal["create", "update", "delete"]
+    index: int
+    id: Optional[int] = None
+    status: int
+    detail: Optional[str] = None
+    todo: Optional[Todo] = None
+
+
+class TodoBatchResult(BaseModel):
+    created: int
+    updated: int
+    deleted: int
+    results: list[TodoBatchItemResult]
@@ -0,0 +1,402 @@
+"""Bulk-load synthetic projects, todos and tags for scaling tests and benchmarks.
+
+Rows are generated in Python and written through SQLAlchemy Core, bypassing
+the ORM and the API: ``COPY ... FROM STDIN`` on Postgres, ``executemany``
+INSERTs elsewhere. The data is deterministic: the same ``--seed``, options
+and starting database always produce the same rows. New rows are appended
+after the highest existing ids (``--reset`` empties the tables first), e.g.::
+
+    python -m app.seed --projects 10000 --todos 1000000 --tags 200
+    python -m app.seed --todos 50000 --status pending=50,completed=50 --unassigned 0
+
+Seeded rows are stamped with a freshly bumped table version, so ETags and
+delta sync see them like any other write. The in-process projects cache of
+a running API is not invalidated and may serve stale lists for up to its TTL.
+"""
+
+import argparse
+import csv
+import datetime
+import io
+import itertools
+import logging
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Iterable, Iterator
+
+from sqlalchemy import delete, func, insert, select, text
+from sqlalchemy.engine import Connection, Engine
+
+from .models.project import Project
+from .models.tag import Tag, todo_tags
+from .models.todo import Todo, TodoDeletion
+from .repository.versions import (
+    PROJECTS,
+    TODOS,
+    TODOS_SYNC_FLOOR,
+    bump_statement,
+    seed_statement,
+    set_version,
+    version_statement,
+)
+
+logger = logging.getLogger(__name__)
+
+# Rows are generated and written in blocks of this size. Each block draws from
+# its own random stream keyed by the seed and its first id, so memory stays flat
+# and a block's rows depend only on the options and where the ids start.
+BLOCK_SIZE = 10_000
+# Todos are ordered within their project (or the inbox) with this spacing, like
+# the API's own ranks, and never past the largest value of the INTEGER column.
+ORDER_SPACING = 1024
+MAX_ORDER = 2**31 - 1
+
+
+def parse_weights(value: str, choices: Iterable[str]) -> dict[str, float]:
+    """Parse ``"pending=70,completed=25"`` into ``{name: weight}``; unlisted choices get 0."""
+    choices = tuple(choices)
+    weights = dict.fromkeys(choices, 0.0)
+    for item in value.split(","):
+        name, sep, weight = item.partition("=")
+        name = name.strip()
+        if name not in weights:
+            raise ValueError(f"unknown value {name!r}; choose from {', '.join(choices)}")
+        try:
+            weights[name] = float(weight) if sep else 1.0
+        except ValueError:
+            raise ValueError(f"invalid weight for {name!r}: {weight!r}") from None
+        if weights[name] < 0:
+            raise ValueError(f"weight for {name!r} must not be negative")
+    if not any(weights.values()):
+        raise ValueError("at least one value needs a positive weight")
+    return weights
+
+
+def skewed_cum_weights(count: int, skew: float) -> list[float]:
+    """Cumulative Zipf weights over ``count`` ranks: 0 is uniform, larger values favour the first ranks."""
+    return list(itertools.accumulate(1 / (rank**skew) for rank in range(1, count + 1)))
+
+
+@dataclass
+class SeedConfig:
+    """How many rows to add and how their columns are distributed."""
+
+    projects: int = 0
+    todos: int = 0
+    tags: int = 0
+    seed: int = 1234
+    project_status: dict[str, float] = field(
+        default_factory=lambda: {"active": 80, "completed": 15, "cancelled": 5}
+    )
+    status: dict[str, float] = field(default_factory=lambda: {"pending": 70, "completed": 25, "cancelled": 5})
+    priority: dict[str, float] = field(
+        default_factory=lambda: {"low": 30, "medium": 40, "high": 20, "urgent": 10}
+    )
+    # Share of todos without a project, and the Zipf skew of the rest over projects
+    unassigned: float = 0.1
+    project_skew: float = 0.5
+    # Dates fall in [start, start + days)
+    start: datetime.datetime = datetime.datetime(2025, 1, 1)
+    days: int = 365
+    deadline_share: float = 0.3
+    scheduled_share: float = 0.2
+    description_share: float = 0.5
+    # Each todo gets between 0 and max_tags_per_todo distinct tags, also Zipf-skewed
+    max_tags_per_todo: int = 3
+    tag_skew: float = 1.0
+
+
+def _random_time(rng: random.Random, config: SeedConfig) -> datetime.datetime:
+    return config.start + datetime.timedelta(seconds=rng.randrange(config.days * 86400))
+
+
+def _blocks(first_id: int, count: int) -> Iterator[tuple[int, int]]:
+    """Split ``count`` ids starting at ``first_id`` into ``(first, size)`` blocks."""
+    end = first_id + count
+    for start in range(first_id, end, BLOCK_SIZE):
+        yield start, min(BLOCK_SIZE, end - start)
+
+
+def _rng(config: SeedConfig, kind: str, first_id: int) -> random.Random:
+    return random.Random(f"{config.seed}:{kind}:{first_id}")
+
+
+def project_rows(config: SeedConfig, first_id: int, count: int, revision: int) -> list[dict]:
+    rng = _rng(config, "projects", first_id)
+    statuses, weights = zip(*config.project_status.items())
+    return [
+        {
+            "id": project_id,
+            "name": f"Project {project_id}",
+            "description": f"Synthetic project {project_id}" if rng.random() < config.description_share else None,
+            "status": rng.choices(statuses, weights)[0],
+            "revision": revision,
+        }
+        for project_id in range(first_id, first_id + count)
+    ]
+
+
+def tag_rows(first_id: int, count: int) -> list[dict]:
+    return [{"id": tag_id, "name": f"tag-{tag_id}"} for tag_id in range(first_id, first_id + count)]
+
+
+def todo_rows(
+    config: SeedConfig,
+    first_id: int,
+    count: int,
+    project_ids: list[int],
+    revision: int,
+    last_orders: dict[int | None, int],
+) -> list[dict]:
+    """Generate todos; ``last_orders`` maps each project id (None: inbox) to its highest order and is advanced."""
+    rng = _rng(config, "todos", first_id)
+    statuses, status_weights = zip(*config.status.items())
+    priorities, priority_weights = zip(*config.priority.items())
+    project_weights = skewed_cum_weights(len(project_ids), config.project_skew)
+    rows = []
+    for todo_id in range(first_id, first_id + count):
+        status = rng.choices(statuses, status_weights)[0]
+        deadline_at = _random_time(rng, config) if rng.random() < config.deadline_share else None
+        scheduled_at = _random_time(rng, config) if rng.random() < config.scheduled_share else None
+        if deadline_at and scheduled_at and scheduled_at > deadline_at:
+            scheduled_at, deadline_at = deadline_at, scheduled_at
+        assigned = project_ids and rng.random() >= config.unassigned
+        project_id = rng.choices(project_ids, cum_weights=project_weights)[0] if assigned else None
+        # A scope past ~2M todos runs out of spaced ranks; clamping keeps the INSERT valid (ties sort by id)
+        order = last_orders[project_id] = min(last_orders.get(project_id, 0) + ORDER_SPACING, MAX_ORDER)
+        rows.append(
+            {
+                "id": todo_id,
+                "title": f"Todo {todo_id}",
+                "description": f"Synthetic todo {todo_id}" if rng.random() < config.description_share else None,
+                "scheduled_at": scheduled_at,
+                "deadline_at": deadline_at,
+                "priority": rng.choices(priorities, priority_weights)[0],
+                "status": status,
+                "order": order,
+                "project_id": project_id,
+                "completed_at": _random_time(rng, config) if status == "completed" else None,
+                "revision": revision,
+            }
+        )
+    return rows
+
+
+def todo_tag_rows(config: SeedConfig, first_id: int, count: int, tag_ids: list[int]) -> list[dict]:
+    if not tag_ids or config.max_tags_per_todo <= 0:
+        return []
+    rng = _rng(config, "todo_tags", first_id)
+    tag_weights = skewed_cum_weights(len(tag_ids), config.tag_skew)
+    most = min(config.max_tags_per_todo, len(tag_ids))
+    rows = []
+    for todo_id in range(first_id, first_id + count):
+        # A few extra draws absorb duplicates of the popular tags
+        wanted = rng.randint(0, most)
+        picked = dict.fromkeys(rng.choices(tag_ids, cum_weights=tag_weights, k=wanted * 2))
+        rows.extend({"todo_id": todo_id, "tag_id": tag_id} for tag_id in list(picked)[:wanted])
+    return rows
+
+
+def _copy(conn: Connection, table, rows: list[dict]) -> None:
+    """Write ``rows`` with ``COPY ... FROM STDIN`` in CSV format (psycopg2)."""
+    columns = list(rows[0])
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        # None becomes an unquoted empty field, which COPY's CSV format reads as NULL
+        writer.writerow(value.isoformat() if isinstance(value, datetime.datetime) else value for value in row.values())
+    buffer.seek(0)
+    quote = conn.dialect.identifier_preparer.quote
+    statement = f"COPY {quote(table.name)} ({', '.join(quote(c) for c in columns)}) FROM STDIN WITH (FORMAT csv)"
+    with conn.connection.driver_connection.cursor() as cursor:
+        cursor.copy_expert(statement, buffer)
+
+
+def write_rows(conn: Connection, table, rows: list[dict]) -> None:
+    """Bulk-insert ``rows`` into ``table``: COPY on Postgres, executemany otherwise."""
+    if not rows:
+        return
+    if conn.dialect.name == "postgresql":
+        _copy(conn, table, rows)
+    else:
+        conn.execute(insert(table), rows)
+
+
+def _next_id(conn: Connection, column) -> int:
+    return (conn.execute(select(func.max(column))).scalar() or 0) + 1
+
+
+def _bump(conn: Connection, name: str) -> int:
+    """Bump ``name``'s table version (see ``repository/versions.py``) and return it."""
+    if conn.execute(bump_statement(name)).rowcount:
+        return conn.execute(version_statement(name)).scalar()
+    conn.execute(seed_statement(name))
+    return 1
+
+
+def _sync_sequences(conn: Connection, tables) -> None:
+    """Move Postgres id sequences past the explicitly inserted ids."""
+    if conn.dialect.name != "postgresql":
+        return
+    for table in tables:
+        conn.execute(
+            text(f"SELECT setval(pg_get_serial_sequence('{table.name}', 'id'), (SELECT MAX(id) FROM {table.name}))")
+        )
+
+
+def reset(conn: Connection) -> None:
+    """Delete all projects, todos, tags and tombstones.
+
+    Bumps both table versions so saved ETags stop matching, and raises the
+    sync floor to the new todos version: the dropped tombstones can no longer
+    be replayed, so older sync tokens get a 410 and resync from scratch.
+    """
+    for table in (todo_tags, TodoDeletion.__table__, Todo.__table__, Tag.__table__, Project.__table__):
+        conn.execute(delete(table))
+    _bump(conn, PROJECTS)
+    set_version(conn, TODOS_SYNC_FLOOR, _bump(conn, TODOS))
+
+
+def seed(engine: Engine, config: SeedConfig) -> dict[str, int]:
+    """Append the configured rows in one transaction and return how many of each were written."""
+    written = {"projects": 0, "tags": 0, "todos": 0, "todo_tags": 0}
+    projects, tags, todos = Project.__table__, Tag.__table__, Todo.__table__
+    with engine.begin() as conn:
+        if config.projects:
+            revision = _bump(conn, PROJECTS)
+            for first, count in _blocks(_next_id(conn, projects.c.id), config.projects):
+                write_rows(conn, projects, project_rows(config, first, count, revision))
+                written["projects"] += count
+        if config.tags:
+            for first, count in _blocks(_next_id(conn, tags.c.id), config.tags):
+                write_rows(conn, tags, tag_rows(first, count))
+                written["tags"] += count
+        if config.todos:
+            project_ids = list(conn.execute(select(projects.c.id).order_by(projects.c.id)).scalars())
+            tag_ids = list(conn.execute(select(tags.c.id).order_by(tags.c.id)).scalars())
+            highest_order = select(todos.c.project_id, func.coalesce(func.max(todos.c.order), 0))
+            last_orders = dict(conn.execute(highest_order.group_by(todos.c.project_id)).all())
+            revision = _bump(conn, TODOS)
+            for first, count in _blocks(_next_id(conn, todos.c.id), config.todos):
+                write_rows(conn, todos, todo_rows(config, first, count, project_ids, revision, last_orders))
+                links = todo_tag_rows(config, first, count, tag_ids)
+                write_rows(conn, todo_tags, links)
+                written["todos"] += count
+                written["todo_tags"] += len(links)
+                logger.info(f"Seeded {written['todos']}/{config.todos} todos")
+        _sync_sequences(conn, (projects, tags, todos))
+    # Fresh statistics so the planner does not treat the new rows as an empty table
+    with engine.begin() as conn:
+        conn.execute(text("ANALYZE"))
+    return written
+
+
+def _weights_arg(choices: Iterable[str]):
+    def parse(value: str) -> dict[str, float]:
+        try:
+            return parse_weights(value, choices)
+        except ValueError as e:
+            raise argparse.ArgumentTypeError(str(e)) from None
+
+    return parse
+
+
+def _share_arg(value: str) -> float:
+    share = float(value)
+    if not 0 <= share <= 1:
+        raise argparse.ArgumentTypeError(f"{value} is not between 0 and 1")
+    return share
+
+
+def _format_weights(weights: dict[str, float]) -> str:
+    return ",".join(f"{name}={weight:g}" for name, weight in weights.items())
+
+
+def parse_args(argv: list[str] | None = None) -> tuple[SeedConfig, bool]:
+    """Build a :class:`SeedConfig` (and the ``--reset`` flag) from command-line arguments."""
+    defaults = SeedConfig()
+    parser = argparse.ArgumentParser(prog="python -m app.seed", description=__doc__.split("\n\n")[0])
+    parser.add_argument("--projects", type=int, default=0, help="Projects to add (default 0)")
+    parser.add_argument("--todos", type=int, default=0, help="Todos to add (default 0)")
+    parser.add_argument("--tags", type=int, default=0, help="Tags to add (default 0)")
+    parser.add_argument("--seed", type=int, default=defaults.seed, help=f"Random seed (default {defaults.seed})")
+    parser.add_argument("--reset", action="store_true", help="Delete existing projects, todos and tags first")
+    parser.add_argument(
+        "--project-status",
+        type=_weights_arg(defaults.project_status),
+        default=defaults.project_status,
+        help=f"Project status weights (default {_format_weights(defaults.project_status)})",
+    )
+    parser.add_argument(
+        "--status",
+        type=_weights_arg(defaults.status),
+        default=defaults.status,
+        help=f"Todo status weights (default {_format_weights(defaults.status)})",
+    )
+    parser.add_argument(
+        "--priority",
+        type=_weights_arg(defaults.priority),
+        default=defaults.priority,
+        help=f"Todo priority weights (default {_format_weights(defaults.priority)})",
+    )
+    parser.add_argument(
+        "--unassigned",
+        type=_share_arg,
+        default=defaults.unassigned,
+        help=f"Share of todos without a project (default {defaults.unassigned})",
+    )
+    parser.add_argument(
+        "--project-skew",
+        type=float,
+        default=defaults.project_skew,
+        help=f"Zipf skew of todos over projects, 0 is uniform (default {defaults.project_skew})",
+    )
+    parser.add_argument(
+        "--start",
+        type=datetime.datetime.fromisoformat,
+        default=defaults.start,
+        help=f"Earliest generated date (default {defaults.start.date()})",
+    )
+    parser.add_argument(
+        "--days", type=int, default=defaults.days, help=f"Days covered by generated dates (default {defaults.days})"
+    )
+    parser.add_argument(
+        "--deadline-share",
+        type=_share_arg,
+        default=defaults.deadline_share,
+        help=f"Share of todos with a deadline (default {defaults.deadline_share})",
+    )
+    parser.add_argument(
+        "--scheduled-share",
+        type=_share_arg,
+        default=defaults.scheduled_share,
+        help=f"Share of todos with a scheduled date (default {defaults.scheduled_share})",
+    )
+    parser.add_argument(
+        "--max-tags-per-todo",
+        type=int,
+        default=defaults.max_tags_per_todo,
+        help=f"Upper bound of tags per todo (default {defaults.max_tags_per_todo})",
+    )
+    args = parser.parse_args(argv)
+    options = vars(args)
+    reset_first = options.pop("reset")
+    return SeedConfig(**options), reset_first
+
+
+if __name__ == "__main__":
+    from .database import Base, engine
+    from .migrations import run_migrations
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    config, reset_first = parse_args()
+    Base.metadata.create_all(bind=engine)
+    run_migrations(engine)
+    if reset_first:
+        with engine.begin() as conn:
+            reset(conn)
+    started = time.perf_counter()
+    written = seed(engine, config)
+    elapsed = time.perf_counter() - started
+    print(f"Seeded {', '.join(f'{count} {name}' for name, count in written.items())} in {elapsed:.1f}s")
@@ -0,0 +1,136 @@
+"""Slow query log for the SQLAlchemy engines (configured in ``database.py``).
+
+Statements slower than ``DB_SLOW_QUERY_MS`` (default 200, 0 disables) are
+logged at WARNING on the ``db.slow_query`` logger with their SQL, the shape
+of their bound parameters (names and types only, never values), duration
+and the ``request_id`` of the request that ran them, and counted in
+``db_slow_queries_total``.
+
+With ``DB_SLOW_QUERY_EXPLAIN=1`` slow SELECTs on Postgres and SQLite also
+get their plan attached (``EXPLAIN`` / ``EXPLAIN QUERY PLAN``, which plan
+without running the query again). Each distinct statement is explained at
+most once per ``DB_SLOW_QUERY_EXPLAIN_INTERVAL`` seconds (default 60).
+"""
+
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+from .metrics import DB_SLOW_QUERIES
+from .middleware.request_id import current_request_id
+
+logger = logging.getLogger("db.slow_query")
+
+# Longest SQL text kept in a log record
+MAX_SQL_LENGTH = 4000
+
+# Distinct statements remembered by the EXPLAIN rate limiter
+MAX_EXPLAINED_STATEMENTS = 1024
+
+_EXPLAIN_PREFIXES = {"postgresql": "EXPLAIN ", "sqlite": "EXPLAIN QUERY PLAN "}
+
+
+def parameter_shape(parameters: Any, executemany: bool = False) -> Any:
+    """Describe bound parameters by type, e.g. ``{"id_1": "int"}``, ``["str", "NoneType"]``.
+
+    For executemany the shape of the first row is given with the row count.
+    """
+    if executemany:
+        rows = list(parameters or [])
+        return {"rows": len(rows), "shape": parameter_shape(rows[0]) if rows else None}
+    if isinstance(parameters, dict):
+        return {name: type(value).__name__ for name, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [type(value).__name__ for value in parameters]
+    return None if parameters is None else type(parameters).__name__
+
+
+class ExplainLimiter:
+    """Allows each statement to be explained at most once per ``interval`` seconds."""
+
+    def __init__(self, interval: float, clock: Callable[[], float] = time.monotonic):
+        self.interval = interval
+        self._clock = clock
+        self._last: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def allow(self, statement: str) -> bool:
+        now = self._clock()
+        with self._lock:
+            last = self._last.get(statement)
+            if last is not None and now - last < self.interval:
+                return False
+            if len(self._last) >= MAX_EXPLAINED_STATEMENTS:
+                self._last.clear()
+            self._last[statement] = now
+            return True
+
+
+class SlowQueryLog:
+    """Logs statements that took at least ``threshold`` seconds (see :func:`track_queries`)."""
+
+    def __init__(self, threshold_ms: float, explain: bool = False, explain_interval: float = 60.0):
+        self.threshold = threshold_ms / 1000
+        self.explain = explain
+        self.limiter = ExplainLimiter(explain_interval)
+
+    def record(self, conn, statement: str, parameters: Any, executemany: bool, duration: float) -> None:
+        DB_SLOW_QUERIES.inc()
+        duration_ms = duration * 1000
+        extra = {
+            "request_id": current_request_id(),
+            "sql": statement[:MAX_SQL_LENGTH],
+            "parameters": parameter_shape(parameters, executemany),
+            "duration_ms": round(duration_ms, 3),
+        }
+        if self.explain and not executemany and self._explainable(conn, statement):
+            plan = explain(conn, statement, parameters)
+            if plan is not None:
+                extra["explain"] = plan
+        logger.warning(f"Slow query ({duration_ms:.2f}ms): {_summary(statement)}", extra=extra)
+
+    def _explainable(self, conn, statement: str) -> bool:
+        return (
+            conn.dialect.name in _EXPLAIN_PREFIXES
+            and statement.lstrip()[:6].upper() == "SELECT"
+            and self.limiter.allow(statement)
+        )
+
+
+def _summary(statement: str) -> str:
+    """The statement on one line, shortened for the log message."""
+    line = " ".join(statement.split())
+    return line if len(line) <= 120 else line[:117] + "..."
+
+
+def explain(conn, statement: str, parameters: Any) -> Optional[str]:
+    """Return the plan for ``statement``, or None if it could not be explained.
+
+    Runs on the statement's own DBAPI connection, bypassing the engine events.
+    On Postgres it is wrapped in a savepoint so a failing EXPLAIN cannot abort
+    the surrounding transaction.
+    """
+    dialect = conn.dialect.name
+    savepoint = dialect == "postgresql"
+    cursor = conn.connection.dbapi_connection.cursor()
+    try:
+        if savepoint:
+            cursor.execute("SAVEPOINT slow_query_explain")
+        try:
+            cursor.execute(_EXPLAIN_PREFIXES[dialect] + statement, parameters)
+            rows = cursor.fetchall()
+        except Exception:
+            if savepoint:
+                cursor.execute("ROLLBACK TO SAVEPOINT slow_query_explain")
+            raise
+        finally:
+            if savepoint:
+                cursor.execute("RELEASE SAVEPOINT slow_query_explain")
+    except Exception:
+        logger.debug("Could not explain slow query", exc_info=True)
+        return None
+    finally:
+        cursor.close()
+    # Postgres returns one plan line per row; SQLite's detail is the last column
+    return "\n".join(str(row[-1]) for row in rows)
@@ -0,0 +1,129 @@
+"""Latency and throughput of the API hot paths at each seeded size (see ``conftest.py``).
+
+Each benchmark issues one request at a time over ASGI, so the numbers are
+per-request service time without network or server overhead.
+"""
+
+import asyncio
+import random
+
+import common
+import httpx
+import pytest
+from sqlalchemy import select
+
+
+@pytest.fixture
+def bench(request, app, dataset, recorder):
+    """Run ``make_call(client)``'s coroutine repeatedly and record the result under the test's name."""
+    iterations = request.config.getoption("--bench-iterations")
+    warmup = request.config.getoption("--bench-warmup")
+    name = f"{request.node.originalname.removeprefix('test_')}[{dataset}]"
+
+    def run(make_call):
+        async def main():
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+                return await common.measure_async(make_call(client), iterations, warmup)
+
+        result = asyncio.run(main())
+        recorder.record(name, result)
+        return result
+
+    return run
+
+
+def _get(client, url, **params):
+    async def call():
+        (await client.get(url, params=params)).raise_for_status()
+
+    return call
+
+
+def _project_with_todos(dataset) -> tuple[int, list[int]]:
+    """The first seeded project and the ids of its todos."""
+    from app.database import engine
+    from app.models.todo import Todo
+
+    with engine.connect() as conn:
+        project_id = conn.execute(select(Todo.project_id).where(Todo.project_id.is_not(None)).limit(1)).scalar()
+        ids = conn.execute(select(Todo.id).where(Todo.project_id == project_id).order_by(Todo.id)).scalars().all()
+    return project_id, list(ids)
+
+
+def test_list_todos(bench, dataset):
+    bench(lambda client: _get(client, "/todos", limit=50))
+
+
+def test_list_project_todos(bench, dataset):
+    project_id, _ = _project_with_todos(dataset)
+    bench(lambda client: _get(client, "/todos", project_id=project_id, limit=50))
+
+
+def test_get_todo(bench, dataset):
+    rng = random.Random(dataset)
+
+    def make_call(client):
+        async def call():
+            (await client.get(f"/todos/{rng.randint(1, dataset)}")).raise_for_status()
+
+        return call
+
+    bench(make_call)
+
+
+def test_create_todo(bench, dataset):
+    def make_call(client):
+        async def call():
+            (await client.post("/todos", json={"title": "Bench todo", "priority": "medium"})).raise_for_status()
+
+        return call
+
+    bench(make_call)
+
+
+def test_update_todo(bench, dataset):
+    rng = random.Random(dataset)
+
+    def make_call(client):
+        async def call():
+            todo_id = rng.randint(1, dataset)
+            body = {"title": f"Updated {todo_id}", "priority": "high", "status": "pending"}
+            (await client.put(f"/todos/{todo_id}", json=body)).raise_for_status()
+
+        return call
+
+    bench(make_call)
+
+
+def test_patch_todo_status(bench, dataset):
+    rng = random.Random(dataset)
+
+    def make_call(client):
+        async def call():
+            status = rng.choice(("pending", "completed"))
+            (await client.patch(f"/todos/{rng.randint(1, dataset)}", json={"status": status})).raise_for_status()
+
+        return call
+
+    bench(make_call)
+
+
+def test_reorder_todos(bench, dataset):
+    _, ids = _project_with_todos(dataset)
+    ids = ids[:50]
+    rng = random.Random(dataset)
+
+    def make_call(client):
+        async def call():
+            shuffled = rng.sample(ids, len(ids))
+            orders = [{"id": todo_id, "order": rank * 1024} for rank, todo_id in enumerate(shuffled)]
+            (await client.put("/todos/reorder", json={"todo_orders": orders})).raise_for_status()
+
+        return call
+
+    bench(make_call)
+
+
+def test_metrics_scrape(bench, dataset):
+    bench(lambda client: _get(client, "/metrics"))
@@ -0,0 +1,92 @@
+"""GET /todos under 50 and 200 concurrent clients: sync routes vs DB_ASYNC routes.
+
+Both apps are driven in-process through httpx's ASGITransport, so the sync
+handlers are bounded by AnyIO's worker thread limiter exactly as under
+uvicorn, while the async handlers await an AsyncSession instead.
+"""
+
+import common
+
+common.configure()
+
+import asyncio
+import os
+import time
+
+import httpx
+from fastapi import FastAPI
+
+# Fail fast instead of queueing 30s when the sync path starves its pool
+os.environ.setdefault("DB_POOL_TIMEOUT", "5")
+
+from app.async_database import get_async_engine
+from app.routes import async_projects, async_todos, projects, todos
+
+CONCURRENCY = (50, 200)
+REQUESTS = 2000
+TODOS = 500
+
+
+def build_app(*routers) -> FastAPI:
+    app = FastAPI()
+    for router in routers:
+        app.include_router(router)
+    return app
+
+
+async def run_load(app: FastAPI, concurrency: int) -> dict:
+    transport = httpx.ASGITransport(app=app)
+    latencies = []
+    errors = 0
+    remaining = iter(range(REQUESTS))
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+
+        async def worker():
+            nonlocal errors
+            for _ in remaining:
+                t0 = time.perf_counter()
+                try:
+                    response = await client.get("/todos", params={"limit": 50})
+                    response.raise_for_status()
+                except Exception:
+                    errors += 1
+                    continue
+                latencies.append(time.perf_counter() - t0)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    # Pooled async connections belong to this event loop; drop them before the next run
+    await get_async_engine().dispose()
+
+    latencies.sort()
+    if not latencies:
+        latencies.append(float("nan"))
+    return {
+        "iterations": REQUESTS,
+        "errors": errors,
+        "ops_per_sec": (REQUESTS - errors) / elapsed,
+        "p50_ms": latencies[len(latencies) // 2] * 1000,
+        "p99_ms": latencies[int(len(latencies) * 0.99)] * 1000,
+    }
+
+
+def main() -> None:
+    with common.client(common.load_app()) as client:
+        for i in range(TODOS):
+            client.post("/todos", json={"title": f"Bench {i}", "order": i})
+
+    sync_app = build_app(todos.router, projects.router)
+    async_app = build_app(async_todos.router, async_projects.router)
+    for concurrency in CONCURRENCY:
+        for label, app in (("sync", sync_app), ("async", async_app)):
+            result = asyncio.run(run_load(app, concurrency))
+            common.report(f"GET /todos x{concurrency} concurrent ({label})", result)
+            if result["errors"]:
+                print(f"    {result['errors']} of {REQUESTS} requests failed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""Records/sec of JSONLogFormatter against the pre-optimization formatter.
+
+Formats the "Request completed" record RequestLoggingMiddleware emits for
+every request. The legacy formatter is kept here verbatim as the baseline.
+"""
+
+import common  # noqa: F401  (puts the app on sys.path)
+
+import json
+import logging
+import socket
+from datetime import datetime, timezone
+
+from app import logging_config
+from app.logging_config import JSONLogFormatter
+
+ITERATIONS = 50000
+
+
+class LegacyJSONLogFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        log_data = {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "service": getattr(record, "service", "mytodoapp"),
+            "level": record.levelname,
+            "message": record.getMessage(),
+            "logger": record.name,
+            "host": socket.gethostname(),
+        }
+        request_id = getattr(record, "request_id", None)
+        if request_id:
+            log_data["request_id"] = request_id
+        project_id = getattr(record, "project_id", None)
+        if project_id:
+            log_data["project_id"] = project_id
+        user_id = getattr(record, "user_id", None)
+        if user_id:
+            log_data["user_id"] = user_id
+        if record.exc_info:
+            log_data["stack_trace"] = self.formatException(record.exc_info)
+        standard_attrs = {
+            "name", "msg", "args", "levelname", "levelno", "pathname", "filename", "module",
+            "exc_info", "exc_text", "lineno", "funcName", "created", "asctime", "msecs",
+            "relativeCreated", "thread", "threadName", "processName", "process", "service",
+            "request_id", "project_id", "user_id",
+        }  # fmt: skip
+        metadata = {}
+        for key, value in record.__dict__.items():
+            if key not in standard_attrs and not key.startswith("_"):
+                metadata[key] = value
+        if metadata:
+            log_data["metadata"] = metadata
+        return json.dumps(log_data)
+
+
+def completion_record() -> logging.LogRecord:
+    return logging.getLogger("api").makeRecord(
+        "api",
+        logging.INFO,
+        __file__,
+        0,
+        "Request completed: GET /todos 200 (3.21ms)",
+        None,
+        None,
+        extra={
+            "request_id": "0f8fa3c2-5a4e-4c1e-9d6a-2b1f4f3c9e77",
+            "project_id": "12",
+            "http_method": "GET",
+            "path": "/todos",
+            "status_code": 200,
+            "duration_ms": 3.21,
+        },
+    )
+
+
+def main() -> None:
+    record = completion_record()
+    legacy, current = LegacyJSONLogFormatter(), JSONLogFormatter()
+
+    # Same fields, same values apart from the timestamp
+    expected, actual = json.loads(legacy.format(record)), json.loads(current.format(record))
+    expected.pop("timestamp"), actual.pop("timestamp")
+    assert expected == actual, (expected, actual)
+
+    common.report("format (legacy)", common.measure(lambda: legacy.format(record), ITERATIONS))
+    if logging_config.orjson is not None:
+        common.report("format (orjson)", common.measure(lambda: current.format(record), ITERATIONS))
+    # Stdlib encoder, as used when orjson is not installed
+    logging_config._dumps_json = json.dumps
+    common.report("format (json)", common.measure(lambda: current.format(record), ITERATIONS))
+
+
+if __name__ == "__main__":
+    main()
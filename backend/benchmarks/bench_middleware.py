@@ -0,0 +1,47 @@
+"""GET /healthz requests/sec with the observability middleware stack on and off.
+
+"bare" is a FastAPI app with only the route; "stack" adds the request-id,
+request-logging, Prometheus and query-stats middleware exactly as main.py does. Log
+records are dropped below WARNING so the numbers isolate middleware cost.
+"""
+
+import common
+
+common.configure()
+
+import logging
+
+from fastapi import FastAPI
+
+from app.logging_config import setup_request_logging
+from app.metrics import setup_metrics
+from app.middleware.query_stats import add_query_stats_middleware
+from app.middleware.request_id import add_request_id_middleware
+
+ITERATIONS = 5000
+
+
+def build_app(with_stack: bool) -> FastAPI:
+    app = FastAPI()
+    if with_stack:
+        setup_request_logging(app)
+        add_request_id_middleware(app)
+        setup_metrics(app, service_name="bench", endpoint_path="/metrics", exclude_paths=["/metrics"])
+        add_query_stats_middleware(app)
+
+    @app.get("/healthz")
+    def health_check():
+        return {"status": "healthy"}
+
+    return app
+
+
+def main() -> None:
+    logging.getLogger().setLevel(logging.WARNING)
+    for label, with_stack in (("bare", False), ("stack", True)):
+        with common.client(build_app(with_stack)) as client:
+            common.report(f"GET /healthz ({label})", common.measure(lambda: client.get("/healthz"), ITERATIONS))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+"""GET /projects throughput with and without per-read legacy status UPDATEs.
+
+"legacy" replays what project reads used to do on every request (two
+UPDATE statements plus a commit) before issuing the GET; "current" is the
+read-only path after moving that work into app.migrations.
+"""
+
+import common
+
+common.configure()
+
+from app.database import engine
+from app.migrations import migrate_legacy_project_statuses
+
+PROJECTS = 200
+ITERATIONS = 2000
+
+
+def main() -> None:
+    with common.client(common.load_app()) as client:
+        for i in range(PROJECTS):
+            client.post("/projects", json={"name": f"Bench project {i}", "status": "active"})
+
+        def legacy_read():
+            with engine.begin() as conn:
+                migrate_legacy_project_statuses(conn)
+            client.get("/projects")
+
+        common.report("GET /projects (legacy per-read UPDATEs)", common.measure(legacy_read, ITERATIONS))
+        common.report("GET /projects (read-only)", common.measure(lambda: client.get("/projects"), ITERATIONS))
+
+
+if __name__ == "__main__":
+    main()
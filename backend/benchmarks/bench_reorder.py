@@ -0,0 +1,47 @@
+"""Reorder cost at 10, 100 and 1,000 todos: per-row SELECT loop vs one bulk UPDATE.
+
+"loop" is the previous update_todo_orders implementation (one SELECT per
+todo, then a commit); "bulk" is the current single UPDATE ... CASE.
+"""
+
+import common
+
+common.configure()
+
+from sqlalchemy import insert
+
+from app.database import SessionLocal, engine
+from app.models.todo import Todo
+from app.repository import todo_repo
+
+SIZES = (10, 100, 1000)
+ITERATIONS = {10: 500, 100: 100, 1000: 20}
+
+
+def loop_update_todo_orders(db, todo_orders):
+    for todo_order in todo_orders:
+        db_todo = db.query(Todo).filter(Todo.id == todo_order["id"]).first()
+        if db_todo:
+            db_todo.order = todo_order["order"]
+    db.commit()
+
+
+def main() -> None:
+    common.load_app()
+    for size in SIZES:
+        with engine.begin() as conn:
+            ids = conn.execute(
+                insert(Todo).returning(Todo.id), [{"title": f"Bench {i}", "order": i} for i in range(size)]
+            ).scalars().all()
+        payload = [{"id": todo_id, "order": size - n} for n, todo_id in enumerate(ids)]
+
+        for label, fn in (("loop", loop_update_todo_orders), ("bulk", todo_repo.update_todo_orders)):
+            def run():
+                with SessionLocal() as db:
+                    fn(db, payload)
+
+            common.report(f"reorder {size:>5} todos ({label})", common.measure(run, ITERATIONS[size], warmup=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+"""Creating, updating and deleting N todos: N single-item requests vs one POST /todos/batch.
+
+Throughput is reported in todos per second so both paths are comparable.
+"""
+
+import common
+
+SIZES = (10, 100, 1000)
+ROUNDS = {10: 50, 100: 10, 1000: 2}
+
+
+def todos_per_sec(result: dict, size: int) -> dict:
+    return {**result, "ops_per_sec": result["ops_per_sec"] * size}
+
+
+def main() -> None:
+    app = common.load_app()
+    with common.client(app) as client:
+        for size in SIZES:
+            def single():
+                ids = [client.post("/todos", json={"title": f"Bench {i}"}).json()["id"] for i in range(size)]
+                for todo_id in ids:
+                    client.put(f"/todos/{todo_id}", json={"title": "Bench done", "status": "completed"})
+                for todo_id in ids:
+                    client.delete(f"/todos/{todo_id}")
+
+            def batch():
+                results = client.post("/todos/batch", json={"create": [{"title": f"Bench {i}"} for i in range(size)]})
+                ids = [r["id"] for r in results.json()["results"]]
+                client.post("/todos/batch", json={"update": [{"id": todo_id, "status": "completed"} for todo_id in ids]})
+                client.post("/todos/batch", json={"delete": ids})
+
+            for label, fn in (("single", single), ("batch", batch)):
+                result = common.measure(fn, ROUNDS[size], warmup=1)
+                common.report(f"{size:>5} todos x3 ops ({label}, todos/s)", todos_per_sec(result, size))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""Shared setup for the standalone micro-benchmarks in this directory.
+
+Each benchmark runs the API in-process against a throwaway SQLite database so
+numbers are comparable between branches without docker. Run them from the
+``backend`` directory, e.g.::
+
+    python benchmarks/bench_projects_read.py
+
+The API hot-path suite runs under pytest instead (see ``conftest.py``)::
+
+    python -m pytest benchmarks/bench_api_hot_paths.py
+
+Importing this module has no effect beyond putting the app on ``sys.path``;
+scripts call :func:`configure` before importing anything from the app.
+"""
+
+import logging
+import os
+import sys
+import tempfile
+import time
+from typing import Awaitable, Callable
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+_configured = False
+
+
+def configure() -> None:
+    """Point the app at a throwaway SQLite database unless ``DATABASE_URL`` is set.
+
+    Must run before the app (and its engine) is imported; later calls are no-ops.
+    """
+    global _configured
+    if _configured:
+        return
+    _configured = True
+    os.environ["TESTING"] = "1"
+    db_dir = tempfile.mkdtemp(prefix="mytodoapp-bench-")
+    os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(db_dir, 'bench.db')}")
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+
+def load_app():
+    """Import the FastAPI app with request logging quietened for benchmarking."""
+    configure()
+    from app.main import app
+
+    logging.getLogger().setLevel(logging.WARNING)
+    return app
+
+
+def client(app):
+    """Return a TestClient bound to one event-loop portal for its lifetime.
+
+    Use it as a context manager; a bare TestClient starts a new portal per
+    request and gets steadily slower over a long benchmark.
+    """
+    from fastapi.testclient import TestClient
+
+    return TestClient(app)
+
+
+def measure(fn: Callable[[], object], iterations: int, warmup: int = 20) -> dict:
+    """Call ``fn`` repeatedly and return throughput and latency percentiles."""
+    for _ in range(warmup):
+        fn()
+    samples = []
+    started = time.perf_counter()
+    for _ in range(iterations):
+        t0 = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - t0)
+    return summarize(samples, time.perf_counter() - started)
+
+
+def summarize(samples: list[float], elapsed: float) -> dict:
+    """Throughput and latency percentiles from per-call durations in seconds."""
+    samples = sorted(samples)
+    return {
+        "iterations": len(samples),
+        "ops_per_sec": len(samples) / elapsed,
+        "p50_ms": samples[len(samples) // 2] * 1000,
+        "p99_ms": samples[min(len(samples) - 1, int(len(samples) * 0.99))] * 1000,
+    }
+
+
+async def measure_async(fn: Callable[[], Awaitable[object]], iterations: int, warmup: int = 20) -> dict:
+    """Async :func:`measure`: await ``fn`` repeatedly, one call at a time."""
+    for _ in range(warmup):
+        await fn()
+    samples = []
+    started = time.perf_counter()
+    for _ in range(iterations):
+        t0 = time.perf_counter()
+        await fn()
+        samples.append(time.perf_counter() - t0)
+    return summarize(samples, time.perf_counter() - started)
+
+
+def report(label: str, result: dict) -> None:
+    """Print one benchmark result line."""
+    print(
+        f"{label:<40} {result['ops_per_sec']:>10.1f} ops/s   "
+        f"p50 {result['p50_ms']:>7.2f} ms   p99 {result['p99_ms']:>7.2f} ms"
+    )
@@ -0,0 +1,170 @@
+"""Pytest harness for the API hot-path benchmark suite (``bench_api_hot_paths.py``).
+
+The app runs in-process behind httpx's ASGITransport against a database
+seeded deterministically to each size in ``--bench-sizes``. Results are
+written as JSON to ``--bench-json``; given a previous file as
+``--bench-baseline``, a benchmark fails when its throughput drops by more
+than ``--bench-max-regression`` (a fraction). From the ``backend``
+directory::
+
+    python -m pytest benchmarks/bench_api_hot_paths.py --bench-sizes 1000,10000,100000
+    python -m pytest benchmarks/bench_api_hot_paths.py --bench-baseline benchmarks/results/main.json
+
+The file does not match ``test_*.py``, so a plain ``pytest`` run never
+collects it, and nothing here touches the database settings until the
+``app`` fixture runs.
+
+Set ``DATABASE_URL`` to run against Postgres instead of the default
+throwaway SQLite file.
+"""
+
+import datetime
+import json
+import os
+import platform
+
+import pytest
+import sqlalchemy
+from sqlalchemy import func, select
+
+SEED = 1234
+PROJECT_EVERY = 100  # one project per this many todos
+DEFAULT_RESULTS = os.path.join(os.path.dirname(__file__), "results", "latest.json")
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("benchmarks")
+    group.addoption("--bench-sizes", default="1000,10000,100000", help="Comma-separated todo counts to seed")
+    group.addoption("--bench-iterations", type=int, default=200, help="Timed requests per benchmark")
+    group.addoption("--bench-warmup", type=int, default=20, help="Untimed requests before each benchmark")
+    group.addoption("--bench-json", default=DEFAULT_RESULTS, help="Where to write the JSON results")
+    group.addoption("--bench-baseline", default=None, help="Previous results JSON to compare against")
+    group.addoption(
+        "--bench-max-regression",
+        type=float,
+        default=0.2,
+        help="Allowed throughput drop against the baseline, as a fraction",
+    )
+
+
+def bench_sizes(config) -> list[int]:
+    return sorted(int(size) for size in config.getoption("--bench-sizes").split(",") if size.strip())
+
+
+def pytest_generate_tests(metafunc):
+    # Module scope groups the benchmarks by size, so each size is seeded once
+    if "dataset" in metafunc.fixturenames:
+        sizes = bench_sizes(metafunc.config)
+        metafunc.parametrize("dataset", sizes, indirect=True, scope="module", ids=[f"{size}todos" for size in sizes])
+
+
+def seed_todos(engine, size: int) -> None:
+    """Top the database up to ``size`` todos and one project per ``PROJECT_EVERY`` (see ``app.seed``)."""
+    from app.models.project import Project
+    from app.models.todo import Todo
+    from app.seed import SeedConfig, seed
+
+    with engine.connect() as conn:
+        todos = conn.execute(select(func.count()).select_from(Todo)).scalar()
+        projects = conn.execute(select(func.count()).select_from(Project)).scalar()
+    if todos >= size:
+        return
+    wanted = max(1, size // PROJECT_EVERY)
+    seed(engine, SeedConfig(projects=max(0, wanted - projects), todos=size - todos, seed=SEED))
+
+
+@pytest.fixture(scope="session")
+def app():
+    import common
+
+    return common.load_app()
+
+
+@pytest.fixture(scope="module")
+def dataset(request, app):
+    """Seed the database to the parametrized size and return that size."""
+    from app.database import engine
+
+    seed_todos(engine, request.param)
+    return request.param
+
+
+class Recorder:
+    """Collects benchmark results, checks them against a baseline and writes them out."""
+
+    def __init__(self, config):
+        self.config = config
+        self.results: dict[str, dict] = {}
+        baseline_path = config.getoption("--bench-baseline")
+        self.baseline = {}
+        if baseline_path:
+            with open(baseline_path) as f:
+                self.baseline = json.load(f)["results"]
+        self.max_regression = config.getoption("--bench-max-regression")
+
+    def record(self, name: str, result: dict) -> None:
+        self.results[name] = result
+        previous = self.baseline.get(name)
+        if previous is None:
+            return
+        floor = previous["ops_per_sec"] * (1 - self.max_regression)
+        if result["ops_per_sec"] < floor:
+            pytest.fail(
+                f"{name}: {result['ops_per_sec']:.1f} ops/s is more than {self.max_regression:.0%} "
+                f"below the baseline {previous['ops_per_sec']:.1f} ops/s"
+            )
+
+    def write(self) -> None:
+        if not self.results:
+            return
+        from app.database import engine
+
+        path = self.config.getoption("--bench-json")
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(
+                {
+                    "meta": {
+                        "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+                        "python": platform.python_version(),
+                        "sqlalchemy": sqlalchemy.__version__,
+                        "database": engine.dialect.name,
+                        "iterations": self.config.getoption("--bench-iterations"),
+                    },
+                    "results": self.results,
+                },
+                f,
+                indent=2,
+                sort_keys=True,
+            )
+
+
+RECORDER = pytest.StashKey[Recorder]()
+
+
+def pytest_configure(config):
+    config.stash[RECORDER] = Recorder(config)
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    recorder = config.stash.get(RECORDER, None)
+    if recorder is None or not recorder.results:
+        return
+    terminalreporter.section("benchmarks")
+    for name, result in recorder.results.items():
+        terminalreporter.write_line(
+            f"{name:<40} {result['ops_per_sec']:>10.1f} ops/s   "
+            f"p50 {result['p50_ms']:>7.2f} ms   p99 {result['p99_ms']:>7.2f} ms"
+        )
+    terminalreporter.write_line(f"results written to {config.getoption('--bench-json')}")
+
+
+def pytest_sessionfinish(session):
+    recorder = session.config.stash.get(RECORDER, None)
+    if recorder is not None:
+        recorder.write()
+
+
+@pytest.fixture(scope="session")
+def recorder(request):
+    return request.config.stash[RECORDER]
@@ -1,6 +1,24 @@
 import os
 
+import pytest
+from sqlalchemy import event
+
 # Ensure tests run in isolated SQLite database
 os.environ.setdefault("TESTING", "1")
 # Allow overriding via environment; if not provided force sqlite file DB
 os.environ.setdefault("DATABASE_URL", "sqlite:///./test.db")
+
+
+@pytest.fixture
+def sql_statements():
+    """Record the SQL statements the app's engine executes while the test runs."""
+    from app.database import engine
+
+    statements: list[str] = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    yield statements
+    event.remove(engine, "before_cursor_execute", record)
@@ -0,0 +1,76 @@
+import pytest
+
+pytest.importorskip("aiosqlite")
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.main import app  # noqa: F401  (creates the test database tables)
+from app.routes import async_projects, async_todos
+
+async_app = FastAPI()
+async_app.include_router(async_todos.router)
+async_app.include_router(async_projects.router)
+
+client = TestClient(async_app)
+
+
+def test_async_todo_roundtrip():
+    project_id = client.post("/projects", json={"name": "Async Project", "status": "undone"}).json()["id"]
+    created = [
+        client.post("/todos", json={"title": f"Async {i}", "project_id": project_id, "order": i}).json()
+        for i in range(3)
+    ]
+    ids = [t["id"] for t in created]
+    assert client.get(f"/todos/{ids[0]}").json()["title"] == "Async 0"
+    etag = client.get("/todos").headers["ETag"]
+    assert client.get("/todos", headers={"If-None-Match": etag}).status_code == 304
+    token = client.get("/todos/changes").json()["token"]
+
+    listed = client.get("/todos", params={"project_id": project_id, "limit": 2})
+    assert [t["id"] for t in listed.json()] == ids[:2]
+    rest = client.get("/todos", params={"project_id": project_id, "cursor": listed.headers["X-Next-Cursor"]})
+    assert [t["id"] for t in rest.json()] == ids[2:]
+
+    moved = client.put(f"/todos/{ids[2]}/move", json={"after_id": ids[0], "before_id": ids[1]})
+    assert moved.status_code == 200
+    listed = client.get("/todos", params={"project_id": project_id}).json()
+    assert [t["id"] for t in listed] == [ids[0], ids[2], ids[1]]
+
+    reorder = client.put("/todos/reorder", json={"todo_orders": [{"id": ids[1], "order": -1}, {"id": 999999999, "order": 0}]})
+    assert reorder.json()["missing_ids"] == [999999999]
+
+    updated = client.put(f"/todos/{ids[0]}", json={"title": "Async done", "status": "completed", "project_id": project_id})
+    assert updated.json()["status"] == "completed"
+    assert updated.json()["completed_at"] is not None
+
+    assert client.delete(f"/todos/{ids[0]}").status_code == 200
+    changes = client.get("/todos/changes", params={"since": token}).json()
+    assert changes["deleted_ids"] == [ids[0]]
+    assert {t["id"] for t in changes["todos"]} == set(ids[1:])
+    first_page = client.get("/todos/changes", params={"since": token, "limit": 1}).json()
+    assert first_page["has_more"] and len(first_page["todos"]) == 1
+    rest = client.get("/todos/changes", params={"since": first_page["token"], "limit": 10}).json()
+    assert not rest["has_more"] and rest["token"] == changes["token"]
+    assert client.get(f"/todos/{ids[0]}").status_code == 404
+    current = client.get("/todos").headers["ETag"]
+    assert client.get(f"/todos/{ids[0]}", headers={"If-None-Match": current}).status_code == 404
+
+    batch = client.post(
+        "/todos/batch",
+        json={"create": [{"title": "Async batch"}], "update": [{"id": ids[1], "order": 7}], "delete": [ids[2]]},
+    ).json()
+    assert (batch["created"], batch["updated"], batch["deleted"]) == (1, 1, 1)
+    assert client.get(f"/todos/{ids[1]}").json()["order"] == 7
+    patched = client.patch(f"/todos/{ids[1]}", json={"status": "completed"}).json()
+    assert (patched["order"], patched["status"]) == (7, "completed") and patched["completed_at"] is not None
+    assert client.get(f"/todos/{ids[2]}").status_code == 404
+
+
+def test_async_project_roundtrip():
+    project_id = client.post("/projects", json={"name": "Async Project 2", "status": "undone"}).json()["id"]
+    assert client.get(f"/projects/{project_id}").json()["status"] == "active"
+    response = client.put(f"/projects/{project_id}", json={"name": "Async Updated", "status": "done"})
+    assert response.json()["status"] == "completed"
+    assert client.get(f"/projects/{project_id}").json()["name"] == "Async Updated"
+    assert client.get("/projects/999999999").status_code == 404
@@ -0,0 +1,99 @@
+import asyncio
+import threading
+
+from app.cache import Cache, MemoryCache, RedisCache
+from app.metrics import REGISTRY
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _sample(name: str, cache: str) -> float:
+    return REGISTRY.get_sample_value(name, {"cache": cache}) or 0.0
+
+
+def test_memory_cache_expires_entries():
+    clock = FakeClock()
+    cache = MemoryCache("ttl-test", ttl=10, max_entries=10, clock=clock)
+    cache.set("a", "1")
+    clock.now = 9.9
+    assert cache.get("a") == "1"
+    clock.now = 10
+    assert cache.get("a") is None
+
+
+def test_memory_cache_evicts_least_recently_used():
+    cache = MemoryCache("lru-test", ttl=60, max_entries=2)
+    cache.set("a", "1")
+    cache.set("b", "2")
+    cache.get("a")
+    cache.set("c", "3")
+    assert cache.get("b") is None
+    assert cache.get("a") == "1" and cache.get("c") == "3"
+    assert _sample("cache_evictions_total", "lru-test") == 1
+
+
+def test_cache_counts_hits_and_misses_and_survives_backend_errors():
+    class BrokenBackend(MemoryCache):
+        def get(self, key):
+            raise ConnectionError("backend down")
+
+    cache = Cache("metrics-test", MemoryCache("metrics-test", ttl=60, max_entries=10))
+    generation = cache.generation()
+    assert cache.get("k", generation) is None
+    cache.set("k", "v", generation)
+    assert cache.get("k", generation) == "v"
+    assert _sample("cache_misses_total", "metrics-test") == 1
+    assert _sample("cache_hits_total", "metrics-test") == 1
+
+    broken = Cache("broken-test", BrokenBackend("broken-test", ttl=60, max_entries=10))
+    assert broken.get("k", broken.generation()) is None
+    assert _sample("cache_misses_total", "broken-test") == 1
+
+
+def test_value_read_before_an_invalidation_is_not_served_after_it():
+    cache = Cache("race-test", MemoryCache("race-test", ttl=60, max_entries=10))
+    # Reader misses and queries the database...
+    generation = cache.generation()
+    assert cache.get("k", generation) is None
+    # ...a writer commits and invalidates before the reader stores its (stale) result
+    cache.invalidate()
+    cache.set("k", "stale", generation)
+    assert cache.get("k", cache.generation()) is None
+
+
+def test_async_calls_keep_redis_off_the_event_loop():
+    class FakeRedis:
+        def __init__(self):
+            self.data = {}
+            self.threads = set()
+
+        def get(self, key):
+            self.threads.add(threading.current_thread())
+            return self.data.get(key)
+
+        def set(self, key, value, px):
+            self.threads.add(threading.current_thread())
+            self.data[key] = value
+
+        def incr(self, key):
+            self.threads.add(threading.current_thread())
+            self.data[key] = int(self.data.get(key, 0)) + 1
+
+    client = FakeRedis()
+    cache = Cache("async-test", RedisCache("async-test", ttl=60, client=client))
+
+    async def scenario():
+        generation = await cache.generation_async()
+        await cache.set_async("k", "v", generation)
+        assert await cache.get_async("k", generation) == "v"
+        await cache.invalidate_async()
+        assert await cache.get_async("k", await cache.generation_async()) is None
+
+    asyncio.run(scenario())
+    assert client.threads and threading.main_thread() not in client.threads
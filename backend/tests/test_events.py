@@ -0,0 +1,123 @@
+import asyncio
+import contextlib
+import json
+import threading
+
+from fastapi.testclient import TestClient
+
+from app import events
+from app.main import app
+from app.metrics import REGISTRY
+from app.routes.events import event_stream, format_event
+
+client = TestClient(app)
+
+
+class FakeRequest:
+    def __init__(self):
+        self.disconnected = False
+
+    async def is_disconnected(self):
+        return self.disconnected
+
+
+def test_slow_subscriber_gets_resync_instead_of_unbounded_queue():
+    async def scenario():
+        broker = events.EventBroker(max_queue_size=2)
+        subscription = broker.subscribe()
+        before = REGISTRY.get_sample_value("event_stream_events_dropped_total") or 0.0
+
+        publisher = threading.Thread(target=lambda: [broker.fan_out({"type": "todo.updated", "ids": [i]}) for i in range(5)])
+        publisher.start()
+        publisher.join()
+        await asyncio.sleep(0.05)
+
+        assert await subscription.get() == events.RESYNC
+        assert subscription.queue.empty()
+        assert (REGISTRY.get_sample_value("event_stream_events_dropped_total") or 0.0) - before == 5
+        broker.unsubscribe(subscription)
+
+    asyncio.run(scenario())
+
+
+def test_writes_publish_events():
+    async def scenario():
+        subscription = events.subscribe()
+        try:
+            todo = (await asyncio.to_thread(client.post, "/todos", json={"title": "Evented"})).json()
+            await asyncio.to_thread(client.delete, f"/todos/{todo['id']}")
+            created = await asyncio.wait_for(subscription.get(), timeout=2)
+            deleted = await asyncio.wait_for(subscription.get(), timeout=2)
+        finally:
+            events.unsubscribe(subscription)
+        assert created == {"type": "todo.created", "ids": [todo["id"]], "revision": todo["revision"]}
+        assert deleted["type"] == "todo.deleted" and deleted["ids"] == [todo["id"]]
+        assert deleted["revision"] > created["revision"]
+
+    asyncio.run(scenario())
+
+
+def test_publish_async_keeps_network_transports_off_the_event_loop(monkeypatch):
+    class BlockingTransport:
+        threads = []
+
+        def publish(self, event):
+            self.threads.append(threading.current_thread())
+            raise ConnectionError("broker down")
+
+    monkeypatch.setattr(events, "transport", BlockingTransport())
+
+    async def scenario():
+        await events.publish_async("todo", "updated", [1], 7)
+
+    # Runs on a worker thread and, like publish(), swallows transport errors
+    asyncio.run(scenario())
+    assert BlockingTransport.threads and BlockingTransport.threads[0] is not threading.main_thread()
+
+
+def test_postgres_notify_payload_stays_under_the_limit(monkeypatch):
+    sent = []
+
+    class FakeConnection:
+        def exec_driver_sql(self, sql, params):
+            sent.append(params[1])
+
+    class FakeEngine:
+        @contextlib.contextmanager
+        def begin(self):
+            yield FakeConnection()
+
+    monkeypatch.setattr(events, "engine", FakeEngine())
+    transport = events.PostgresTransport(events.broker)
+    # 1000 seven-digit ids come to ~9KB of JSON
+    transport.publish({"type": "todo.reordered", "ids": list(range(1_000_000, 1_001_000)), "revision": 42})
+    transport.publish({"type": "todo.updated", "ids": [1], "revision": 43})
+
+    assert all(len(payload.encode("utf-8")) <= events.NOTIFY_PAYLOAD_LIMIT for payload in sent)
+    assert json.loads(sent[0]) == events.RESYNC
+    assert json.loads(sent[1]) == {"type": "todo.updated", "ids": [1], "revision": 43}
+
+
+def test_event_stream_formats_events_and_stops_on_disconnect():
+    async def scenario():
+        request = FakeRequest()
+        subscription = events.subscribe()
+        stream = event_stream(request, subscription, heartbeat=0.01)
+        assert await stream.__anext__() == "retry: 3000\n\n"
+
+        events.broker.fan_out({"type": "project.updated", "ids": [7], "revision": 12})
+        assert await stream.__anext__() == format_event({"type": "project.updated", "ids": [7], "revision": 12})
+        assert await stream.__anext__() == ": keep-alive\n\n"
+
+        request.disconnected = True
+        chunks = [chunk async for chunk in stream]
+        assert chunks == []
+        assert subscription not in events.broker._subscriptions
+
+    asyncio.run(scenario())
+
+
+def test_format_event():
+    assert format_event({"type": "todo.created", "ids": [1], "revision": 3}) == (
+        'id: 3\nevent: todo.created\ndata: {"type": "todo.created", "ids": [1], "revision": 3}\n\n'
+    )
@@ -0,0 +1,85 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine, insert, text
+from sqlalchemy.orm import Session
+
+from app.database import Base
+from app.models.project import Project
+from app.models.todo import Todo
+from app.repository.pagination import encode_cursor, nulls_sort_high
+from app.repository.project_repo import projects_statement
+from app.repository.todo_repo import todos_statement
+
+
+@pytest.fixture(scope="module")
+def db():
+    """In-memory SQLite with a realistic spread of todos and fresh planner statistics."""
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    base = datetime(2030, 1, 1)
+    rows = [
+        {
+            "title": f"Todo {i}",
+            "status": "pending" if i % 10 == 0 else "completed",
+            "priority": "low",
+            "order": i,
+            "project_id": i % 50 or None,
+            "deadline_at": base + timedelta(days=i % 30) if i % 5 == 0 else None,
+            "completed_at": base + timedelta(minutes=i) if i % 10 else None,
+        }
+        for i in range(2000)
+    ]
+    with engine.begin() as conn:
+        conn.execute(insert(Project), [{"name": f"Project {i}", "status": "active"} for i in range(200)])
+        conn.execute(insert(Todo), rows)
+        conn.execute(text("ANALYZE"))
+    with Session(engine) as session:
+        yield session
+    engine.dispose()
+
+
+def _plan(db, stmt) -> str:
+    """Return SQLite's EXPLAIN QUERY PLAN output for a repository statement."""
+    compiled = stmt.compile(dialect=db.get_bind().dialect, compile_kwargs={"literal_binds": True})
+    rows = db.execute(text(f"EXPLAIN QUERY PLAN {compiled}")).fetchall()
+    return "\n".join(row[-1] for row in rows)
+
+
+def _todos(db, **params):
+    return todos_statement(nulls_sort_high(db), **params)
+
+
+@pytest.mark.parametrize("sort", ["asc", "desc"])
+def test_list_uses_order_index(db, sort):
+    for cursor in (None, encode_cursor(500, 500)):
+        plan = _plan(db, _todos(db, sort=sort, cursor=cursor))
+        assert "ix_todos_order_id" in plan
+        assert "TEMP B-TREE" not in plan
+
+
+def test_project_list_uses_project_index(db):
+    for cursor in (None, encode_cursor(500, 500)):
+        plan = _plan(db, _todos(db, project_id=1, cursor=cursor))
+        assert "ix_todos_project_order_id" in plan
+        assert "TEMP B-TREE" not in plan
+
+
+def test_logbook_uses_status_completed_index(db):
+    plan = _plan(db, _todos(db, status="completed", order_by="completed_at", sort="desc"))
+    assert "ix_todos_status_completed_at" in plan
+
+
+def test_upcoming_uses_deadline_index(db):
+    # The parameters UpcomingPage sends
+    stmt = _todos(
+        db, sort="desc", status_ne="completed", deadline_from=datetime(2030, 1, 2), deadline_before=datetime(2030, 1, 9)
+    )
+    assert "ix_todos_deadline" in _plan(db, stmt)
+
+
+def test_project_pages_follow_the_primary_key(db):
+    assert "TEMP B-TREE" not in _plan(db, projects_statement())
+    plan = _plan(db, projects_statement(cursor=encode_cursor(100)))
+    assert "INTEGER PRIMARY KEY" in plan
+    assert "TEMP B-TREE" not in plan
@@ -0,0 +1,134 @@
+import logging
+import socket
+import threading
+import time
+
+from app.logging_config import TCPLogHandler
+from app.metrics import REGISTRY
+
+
+class LineServer:
+    """Minimal stand-in for Filebeat's TCP input: counts lines and connections."""
+
+    def __init__(self, port: int = 0):
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.sock.bind(("127.0.0.1", port))
+        self.sock.listen()
+        self.port = self.sock.getsockname()[1]
+        self.lines = []
+        self.connections = 0
+        threading.Thread(target=self._serve, daemon=True).start()
+
+    def _serve(self):
+        while True:
+            try:
+                conn, _ = self.sock.accept()
+            except OSError:
+                return
+            self.connections += 1
+            threading.Thread(target=self._read, args=(conn,), daemon=True).start()
+
+    def _read(self, conn):
+        with conn, conn.makefile("rb") as stream:
+            for line in stream:
+                self.lines.append(line)
+
+    def close(self):
+        self.sock.close()
+
+
+def _record(message: str) -> logging.LogRecord:
+    return logging.LogRecord("api", logging.INFO, __file__, 0, message, None, None)
+
+
+def _dropped() -> float:
+    return REGISTRY.get_sample_value("log_records_dropped_total") or 0.0
+
+
+def test_tcp_handler_batches_over_one_connection():
+    server = LineServer()
+    handler = TCPLogHandler("127.0.0.1", server.port)
+    try:
+        start = time.perf_counter()
+        for i in range(5000):
+            handler.emit(_record(f"record {i}"))
+        enqueue_seconds = time.perf_counter() - start
+        assert handler.flush(timeout=10)
+    finally:
+        handler.close()
+
+    deadline = time.monotonic() + 5
+    while len(server.lines) < 5000 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    server.close()
+
+    assert len(server.lines) == 5000
+    assert server.lines[0] == b"record 0\n"
+    assert server.lines[-1] == b"record 4999\n"
+    assert server.connections == 1
+    # emit() must not wait on the network
+    assert enqueue_seconds < 2
+
+
+def test_tcp_handler_drops_oldest_when_endpoint_is_down():
+    # Grab a free port and leave nothing listening on it
+    probe = socket.socket()
+    probe.bind(("127.0.0.1", 0))
+    port = probe.getsockname()[1]
+    probe.close()
+
+    before = _dropped()
+    handler = TCPLogHandler("127.0.0.1", port, max_queue_size=10, close_timeout=0)
+    try:
+        start = time.perf_counter()
+        for i in range(100):
+            handler.emit(_record(f"record {i}"))
+        assert time.perf_counter() - start < 1
+        # The writer may already hold one batch for retry; the rest went over the bound
+        assert _dropped() - before >= 100 - 2 * 10
+        assert list(handler._queue)[-1] == b"record 99\n"
+    finally:
+        handler.close()
+
+
+def test_tcp_handler_reconnects_when_endpoint_comes_back():
+    server = LineServer()
+    port = server.port
+    server.close()
+
+    handler = TCPLogHandler("127.0.0.1", port, max_backoff=0.2)
+    try:
+        handler.emit(_record("queued while down"))
+        time.sleep(0.3)
+        server = LineServer(port)
+
+        handler.emit(_record("after restart"))
+        assert handler.flush(timeout=5)
+    finally:
+        handler.close()
+
+    deadline = time.monotonic() + 5
+    while len(server.lines) < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    server.close()
+    assert server.lines == [b"queued while down\n", b"after restart\n"]
+
+
+def test_tcp_handler_shutdown_does_not_wait_on_an_unreachable_endpoint():
+    probe = socket.socket()
+    probe.bind(("127.0.0.1", 0))
+    port = probe.getsockname()[1]
+    probe.close()
+
+    handler = TCPLogHandler("127.0.0.1", port)
+    handler.emit(_record("never delivered"))
+    deadline = time.monotonic() + 5
+    while not handler._failing and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    # What logging.shutdown() does for each handler
+    start = time.perf_counter()
+    assert not handler.flush()
+    handler.close()
+    assert time.perf_counter() - start < 0.5
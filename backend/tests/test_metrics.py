@@ -0,0 +1,42 @@
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+from app.main import app
+from app.metrics import REGISTRY, UNMATCHED_ENDPOINT, PrometheusMiddleware
+
+client = TestClient(app)
+
+
+def _request_count(endpoint: str, method: str, status: str) -> float:
+    labels = {"service": "mytodoapp", "endpoint": endpoint, "method": method, "status": status}
+    return REGISTRY.get_sample_value("request_count_total", labels) or 0.0
+
+
+def test_metrics_label_requests_by_route_template():
+    before = _request_count("/todos/{todo_id}", "GET", "404")
+    client.get("/todos/999991")
+    client.get("/todos/999992")
+    assert _request_count("/todos/{todo_id}", "GET", "404") == before + 2
+    assert _request_count("/todos/999991", "GET", "404") == 0
+
+
+def test_metrics_collapse_unmatched_paths():
+    before = _request_count(UNMATCHED_ENDPOINT, "GET", "404")
+    client.get("/no-such-path/a")
+    client.get("/no-such-path/b")
+    assert _request_count(UNMATCHED_ENDPOINT, "GET", "404") == before + 2
+    assert _request_count("/no-such-path/a", "GET", "404") == 0
+
+
+def test_metrics_keep_streams_out_of_request_duration():
+    stream_app = FastAPI()
+    stream_app.add_middleware(PrometheusMiddleware, service_name="streams")
+
+    @stream_app.get("/events")
+    def stream():
+        return StreamingResponse(iter(["data: {}\n\n"]), media_type="text/event-stream")
+
+    TestClient(stream_app).get("/events")
+    labels = {"service": "streams", "endpoint": "/events", "method": "GET"}
+    assert REGISTRY.get_sample_value("request_count_total", {**labels, "status": "200"}) == 1
+    assert REGISTRY.get_sample_value("request_duration_seconds_count", labels) is None
@@ -0,0 +1,39 @@
+from sqlalchemy import create_engine, text
+
+from app.database import Base
+from app.migrations import MIGRATIONS, applied_versions, run_migrations
+from app.models.project import Project  # noqa: F401  (register projects table)
+from app.models.todo import Todo  # noqa: F401
+
+
+def test_migrations_run_once_and_convert_legacy_statuses():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(text("INSERT INTO projects (name, status) VALUES ('a', 'undone'), ('b', 'done')"))
+
+    assert run_migrations(engine) == [version for version, _, _ in MIGRATIONS]
+    with engine.connect() as conn:
+        statuses = conn.execute(text("SELECT status FROM projects ORDER BY name")).scalars().all()
+        assert statuses == ["active", "completed"]
+        assert applied_versions(conn) == {version for version, _, _ in MIGRATIONS}
+
+    # Recorded versions are skipped on the next startup
+    with engine.begin() as conn:
+        conn.execute(text("INSERT INTO projects (name, status) VALUES ('c', 'undone')"))
+    assert run_migrations(engine) == []
+    engine.dispose()
+
+
+def test_revision_columns_added_to_existing_tables():
+    engine = create_engine("sqlite://")
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE todos (id INTEGER PRIMARY KEY, title VARCHAR)"))
+        conn.execute(text("CREATE TABLE projects (id INTEGER PRIMARY KEY, name VARCHAR, status VARCHAR)"))
+        conn.execute(text("INSERT INTO todos (title) VALUES ('old')"))
+
+    run_migrations(engine)
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT revision FROM todos")).scalars().all() == [0]
+        assert conn.execute(text("SELECT revision FROM projects")).scalars().all() == []
+    engine.dispose()
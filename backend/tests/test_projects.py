@@ -1,5 +1,7 @@
 from fastapi.testclient import TestClient
 from app.main import app
+from app.repository import project_repo
+from app.repository.pagination import encode_cursor
 
 client = TestClient(app)
 
@@ -32,3 +34,95 @@ def test_update_project():
     response = client.put(f"/projects/{project_id}", json={"name": "Updated Project", "status": "done"})
     assert response.status_code == 200
     assert response.json()["name"] == "Updated Project"
+
+
+def test_project_writes_visible_through_cache():
+    project_id = client.post("/projects", json={"name": "Cached Project", "status": "undone"}).json()["id"]
+    # Warm the cache for both the item and the list
+    assert client.get(f"/projects/{project_id}").json()["name"] == "Cached Project"
+    listed = client.get("/projects", params={"limit": 1000}).json()
+    assert project_id in [p["id"] for p in listed]
+
+    client.put(f"/projects/{project_id}", json={"name": "Cached Project Renamed", "status": "done"})
+    assert client.get(f"/projects/{project_id}").json()["name"] == "Cached Project Renamed"
+    listed = client.get("/projects", params={"limit": 1000}).json()
+    assert {p["id"]: p["status"] for p in listed}[project_id] == "completed"
+
+    new_id = client.post("/projects", json={"name": "Created After Caching"}).json()["id"]
+    assert new_id in [p["id"] for p in client.get("/projects", params={"limit": 1000}).json()]
+
+
+def test_project_read_racing_a_write_does_not_cache_stale_rows(monkeypatch):
+    project_id = client.post("/projects", json={"name": "Racy Project"}).json()["id"]
+    dump_project = project_repo.dump_project
+
+    def dump_then_write(db_project):
+        # The reader has loaded the row; a writer commits (and invalidates) before it is cached
+        stale = dump_project(db_project)
+        monkeypatch.setattr(project_repo, "dump_project", dump_project)
+        client.put(f"/projects/{project_id}", json={"name": "Racy Project Renamed"})
+        return stale
+
+    monkeypatch.setattr(project_repo, "dump_project", dump_then_write)
+    assert client.get(f"/projects/{project_id}").json()["name"] == "Racy Project"
+    assert client.get(f"/projects/{project_id}").json()["name"] == "Racy Project Renamed"
+
+
+def test_project_list_etag_matches_the_cached_body(monkeypatch):
+    project_id = client.post("/projects", json={"name": "ETag Body"}).json()["id"]
+    dump_projects = project_repo.dump_projects
+
+    def dump_then_write(rows):
+        body = dump_projects(rows)
+        monkeypatch.setattr(project_repo, "dump_projects", dump_projects)
+        client.put(f"/projects/{project_id}", json={"name": "ETag Body Renamed"})
+        return body
+
+    monkeypatch.setattr(project_repo, "dump_projects", dump_then_write)
+    stale = client.get("/projects", params={"limit": 1000})
+    assert {p["id"]: p["name"] for p in stale.json()}[project_id] == "ETag Body"
+
+    # The old body went out with the old ETag, so revalidating it fetches the rename
+    fresh = client.get("/projects", params={"limit": 1000}, headers={"If-None-Match": stale.headers["ETag"]})
+    assert fresh.status_code == 200 and fresh.headers["ETag"] != stale.headers["ETag"]
+    assert {p["id"]: p["name"] for p in fresh.json()}[project_id] == "ETag Body Renamed"
+    assert client.get("/projects", params={"limit": 1000}, headers={"If-None-Match": fresh.headers["ETag"]}).status_code == 304
+
+
+def test_get_projects_cursor_pagination():
+    for i in range(3):
+        client.post("/projects", json={"name": f"Cursor Project {i}", "status": "undone"})
+    offset_page = client.get("/projects", params={"limit": 4}).json()
+
+    first = client.get("/projects", params={"limit": 2})
+    cursor = first.headers["X-Next-Cursor"]
+    second = client.get("/projects", params={"limit": 2, "cursor": cursor})
+    assert second.status_code == 200
+    assert [p["id"] for p in first.json() + second.json()] == [p["id"] for p in offset_page]
+    for bad in (["1"], [[1]], [None], [True]):
+        assert client.get("/projects", params={"cursor": encode_cursor(*bad)}).status_code == 400
+
+
+def test_project_reads_answer_if_none_match_with_304():
+    project_id = client.post("/projects", json={"name": "ETag Project"}).json()["id"]
+    etag = client.get(f"/projects/{project_id}").headers["ETag"]
+    assert client.get(f"/projects/{project_id}", headers={"If-None-Match": etag}).status_code == 304
+    assert client.get("/projects", headers={"If-None-Match": etag}).status_code == 304
+
+    client.put(f"/projects/{project_id}", json={"name": "ETag Project Renamed"})
+    response = client.get(f"/projects/{project_id}", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json()["name"] == "ETag Project Renamed"
+
+
+def test_project_writes_do_not_reload_rows(sql_statements):
+    created = client.post("/projects", json={"name": "One trip"})
+    assert created.status_code == 200 and created.json()["status"] == "active"
+    # version bump + INSERT
+    assert len(sql_statements) == 2
+
+    sql_statements.clear()
+    project_id = created.json()["id"]
+    assert client.put(f"/projects/{project_id}", json={"name": "One trip, edited"}).json()["name"] == "One trip, edited"
+    # SELECT the row, version bump, UPDATE
+    assert len(sql_statements) == 3
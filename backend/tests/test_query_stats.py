@@ -0,0 +1,60 @@
+import logging
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+
+from app.database import engine
+from app.logging_config import RequestLoggingMiddleware
+from app.main import app
+from app.metrics import REGISTRY
+from app.middleware.query_stats import QueryStatsMiddleware
+
+
+def _client(**options) -> TestClient:
+    test_app = FastAPI()
+    test_app.add_middleware(
+        RequestLoggingMiddleware, sample_rate=1.0, route_sample_rates={}, slow_request_ms=0, completion_only=True
+    )
+    test_app.add_middleware(QueryStatsMiddleware, **options)
+
+    @test_app.get("/two-queries")
+    def two_queries():
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+            conn.execute(text("SELECT 2"))
+        return {}
+
+    return TestClient(test_app)
+
+
+def _queries_observed(endpoint: str, method: str, sample: str) -> float:
+    labels = {"service": "mytodoapp", "endpoint": endpoint, "method": method}
+    return REGISTRY.get_sample_value(f"db_queries_per_request_{sample}", labels) or 0.0
+
+
+def test_query_stats_recorded_per_route_template():
+    todo_id = TestClient(app).post("/todos", json={"title": "Counted"}).json()["id"]
+    count_before = _queries_observed("/todos/{todo_id}", "GET", "count")
+    sum_before = _queries_observed("/todos/{todo_id}", "GET", "sum")
+
+    TestClient(app).get(f"/todos/{todo_id}")
+
+    assert _queries_observed("/todos/{todo_id}", "GET", "count") == count_before + 1
+    # version read + row read
+    assert _queries_observed("/todos/{todo_id}", "GET", "sum") == sum_before + 2
+
+
+def test_query_stats_in_completion_log(caplog):
+    caplog.set_level(logging.INFO, logger="api")
+    _client(server_timing=False).get("/two-queries")
+    record = next(r for r in caplog.records if r.name == "api")
+    assert record.db_queries == 2
+    assert record.db_time_ms >= 0
+
+
+def test_server_timing_header_is_opt_in():
+    assert "Server-Timing" not in _client(server_timing=False).get("/two-queries").headers
+    header = _client(server_timing=True).get("/two-queries").headers["Server-Timing"]
+    assert header.startswith("db;dur=")
+    assert 'desc="2 queries"' in header and ", app;dur=" in header
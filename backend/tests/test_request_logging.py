@@ -0,0 +1,99 @@
+import logging
+import time
+
+import pytest
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+
+from app.logging_config import RequestLoggingMiddleware, parse_route_sample_rates
+from app.metrics import REGISTRY
+
+
+def _client(**options) -> TestClient:
+    app = FastAPI()
+    app.add_middleware(RequestLoggingMiddleware, **options)
+
+    @app.get("/healthz")
+    def health_check():
+        return {"status": "healthy"}
+
+    @app.get("/todos/{todo_id}")
+    def read_todo(todo_id: int):
+        if todo_id == 0:
+            raise HTTPException(status_code=404, detail="Todo not found")
+        return {"id": todo_id}
+
+    @app.get("/slow")
+    def slow():
+        time.sleep(0.05)
+        return {}
+
+    return TestClient(app)
+
+
+def _lines(caplog) -> list[str]:
+    return [record.getMessage() for record in caplog.records if record.name == "api"]
+
+
+def _sampled_out(rule: str) -> float:
+    return REGISTRY.get_sample_value("log_requests_sampled_out_total", {"rule": rule}) or 0.0
+
+
+@pytest.fixture(autouse=True)
+def _capture_info(caplog):
+    caplog.set_level(logging.INFO, logger="api")
+
+
+def test_parse_route_sample_rates():
+    assert parse_route_sample_rates(" /healthz=0, /todos/=0.25,bogus,/x=abc,/y=7") == {
+        "/healthz": 0.0,
+        "/todos": 0.25,
+        "/y": 1.0,
+    }
+
+
+def test_default_logs_start_and_completion(caplog):
+    client = _client(sample_rate=1.0, route_sample_rates={}, slow_request_ms=0, completion_only=False)
+    client.get("/todos/1")
+    lines = _lines(caplog)
+    assert len(lines) == 2
+    assert lines[0] == "Request started: GET /todos/1"
+    assert lines[1].startswith("Request completed: GET /todos/1 200")
+
+
+def test_completion_only_mode_logs_one_line(caplog):
+    client = _client(sample_rate=1.0, route_sample_rates={}, slow_request_ms=0, completion_only=True)
+    client.get("/todos/1")
+    lines = _lines(caplog)
+    assert len(lines) == 1 and lines[0].startswith("Request completed: GET /todos/1 200")
+
+
+def test_route_rate_samples_out_successes_but_keeps_errors(caplog):
+    client = _client(sample_rate=1.0, route_sample_rates={"/todos": 0.0}, slow_request_ms=0, completion_only=False)
+    before = _sampled_out("/todos")
+
+    client.get("/todos/1")
+    assert _lines(caplog) == []
+    assert _sampled_out("/todos") == before + 1
+
+    client.get("/todos/0")
+    lines = _lines(caplog)
+    assert len(lines) == 1 and lines[0].startswith("Request completed: GET /todos/0 404")
+
+    # Other routes keep the default rate
+    client.get("/healthz")
+    assert "Request started: GET /healthz" in _lines(caplog)
+
+
+def test_slow_requests_are_always_logged(caplog):
+    client = _client(sample_rate=0.0, route_sample_rates={}, slow_request_ms=20, completion_only=True)
+    client.get("/healthz")
+    client.get("/slow")
+    lines = _lines(caplog)
+    assert len(lines) == 1 and lines[0].startswith("Request completed: GET /slow 200")
+
+
+def test_stream_paths_are_not_logged_as_slow(caplog):
+    client = _client(sample_rate=0.0, route_sample_rates={}, slow_request_ms=20, completion_only=True, stream_paths=["/slow"])
+    client.get("/slow")
+    assert _lines(caplog) == []
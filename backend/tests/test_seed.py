@@ -0,0 +1,109 @@
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.pool import StaticPool
+
+from app.database import Base
+from app.migrations import run_migrations
+from app.models.project import Project
+from app.models.tag import Tag, todo_tags
+from app.models.todo import Todo
+from app.repository.todo_repo import decode_sync_token, encode_sync_token, sync_target
+from app.repository.versions import PROJECTS, TODOS, TODOS_SYNC_FLOOR, versions_statement
+from app.seed import MAX_ORDER, SeedConfig, parse_args, parse_weights, reset, seed, todo_rows
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    run_migrations(engine)
+    yield engine
+    engine.dispose()
+
+
+def _dump(engine) -> list[tuple]:
+    with engine.connect() as conn:
+        return [tuple(row) for row in conn.execute(select(Todo.__table__).order_by(Todo.id))]
+
+
+def test_parse_weights():
+    choices = ("pending", "completed", "cancelled")
+    assert parse_weights("pending=3,completed", choices) == {"pending": 3.0, "completed": 1.0, "cancelled": 0.0}
+    for bad in ("done=1", "pending=x", "pending=-1", "pending=0"):
+        with pytest.raises(ValueError):
+            parse_weights(bad, choices)
+
+
+def test_parse_args():
+    config, reset_first = parse_args(["--todos", "10", "--status", "completed=1", "--unassigned", "0", "--reset"])
+    assert reset_first
+    assert config.todos == 10 and config.unassigned == 0
+    assert config.status == {"pending": 0.0, "completed": 1.0, "cancelled": 0.0}
+    with pytest.raises(SystemExit):
+        parse_args(["--unassigned", "2"])
+
+
+def test_seed_writes_configured_rows(engine):
+    config = SeedConfig(projects=20, todos=500, tags=10, status={"completed": 1}, unassigned=0)
+    assert seed(engine, config) == {"projects": 20, "tags": 10, "todos": 500, "todo_tags": pytest.approx(750, rel=0.2)}
+
+    with engine.connect() as conn:
+        todos = conn.execute(select(Todo.status, Todo.project_id, Todo.completed_at, Todo.revision)).all()
+        assert {status for status, *_ in todos} == {"completed"}
+        assert all(project_id is not None and completed_at is not None for _, project_id, completed_at, _ in todos)
+        assert {revision for *_, revision in todos} == {1}
+        orphans = select(func.count()).select_from(todo_tags).where(todo_tags.c.tag_id.not_in(select(Tag.id)))
+        assert conn.execute(orphans).scalar() == 0
+        assert conn.execute(select(func.count()).select_from(Project)).scalar() == 20
+
+
+def test_seed_is_deterministic_and_appends(engine):
+    config = SeedConfig(projects=5, todos=300, tags=5)
+    seed(engine, config)
+    first = _dump(engine)
+
+    seed(engine, SeedConfig(todos=100))
+    assert _dump(engine)[:300] == first
+    assert [row[0] for row in _dump(engine)[300:]] == list(range(301, 401))
+
+    with engine.begin() as conn:
+        reset(conn)
+    seed(engine, config)
+    # Only the revision (the bumped table version) differs between the runs
+    assert [row[:-1] for row in _dump(engine)] == [row[:-1] for row in first]
+
+
+def test_todo_orders_fit_the_integer_column():
+    # Ids past 2.1M used to be scaled straight into the order (id * 1024), overflowing INTEGER
+    rows = todo_rows(SeedConfig(unassigned=0), 3_000_000, 1000, [1, 2], revision=1, last_orders={})
+    assert max(row["order"] for row in rows) <= MAX_ORDER
+    assert max(row["order"] for row in rows) == 1024 * max(
+        sum(row["project_id"] == project_id for row in rows) for project_id in (1, 2)
+    )
+    full = todo_rows(SeedConfig(unassigned=1), 1, 10, [1], revision=1, last_orders={None: MAX_ORDER - 2048})
+    assert max(row["order"] for row in full) == MAX_ORDER
+
+
+def test_seeded_orders_continue_each_project(engine):
+    seed(engine, SeedConfig(projects=2, todos=200, unassigned=0.2))
+    seed(engine, SeedConfig(todos=200, unassigned=0.2))
+    with engine.connect() as conn:
+        for project_id in (None, 1, 2):
+            scope = Todo.project_id.is_(None) if project_id is None else Todo.project_id == project_id
+            orders = conn.execute(select(Todo.order).where(scope).order_by(Todo.id)).scalars().all()
+            assert orders == [1024 * rank for rank in range(1, len(orders) + 1)]
+
+
+def test_reset_retires_etags_and_sync_tokens(engine):
+    seed(engine, SeedConfig(projects=2, todos=10))
+    with engine.begin() as conn:
+        before = dict(conn.execute(versions_statement(TODOS, PROJECTS)).all())
+        reset(conn)
+        after = dict(conn.execute(versions_statement(TODOS, PROJECTS, TODOS_SYNC_FLOOR)).all())
+    assert after[TODOS] > before[TODOS] and after[PROJECTS] > before[PROJECTS]
+    # Tokens issued before the reset fall below the floor and get a 410
+    with pytest.raises(HTTPException) as expired:
+        sync_target(decode_sync_token(encode_sync_token(before[TODOS])), after)
+    assert expired.value.status_code == 410
+    assert sync_target(decode_sync_token(encode_sync_token(after[TODOS])), after) == after[TODOS]
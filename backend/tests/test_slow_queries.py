@@ -0,0 +1,72 @@
+import logging
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import StaticPool
+
+from app.middleware.request_id import RequestIDMiddleware
+from app.query_stats import track_queries
+from app.slow_queries import ExplainLimiter, SlowQueryLog, parameter_shape
+
+
+@pytest.fixture
+def engine():
+    # A zero threshold makes every statement "slow"
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    track_queries(engine, SlowQueryLog(0, explain=True, explain_interval=60))
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE items (id INTEGER PRIMARY KEY, name VARCHAR)"))
+    yield engine
+    engine.dispose()
+
+
+def _records(caplog) -> list[logging.LogRecord]:
+    return [record for record in caplog.records if record.name == "db.slow_query"]
+
+
+def test_parameter_shape_hides_values():
+    assert parameter_shape({"id_1": 5, "name": "secret", "at": None}) == {"id_1": "int", "name": "str", "at": "NoneType"}
+    assert parameter_shape(("secret", 1.5)) == ["str", "float"]
+    assert parameter_shape([{"a": 1}, {"a": 2}], executemany=True) == {"rows": 2, "shape": {"a": "int"}}
+
+
+def test_explain_limiter_allows_each_statement_once_per_interval():
+    now = [0.0]
+    limiter = ExplainLimiter(60, clock=lambda: now[0])
+    assert limiter.allow("SELECT 1") and limiter.allow("SELECT 2")
+    assert not limiter.allow("SELECT 1")
+    now[0] = 61.0
+    assert limiter.allow("SELECT 1")
+
+
+def test_slow_select_logged_with_rate_limited_plan(engine, caplog):
+    caplog.set_level(logging.WARNING, logger="db.slow_query")
+    caplog.clear()
+    for _ in range(2):
+        with engine.connect() as conn:
+            conn.execute(text("SELECT name FROM items WHERE name = :name"), {"name": "secret"}).all()
+
+    first, second = _records(caplog)
+    assert first.getMessage().startswith("Slow query (")
+    assert first.sql == "SELECT name FROM items WHERE name = ?"
+    assert first.parameters == ["str"]
+    assert "secret" not in first.getMessage() and first.duration_ms >= 0
+    assert "items" in first.explain
+    assert not hasattr(second, "explain")
+
+
+def test_slow_query_carries_request_id(engine, caplog):
+    caplog.set_level(logging.WARNING, logger="db.slow_query")
+    app = FastAPI()
+    app.add_middleware(RequestIDMiddleware)
+
+    @app.get("/items")
+    def read_items():
+        with engine.connect() as conn:
+            return conn.execute(text("SELECT id FROM items")).scalars().all()
+
+    caplog.clear()
+    TestClient(app).get("/items", headers={"X-Request-Id": "req-slow-1"})
+    assert [record.request_id for record in _records(caplog)] == ["req-slow-1"]
@@ -1,5 +1,10 @@
+from datetime import timedelta
+
 from fastapi.testclient import TestClient
 from app.main import app
+from app.database import SessionLocal
+from app.repository import todo_repo
+from app.repository.pagination import encode_cursor
 
 client = TestClient(app)
 
@@ -36,3 +41,313 @@ def test_update_todo():
     data = response.json()
     assert data["title"] == "Updated Todo"
     assert data["status"] == "completed"
+
+
+def test_get_todos_cursor_pagination():
+    for i in range(3):
+        client.post("/todos", json={"title": f"Cursor Todo {i}", "priority": "low", "status": "pending", "order": -1000})
+    offset_page = client.get("/todos", params={"limit": 4}).json()
+
+    first = client.get("/todos", params={"limit": 2})
+    assert first.status_code == 200
+    cursor = first.headers["X-Next-Cursor"]
+    second = client.get("/todos", params={"limit": 2, "cursor": cursor})
+    assert second.status_code == 200
+    assert [t["id"] for t in first.json() + second.json()] == [t["id"] for t in offset_page]
+
+
+def test_get_todos_invalid_cursor():
+    response = client.get("/todos", params={"cursor": "not-a-cursor"})
+    assert response.status_code == 400
+
+
+def test_get_todos_cursor_with_wrong_types():
+    # Well-formed base64 JSON of the right length, but the wrong element types
+    for key in ([[1], {}], ["1", 2], [1, "2"], [True, 2]):
+        assert client.get("/todos", params={"cursor": encode_cursor(*key)}).status_code == 400
+    assert client.get("/todos", params={"cursor": encode_cursor(5, 2), "order_by": "completed_at"}).status_code == 400
+    assert client.get("/todos", params={"cursor": encode_cursor(None, 2)}).status_code == 200
+
+
+def test_get_todos_filters():
+    project_id = client.post("/projects", json={"name": "Filter Project", "status": "undone"}).json()["id"]
+    in_project = client.post(
+        "/todos",
+        json={"title": "Filtered", "status": "completed", "project_id": project_id, "deadline_at": "2030-01-02T00:00:00"},
+    ).json()
+    inbox = client.post("/todos", json={"title": "Inbox Todo", "status": "pending"}).json()
+
+    response = client.get("/todos", params={"project_id": project_id, "status": "completed", "limit": 1000})
+    assert [t["id"] for t in response.json()] == [in_project["id"]]
+
+    response = client.get("/todos", params={"project_id": "null", "limit": 1000})
+    ids = [t["id"] for t in response.json()]
+    assert inbox["id"] in ids and in_project["id"] not in ids
+    assert all(t["project_id"] is None for t in response.json())
+
+    response = client.get(
+        "/todos", params={"deadline_from": "2030-01-01T00:00:00", "deadline_before": "2030-01-03T00:00:00", "limit": 1000}
+    )
+    assert in_project["id"] in [t["id"] for t in response.json()]
+
+    cancelled = client.post("/todos", json={"title": "Cancelled", "status": "cancelled", "project_id": project_id}).json()
+    response = client.get("/todos", params={"project_id": project_id, "status_ne": "completed", "limit": 1000})
+    assert [t["id"] for t in response.json()] == [cancelled["id"]]
+
+    response = client.get("/todos", params={"status": "completed", "order_by": "completed_at", "sort": "desc", "limit": 1})
+    assert response.status_code == 200
+    assert response.json()[0]["status"] == "completed"
+
+    assert client.get("/todos", params={"project_id": "abc"}).status_code == 422
+
+
+def test_reorder_todos_reports_missing_ids():
+    first = client.post("/todos", json={"title": "Reorder A", "order": 1}).json()["id"]
+    second = client.post("/todos", json={"title": "Reorder B", "order": 2}).json()["id"]
+    response = client.put(
+        "/todos/reorder",
+        json={"todo_orders": [{"id": first, "order": 20}, {"id": second, "order": 10}, {"id": 999999999, "order": 1}]},
+    )
+    assert response.status_code == 200
+    assert response.json()["updated"] == 2
+    assert response.json()["missing_ids"] == [999999999]
+    assert client.get(f"/todos/{first}").json()["order"] == 20
+    assert client.get(f"/todos/{second}").json()["order"] == 10
+
+
+def test_move_todo_updates_only_moved_rank():
+    project_id = client.post("/projects", json={"name": "Move Project", "status": "undone"}).json()["id"]
+    ids = [
+        client.post("/todos", json={"title": f"Move {i}", "project_id": project_id, "order": (i + 1) * 1024}).json()["id"]
+        for i in range(3)
+    ]
+
+    # Move the last todo between the first two
+    response = client.put(f"/todos/{ids[2]}/move", json={"after_id": ids[0], "before_id": ids[1]})
+    assert response.status_code == 200
+    assert 1024 < response.json()["order"] < 2048
+
+    listed = client.get("/todos", params={"project_id": project_id}).json()
+    assert [t["id"] for t in listed] == [ids[0], ids[2], ids[1]]
+    assert [t["order"] for t in listed if t["id"] != ids[2]] == [1024, 2048]
+
+
+def test_move_todo_requires_a_neighbour():
+    todo_id = client.post("/todos", json={"title": "Nowhere to go"}).json()["id"]
+    for payload in ({}, {"after_id": None, "before_id": None}):
+        assert client.put(f"/todos/{todo_id}/move", json=payload).status_code == 422
+
+
+def test_move_todo_rebalances_when_gap_exhausted():
+    project_id = client.post("/projects", json={"name": "Tight Project", "status": "undone"}).json()["id"]
+    ids = [
+        client.post("/todos", json={"title": f"Tight {i}", "project_id": project_id, "order": i}).json()["id"]
+        for i in range(3)
+    ]
+
+    response = client.put(f"/todos/{ids[2]}/move", json={"after_id": ids[0], "before_id": ids[1]})
+    assert response.status_code == 200
+    listed = client.get("/todos", params={"project_id": project_id}).json()
+    assert [t["id"] for t in listed] == [ids[0], ids[2], ids[1]]
+
+
+def test_todo_reads_answer_if_none_match_with_304():
+    first = client.get("/todos")
+    etag = first.headers["ETag"]
+    assert etag.startswith('W/"todos-')
+
+    cached = client.get("/todos", headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.content == b""
+    assert cached.headers["ETag"] == etag
+
+    todo_id = client.post("/todos", json={"title": "ETag Todo"}).json()["id"]
+    changed = client.get("/todos", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+
+    single = client.get(f"/todos/{todo_id}")
+    assert client.get(f"/todos/{todo_id}", headers={"If-None-Match": single.headers["ETag"]}).status_code == 304
+    client.delete(f"/todos/{todo_id}")
+    assert client.get(f"/todos/{todo_id}", headers={"If-None-Match": single.headers["ETag"]}).status_code == 404
+    # A current tag (or *) must not turn a missing todo into a 304
+    current = client.get("/todos").headers["ETag"]
+    for tag in (current, "*"):
+        assert client.get("/todos/999999999", headers={"If-None-Match": tag}).status_code == 404
+
+
+def test_todo_changes_since_token():
+    snapshot = client.get("/todos/changes")
+    assert snapshot.status_code == 200
+    token = snapshot.json()["token"]
+
+    kept = client.post("/todos", json={"title": "Sync kept"}).json()
+    removed = client.post("/todos", json={"title": "Sync removed"}).json()
+    client.delete(f"/todos/{removed['id']}")
+
+    changes = client.get("/todos/changes", params={"since": token}).json()
+    assert [t["id"] for t in changes["todos"]] == [kept["id"]]
+    assert changes["deleted_ids"] == [removed["id"]]
+    assert changes["todos"][0]["revision"] > 0
+
+    client.put(f"/todos/{kept['id']}", json={"title": "Sync kept, edited"})
+    later = client.get("/todos/changes", params={"since": changes["token"]}).json()
+    assert [t["title"] for t in later["todos"]] == ["Sync kept, edited"]
+    assert later["deleted_ids"] == []
+
+    unchanged = client.get("/todos/changes", params={"since": later["token"]}).json()
+    assert unchanged["todos"] == [] and unchanged["deleted_ids"] == []
+    assert client.get("/todos/changes", params={"since": "not-a-token"}).status_code == 400
+    assert client.get("/todos/changes", params={"since": encode_cursor(True)}).status_code == 400
+
+
+def _sync_pass(since, limit):
+    """Follow ``has_more`` through one pass; return the merged todos/deleted ids, final token and page count."""
+    todos, deleted_ids, pages = [], [], 0
+    while True:
+        page = client.get("/todos/changes", params={"since": since, "limit": limit} if since else {"limit": limit})
+        assert page.status_code == 200
+        body = page.json()
+        todos += body["todos"]
+        deleted_ids += body["deleted_ids"]
+        pages += 1
+        since = body["token"]
+        if not body["has_more"]:
+            return todos, deleted_ids, since, pages
+
+
+def test_todo_changes_pages_through_a_pass():
+    token = client.get("/todos/changes").json()["token"]
+    created = [client.post("/todos", json={"title": f"Paged sync {i}"}).json()["id"] for i in range(5)]
+    for todo_id in created[:3]:
+        client.delete(f"/todos/{todo_id}")
+
+    whole = client.get("/todos/changes", params={"since": token}).json()
+    assert not whole["has_more"]
+    todos, deleted_ids, final, pages = _sync_pass(token, 2)
+    # Both streams page together: 2 todos and 2 of 3 deleted ids, then the last deleted id
+    assert pages == 2
+    assert [t["id"] for t in todos] == [t["id"] for t in whole["todos"]] == created[3:]
+    assert deleted_ids == whole["deleted_ids"] == created[:3]
+    assert final == whole["token"]
+
+    snapshot, _, snapshot_token, _ = _sync_pass(None, 2)
+    assert snapshot_token == final
+    assert {t["id"] for t in snapshot} >= set(created[3:])
+    assert client.get("/todos/changes", params={"limit": 0}).status_code == 422
+
+
+def test_todo_changes_expired_token_requires_resync():
+    token = client.get("/todos/changes").json()["token"]
+    client.delete(f"/todos/{client.post('/todos', json={'title': 'Pruned'}).json()['id']}")
+
+    db = SessionLocal()
+    try:
+        assert todo_repo.prune_todo_deletions(db, now=todo_repo.utcnow() + timedelta(days=365)) >= 1
+    finally:
+        db.close()
+
+    assert client.get("/todos/changes", params={"since": token}).status_code == 410
+    fresh = client.get("/todos/changes").json()["token"]
+    assert client.get("/todos/changes", params={"since": fresh}).status_code == 200
+
+
+def test_batch_create_update_delete():
+    existing = [client.post("/todos", json={"title": f"Batch {i}"}).json() for i in range(3)]
+    response = client.post(
+        "/todos/batch",
+        json={
+            "create": [{"title": "Batch new 0"}, {"title": "Batch new 1", "status": "completed"}],
+            "update": [
+                {"id": existing[0]["id"], "status": "completed"},
+                {"id": 999999999, "title": "Nope"},
+            ],
+            "delete": [existing[1]["id"], 999999998],
+        },
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert (data["created"], data["updated"], data["deleted"]) == (2, 1, 1)
+    assert [(r["op"], r["index"], r["status"]) for r in data["results"]] == [
+        ("create", 0, 201),
+        ("create", 1, 201),
+        ("update", 0, 200),
+        ("update", 1, 404),
+        ("delete", 0, 200),
+        ("delete", 1, 404),
+    ]
+
+    created = data["results"][1]["todo"]
+    assert client.get(f"/todos/{created['id']}").json()["title"] == "Batch new 1"
+    assert created["completed_at"] is not None
+    patched = client.get(f"/todos/{existing[0]['id']}").json()
+    assert patched["title"] == "Batch 0" and patched["completed_at"] is not None
+    assert client.get(f"/todos/{existing[1]['id']}").status_code == 404
+    assert len({r["todo"]["revision"] for r in data["results"] if r.get("todo")}) == 1
+
+    too_many = client.post("/todos/batch", json={"delete": list(range(1001))})
+    assert too_many.status_code == 422
+
+
+def test_batch_update_rejects_null_required_fields():
+    todo = client.post("/todos", json={"title": "Batch not null"}).json()
+    response = client.post(
+        "/todos/batch",
+        json={"create": [{"title": "Not created"}], "update": [{"id": todo["id"], "title": None}]},
+    )
+    # Validation fails the whole batch before anything is written
+    assert response.status_code == 422
+    assert client.get(f"/todos/{todo['id']}").json() == todo
+    assert client.get("/todos").status_code == 200
+
+
+def test_patch_todo_writes_only_supplied_fields():
+    todo = client.post("/todos", json={"title": "Patch me", "description": "Keep", "priority": "high"}).json()
+
+    done = client.patch(f"/todos/{todo['id']}", json={"status": "completed"})
+    assert done.status_code == 200
+    data = done.json()
+    assert (data["title"], data["description"], data["priority"]) == ("Patch me", "Keep", "high")
+    assert data["status"] == "completed" and data["completed_at"] is not None
+    assert data["revision"] > todo["revision"]
+
+    again = client.patch(f"/todos/{todo['id']}", json={"status": "completed", "title": "Renamed"}).json()
+    assert again["completed_at"] == data["completed_at"]
+    assert again["title"] == "Renamed"
+
+    reopened = client.patch(f"/todos/{todo['id']}", json={"status": "pending"}).json()
+    assert reopened["completed_at"] is None
+    assert client.get(f"/todos/{todo['id']}").json() == reopened
+    assert client.patch("/todos/999999999", json={"title": "Missing"}).status_code == 404
+
+
+def test_patch_todo_rejects_null_required_fields():
+    todo = client.post("/todos", json={"title": "Not null", "priority": "high"}).json()
+    for field in ("title", "priority", "status"):
+        assert client.patch(f"/todos/{todo['id']}", json={field: None}).status_code == 422
+    assert client.get(f"/todos/{todo['id']}").json() == todo
+    assert client.get("/todos").status_code == 200
+
+    # Nullable fields can still be cleared, including the rank
+    ranked = client.patch(f"/todos/{todo['id']}", json={"order": 7}).json()
+    cleared = client.patch(f"/todos/{todo['id']}", json={"description": None, "project_id": None, "order": None})
+    assert cleared.status_code == 200
+    assert ranked["order"] == 7 and cleared.json()["order"] is None
+
+
+def test_todo_writes_do_not_reload_rows(sql_statements):
+    created = client.post("/todos", json={"title": "One trip", "status": "completed"})
+    assert created.status_code == 201 and created.json()["completed_at"] is not None
+    # version bump + INSERT
+    assert len(sql_statements) == 2
+
+    sql_statements.clear()
+    todo_id = created.json()["id"]
+    assert client.put(f"/todos/{todo_id}", json={"title": "One trip, edited"}).status_code == 200
+    # SELECT the row, version bump, UPDATE
+    assert len(sql_statements) == 3
+
+    sql_statements.clear()
+    assert client.patch(f"/todos/{todo_id}", json={"status": "completed"}).status_code == 200
+    # version bump, UPDATE ... RETURNING
+    assert len(sql_statements) == 2
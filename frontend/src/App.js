@@ -47,10 +47,7 @@ function Navigation() {
 
   const handleTodoDrop = async (todoId, newProjectId) => {
     try {
-      const existing = await todoService.getTodo(todoId);
-      const full = existing.data;
-      const payload = { ...full, project_id: newProjectId };
-      await todoService.updateTodo(todoId, payload);
+      await todoService.patchTodo(todoId, { project_id: newProjectId });
 
       // Show toast notification
       let message;
@@ -104,8 +104,7 @@ const TodoItem = ({ todo, onTodoUpdated, onTodoDeleted, projects = [] }) => {
     const newStatus = todo.status === "completed" ? "pending" : "completed";
     setIsUpdating(true);
     try {
-      const response = await todoService.updateTodo(todo.id, {
-        ...todo,
+      const response = await todoService.patchTodo(todo.id, {
         status: newStatus,
       });
       if (newStatus === "completed") {
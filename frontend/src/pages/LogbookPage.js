@@ -14,20 +14,16 @@ const LogbookPage = () => {
       try {
         setLoading(true);
         const [todosResponse, projectsResponse] = await Promise.all([
-          todoService.getTodos(),
+          // Completed todos, most recent first, filtered and sorted by the API
+          todoService.getTodos({
+            status: "completed",
+            order_by: "completed_at",
+            sort: "desc",
+          }),
           projectService.getProjects(),
         ]);
 
-        // Filter only completed todos and sort by completion date
-        const completed = todosResponse.data
-          .filter((todo) => todo.status === "completed")
-          .sort((a, b) => {
-            const dateA = new Date(a.completed_at || 0);
-            const dateB = new Date(b.completed_at || 0);
-            return dateB - dateA; // Most recent first
-          });
-
-        setCompletedTodos(completed);
+        setCompletedTodos(todosResponse.data);
         setProjects(projectsResponse.data);
         setError(null);
       } catch (err) {
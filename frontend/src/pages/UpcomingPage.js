@@ -11,8 +11,18 @@ const UpcomingPage = () => {
   useEffect(() => {
     const fetchData = async () => {
       try {
+        // Only fetch todos that are not completed and are due within the next 7 days
+        const start = new Date();
+        start.setHours(0, 0, 0, 0);
+        start.setDate(start.getDate() + 1);
+        const end = new Date(start);
+        end.setDate(end.getDate() + 7);
         const [todosResponse, projectsResponse] = await Promise.all([
-          todoService.getTodos(),
+          todoService.getTodos({
+            status_ne: "completed",
+            deadline_from: start.toISOString(),
+            deadline_before: end.toISOString(),
+          }),
           projectService.getProjects(),
         ]);
         setTodos(todosResponse.data);
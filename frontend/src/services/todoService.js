@@ -20,10 +20,11 @@ client.interceptors.response.use(
   }
 );
 
-const getTodos = ({ skip = 0, limit = 100, sort = "desc" } = {}) => {
+const getTodos = ({ skip = 0, limit = 100, sort = "desc", ...filters } = {}) => {
   // Request newest first by default so recent creations appear without extra single fetch calls.
+  // Extra filters (status, project_id, deadline_from, order_by, ...) are applied server-side.
   return client.get(`/todos`, {
-    params: { skip, limit, sort },
+    params: { skip, limit, sort, ...filters },
   });
 };
 
@@ -39,6 +40,11 @@ const updateTodo = (id, todo) => {
   return client.put(`/todos/${id}`, todo);
 };
 
+// Send only the fields that change, e.g. patchTodo(id, { status: "completed" }).
+const patchTodo = (id, fields) => {
+  return client.patch(`/todos/${id}`, fields);
+};
+
 const deleteTodo = (id) => {
   return client.delete(`/todos/${id}`);
 };
@@ -47,13 +53,54 @@ const reorderTodos = (todoOrders) => {
   return client.put(`/todos/reorder`, { todo_orders: todoOrders });
 };
 
+// Place a todo between two neighbours; only the moved todo is written.
+const moveTodo = (id, { afterId = null, beforeId = null } = {}) => {
+  return client.put(`/todos/${id}/move`, {
+    after_id: afterId,
+    before_id: beforeId,
+  });
+};
+
+// Todos created/updated and ids deleted since `since` (omit for a full snapshot).
+// Resolves to one page, { todos, deleted_ids, token, has_more }; pass `token` as
+// `since` next time, straight away while `has_more` is true. A 410 means the
+// token outlived the server's deletion log: start over without one.
+const getTodoChanges = (since) => {
+  return client.get(`/todos/changes`, { params: since ? { since } : {} });
+};
+
+const CHANGE_EVENT_TYPES = [
+  "todo.created",
+  "todo.updated",
+  "todo.deleted",
+  "todo.reordered",
+  "project.created",
+  "project.updated",
+  "resync",
+];
+
+// Listen for server-sent change events ({ type, ids, revision }); "resync" means
+// events were missed and the caller should catch up with getTodoChanges.
+// Returns a function that closes the stream.
+const subscribeToChanges = (onEvent) => {
+  const source = new EventSource(`${API_URL}/events`);
+  CHANGE_EVENT_TYPES.forEach((type) =>
+    source.addEventListener(type, (e) => onEvent(JSON.parse(e.data)))
+  );
+  return () => source.close();
+};
+
 const todoService = {
   getTodos,
   createTodo,
   getTodo,
   updateTodo,
+  patchTodo,
   deleteTodo,
   reorderTodos,
+  moveTodo,
+  getTodoChanges,
+  subscribeToChanges,
 };
 
 export default todoService;
@@ -1,392 +1,491 @@
 #!/usr/bin/env python3
+"""Open-loop load generator for the MyTodoApp API.
 
-import requests
-import json
-import time
-import random
+Requests are started on a fixed schedule, ``--rate`` per second with
+constant or Poisson inter-arrival times, whether or not earlier requests
+have finished. Each latency is measured from the request's *scheduled*
+start, so a slow server shows up as higher latency instead of quietly
+lowering the request rate (coordinated omission).
+
+Each request runs one scenario, picked at random using the ``--mix``
+weights. A warm-up phase runs at the same rate first, and its results are
+discarded. Latencies go into log-linear histograms (HdrHistogram-style,
+under 1% error). The run prints p50/p90/p99/p99.9 per scenario, and
+``--json`` exports the results so builds can be compared::
+
+    python scripts/load_test.py --rate 100 --duration 60 --warmup 10 --json results.json
+    python scripts/load_test.py --mix list=70,get=30 --arrival constant
+"""
+
+import argparse
+import asyncio
 import datetime
-import concurrent.futures
+import json
 import logging
-import argparse
+import random
 import sys
-from typing import Dict, List, Optional, Any
+from collections import Counter
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+import httpx
 
-# 設定日誌格式，方便 ELK 堆疊分析
 logging.basicConfig(
     level=logging.INFO,
     format='{"timestamp":"%(asctime)s", "level":"%(levelname)s", "message":"%(message)s"}',
     datefmt="%Y-%m-%dT%H:%M:%S%z",
 )
 logger = logging.getLogger(__name__)
+# httpx logs every request at INFO
+logging.getLogger("httpx").setLevel(logging.WARNING)
+
+DEFAULT_MIX = "list=35,get=25,create=10,patch=12,update=6,move=4,delete=3,projects=3,errors=2"
+
+
+class LatencyHistogram:
+    """Log-linear latency histogram in the style of HdrHistogram.
+
+    Values are recorded in microseconds. Each power-of-two range is split into
+    64 linear sub-buckets, which keeps the relative error under 1%, and memory
+    stays small however many values are recorded.
+    """
+
+    SUB_BUCKET_BITS = 7
+
+    def __init__(self):
+        self.counts: Counter = Counter()
+        self.total = 0
+        self.max_us = 0
+        self.sum_us = 0
+
+    def _index(self, value: int) -> int:
+        shift = max(value.bit_length() - self.SUB_BUCKET_BITS, 0)
+        return (shift << self.SUB_BUCKET_BITS) + (value >> shift)
+
+    def _value(self, index: int) -> int:
+        """Midpoint of the bucket at ``index``."""
+        shift, sub = divmod(index, 1 << self.SUB_BUCKET_BITS)
+        return (sub << shift) + ((1 << shift) >> 1)
+
+    def record(self, seconds: float) -> None:
+        value = max(int(seconds * 1_000_000), 0)
+        self.counts[self._index(value)] += 1
+        self.total += 1
+        self.sum_us += value
+        self.max_us = max(self.max_us, value)
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        self.counts.update(other.counts)
+        self.total += other.total
+        self.sum_us += other.sum_us
+        self.max_us = max(self.max_us, other.max_us)
+
+    def percentile(self, percent: float) -> float:
+        """Latency in milliseconds at ``percent`` (0-100)."""
+        if not self.total:
+            return 0.0
+        rank = max(1, round(self.total * percent / 100))
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= rank:
+                return min(self._value(index), self.max_us) / 1000
+        return self.max_us / 1000
+
+    def summary(self) -> dict:
+        return {
+            "p50": self.percentile(50),
+            "p90": self.percentile(90),
+            "p99": self.percentile(99),
+            "p999": self.percentile(99.9),
+            "max": self.max_us / 1000,
+            "mean": self.sum_us / self.total / 1000 if self.total else 0.0,
+        }
 
 
-class ApiLoadTest:
-    def __init__(self, base_url: str = "http://localhost:8000", request_interval: float = 0.5):
-        """
-        初始化負載測試
-        :param base_url: API 的基礎 URL
-        :param request_interval: 每次請求之間的間隔時間 (秒)
-        """
-        self.base_url = base_url
-        self.request_interval = request_interval
-        self.session = requests.Session()
-        self.todo_ids = []
-        self.project_ids = []
-
-    def run_test(self, duration_minutes: int = 5):
-        """
-        運行負載測試
-        :param duration_minutes: 測試持續時間 (分鐘)
-        """
-        logger.info(f"Starting load test for {duration_minutes} minutes with request interval {self.request_interval}s")
-
-        end_time = time.time() + (duration_minutes * 60)
-
-        with concurrent.futures.ThreadPoolExecutor(max_workers=10) as executor:
-            while time.time() < end_time:
-                futures = []
+class ScenarioStats:
+    def __init__(self):
+        self.latency = LatencyHistogram()
+        self.statuses: Counter = Counter()
+        self.errors = 0
+
+    def merge(self, other: "ScenarioStats") -> None:
+        self.latency.merge(other.latency)
+        self.statuses.update(other.statuses)
+        self.errors += other.errors
+
+    def summary(self, elapsed: float) -> dict:
+        return {
+            "requests": self.latency.total,
+            "errors": self.errors,
+            "rps": self.latency.total / elapsed if elapsed else 0.0,
+            "latency_ms": self.latency.summary(),
+            "statuses": {str(status): count for status, count in sorted(self.statuses.items())},
+        }
 
-                # 測試根端點
-                futures.append(executor.submit(self.test_root_endpoint))
 
-                # 測試專案端點
-                futures.append(executor.submit(self.test_projects_endpoints))
+class DataPool:
+    """Todo and project ids known to exist, shared by the scenarios."""
 
-                # 測試待辦事項端點
-                futures.append(executor.submit(self.test_todos_endpoints))
+    def __init__(self, rng: random.Random):
+        self.rng = rng
+        self.todo_ids: List[int] = []
+        self.project_ids: List[int] = []
+        # Last seen (project_id, order) of each todo, so moves can name real neighbours;
+        # None once the server has re-ranked it without telling us the new order
+        self.placements: Dict[int, Optional[Tuple[Optional[int], Optional[int]]]] = {}
 
-                # 測試錯誤案例
-                if random.random() < 0.2:  # 20% 機率測試錯誤案例
-                    futures.append(executor.submit(self.test_error_cases))
+    def add_todos(self, todos: List[dict]) -> None:
+        """Record new todos and refresh the placement of known ones."""
+        for todo in todos:
+            if todo["id"] not in self.placements:
+                self.todo_ids.append(todo["id"])
+            self.placements[todo["id"]] = (todo["project_id"], todo["order"])
 
-                # 等待所有請求完成
-                for future in concurrent.futures.as_completed(futures):
-                    try:
-                        future.result()
-                    except Exception as exc:
-                        logger.error(f"Generated an exception: {exc}")
+    def todo(self) -> Optional[int]:
+        return self.rng.choice(self.todo_ids) if self.todo_ids else None
 
-                # 等待指定間隔
-                time.sleep(self.request_interval)
+    def take_todo(self) -> Optional[int]:
+        """Remove and return a todo id, so no other scenario picks it after it is deleted."""
+        if len(self.todo_ids) <= 1:
+            return None
+        todo_id = self.todo_ids.pop(self.rng.randrange(len(self.todo_ids)))
+        self.placements.pop(todo_id, None)
+        return todo_id
 
-        logger.info("Load test completed")
+    def neighbours(self, todo_id: int) -> Optional[Tuple[int, Optional[int]]]:
+        """``(after_id, before_id)`` for moving ``todo_id`` within its project, or None.
 
-    def test_root_endpoint(self):
-        """測試根端點"""
-        start_time = time.time()
-        try:
-            response = self.session.get(f"{self.base_url}/")
-            elapsed = time.time() - start_time
-            self._log_request("GET", "/", response.status_code, elapsed)
-            return response.json()
-        except Exception as e:
-            elapsed = time.time() - start_time
-            self._log_error("GET", "/", str(e), elapsed)
+        Picks two todos of the same project in list order (the only other
+        todo alone when there is just one, i.e. move to the end). Unranked
+        todos are only paired with each other, since where NULL ranks sort
+        depends on the database; the server ranks them before placing.
+        """
+        placement = self.placements.get(todo_id)
+        if placement is None:
             return None
+        groups: Dict[bool, List[Tuple[int, int]]] = {True: [], False: []}
+        for other_id, other in self.placements.items():
+            if other is not None and other[0] == placement[0] and other_id != todo_id:
+                groups[other[1] is not None].append((other[1] or 0, other_id))
+        others = groups[True] + groups[False]
+        if len(others) == 1:
+            return others[0][1], None
+        candidates = [group for group in groups.values() if len(group) >= 2]
+        if not candidates:
+            return None
+        (_, after_id), (_, before_id) = sorted(self.rng.sample(self.rng.choice(candidates), 2))
+        return after_id, before_id
 
-    def test_projects_endpoints(self):
-        """測試專案相關端點"""
-        # 50% 機率創建新專案
-        if random.random() < 0.5 or not self.project_ids:
-            self._create_project()
-
-        # 獲取專案列表
-        self._get_projects()
-
-        # 如果有專案，50% 機率獲取單個專案
-        if self.project_ids and random.random() < 0.5:
-            project_id = random.choice(self.project_ids)
-            self._get_project(project_id)
-
-            # 30% 機率更新專案
-            if random.random() < 0.3:
-                self._update_project(project_id)
-
-    def test_todos_endpoints(self):
-        """測試待辦事項相關端點"""
-        # 40% 機率創建新待辦事項
-        if random.random() < 0.4 or not self.todo_ids:
-            self._create_todo()
-
-        # 獲取待辦事項列表
-        self._get_todos()
-
-        # 如果有待辦事項，40% 機率獲取單個待辦事項
-        if self.todo_ids and random.random() < 0.4:
-            todo_id = random.choice(self.todo_ids)
-            self._get_todo(todo_id)
-
-            # 30% 機率更新待辦事項
-            if random.random() < 0.3:
-                self._update_todo(todo_id)
-
-            # 10% 機率刪除待辦事項
-            elif random.random() < 0.1:
-                self._delete_todo(todo_id)
-
-    def test_error_cases(self):
-        """測試錯誤案例"""
-        error_tests = [
-            lambda: self._get_project("nonexistent"),
-            lambda: self._get_todo("nonexistent"),
-            lambda: self._create_project(invalid=True),
-            lambda: self._create_todo(invalid=True),
-        ]
-
-        # 隨機選擇一個錯誤測試
-        random.choice(error_tests)()
-
-    def _create_project(self, invalid: bool = False):
-        """創建專案"""
-        if invalid:
-            data = {"wrong_field": "Invalid Project"}
-        else:
-            data = {
-                "name": f"Project {random.randint(1000, 9999)}",
-                "description": f"Test project created at {datetime.datetime.now().isoformat()}",
-            }
-
-        start_time = time.time()
-        try:
-            response = self.session.post(
-                f"{self.base_url}/projects", json=data, headers={"Content-Type": "application/json"}
-            )
-            elapsed = time.time() - start_time
-            self._log_request("POST", "/projects", response.status_code, elapsed)
-
-            if response.status_code == 200:
-                project = response.json()
-                self.project_ids.append(project.get("id"))
-                return project
-        except Exception as e:
-            elapsed = time.time() - start_time
-            self._log_error("POST", "/projects", str(e), elapsed)
-
-        return None
-
-    def _get_projects(self):
-        """獲取專案列表"""
-        start_time = time.time()
-        try:
-            response = self.session.get(f"{self.base_url}/projects")
-            elapsed = time.time() - start_time
-            self._log_request("GET", "/projects", response.status_code, elapsed)
-
-            if response.status_code == 200:
-                projects = response.json()
-                # 更新專案 ID 列表，但保留已有的 ID
-                for project in projects:
-                    if project.get("id") not in self.project_ids:
-                        self.project_ids.append(project.get("id"))
-                return projects
-        except Exception as e:
-            elapsed = time.time() - start_time
-            self._log_error("GET", "/projects", str(e), elapsed)
-
-        return None
-
-    def _get_project(self, project_id: str):
-        """獲取單個專案"""
-        start_time = time.time()
-        try:
-            response = self.session.get(f"{self.base_url}/projects/{project_id}")
-            elapsed = time.time() - start_time
-            self._log_request("GET", f"/projects/{project_id}", response.status_code, elapsed)
-
-            if response.status_code == 200:
-                return response.json()
-        except Exception as e:
-            elapsed = time.time() - start_time
-            self._log_error("GET", f"/projects/{project_id}", str(e), elapsed)
-
-        return None
-
-    def _update_project(self, project_id: str):
-        """更新專案"""
-        data = {
-            "name": f"Updated Project {random.randint(1000, 9999)}",
-            "description": f"Updated at {datetime.datetime.now().isoformat()}",
-        }
-
-        start_time = time.time()
-        try:
-            response = self.session.put(
-                f"{self.base_url}/projects/{project_id}", json=data, headers={"Content-Type": "application/json"}
-            )
-            elapsed = time.time() - start_time
-            self._log_request("PUT", f"/projects/{project_id}", response.status_code, elapsed)
-
-            if response.status_code == 200:
-                return response.json()
-        except Exception as e:
-            elapsed = time.time() - start_time
-            self._log_error("PUT", f"/projects/{project_id}", str(e), elapsed)
-
-        return None
-
-    def _create_todo(self, invalid: bool = False):
-        """創建待辦事項"""
-        if invalid:
-            data = {"wrong_field": "Invalid Todo"}
-        else:
-            # 如果有專案，50% 機率將待辦事項與專案關聯
-            project_id = random.choice(self.project_ids) if self.project_ids and random.random() < 0.5 else None
-
-            data = {
-                "title": f"Todo {random.randint(1000, 9999)}",
-                "description": f"Test todo created at {datetime.datetime.now().isoformat()}",
-                "priority": random.choice(["low", "medium", "high"]),
-                "status": random.choice(["pending", "in_progress", "completed"]),
-                "due_date": (datetime.datetime.now() + datetime.timedelta(days=random.randint(1, 30))).isoformat(),
-            }
-
-            if project_id:
-                data["project_id"] = project_id
-
-        start_time = time.time()
-        try:
-            response = self.session.post(
-                f"{self.base_url}/todos", json=data, headers={"Content-Type": "application/json"}
-            )
-            elapsed = time.time() - start_time
-            self._log_request("POST", "/todos", response.status_code, elapsed)
-
-            if response.status_code == 200:
-                todo = response.json()
-                self.todo_ids.append(todo.get("id"))
-                return todo
-        except Exception as e:
-            elapsed = time.time() - start_time
-            self._log_error("POST", "/todos", str(e), elapsed)
-
-        return None
-
-    def _get_todos(self):
-        """獲取待辦事項列表"""
-        start_time = time.time()
-        try:
-            response = self.session.get(f"{self.base_url}/todos")
-            elapsed = time.time() - start_time
-            self._log_request("GET", "/todos", response.status_code, elapsed)
-
-            if response.status_code == 200:
-                todos = response.json()
-                # 更新待辦事項 ID 列表，但保留已有的 ID
-                for todo in todos:
-                    if todo.get("id") not in self.todo_ids:
-                        self.todo_ids.append(todo.get("id"))
-                return todos
-        except Exception as e:
-            elapsed = time.time() - start_time
-            self._log_error("GET", "/todos", str(e), elapsed)
-
-        return None
-
-    def _get_todo(self, todo_id: str):
-        """獲取單個待辦事項"""
-        start_time = time.time()
-        try:
-            response = self.session.get(f"{self.base_url}/todos/{todo_id}")
-            elapsed = time.time() - start_time
-            self._log_request("GET", f"/todos/{todo_id}", response.status_code, elapsed)
-
-            if response.status_code == 200:
-                return response.json()
-        except Exception as e:
-            elapsed = time.time() - start_time
-            self._log_error("GET", f"/todos/{todo_id}", str(e), elapsed)
-
-        return None
-
-    def _update_todo(self, todo_id: str):
-        """更新待辦事項"""
-        data = {
-            "title": f"Updated Todo {random.randint(1000, 9999)}",
-            "description": f"Updated at {datetime.datetime.now().isoformat()}",
-            "priority": random.choice(["low", "medium", "high"]),
-            "status": random.choice(["pending", "in_progress", "completed"]),
-            "due_date": (datetime.datetime.now() + datetime.timedelta(days=random.randint(1, 30))).isoformat(),
-        }
+    def moved(self, todo: dict, neighbour_ids: Tuple[int, Optional[int]]) -> None:
+        """Record a successful move of ``todo`` placed against ``neighbour_ids``.
 
-        start_time = time.time()
-        try:
-            response = self.session.put(
-                f"{self.base_url}/todos/{todo_id}", json=data, headers={"Content-Type": "application/json"}
-            )
-            elapsed = time.time() - start_time
-            self._log_request("PUT", f"/todos/{todo_id}", response.status_code, elapsed)
-
-            if response.status_code == 200:
-                return response.json()
-        except Exception as e:
-            elapsed = time.time() - start_time
-            self._log_error("PUT", f"/todos/{todo_id}", str(e), elapsed)
-
-        return None
-
-    def _delete_todo(self, todo_id: str):
-        """刪除待辦事項"""
-        start_time = time.time()
+        Placing against an unranked neighbour makes the server rank the whole
+        project, so the project's unranked todos are no longer where we think.
+        """
+        if any(self.placements.get(n) is not None and self.placements[n][1] is None for n in neighbour_ids if n):
+            for other_id, other in self.placements.items():
+                if other is not None and other[0] == todo["project_id"] and other[1] is None:
+                    self.placements[other_id] = None
+        self.add_todos([todo])
+
+    def project(self) -> Optional[int]:
+        return self.rng.choice(self.project_ids) if self.project_ids else None
+
+
+# A scenario issues one request and returns the HTTP status and whether it was expected
+Scenario = Callable[[httpx.AsyncClient, DataPool], Awaitable[Tuple[int, bool]]]
+
+
+def todo_payload(pool: DataPool) -> dict:
+    rng = pool.rng
+    payload = {
+        "title": f"Todo {rng.randint(1000, 9999)}",
+        "description": f"Load test todo created at {datetime.datetime.now().isoformat()}",
+        "priority": rng.choice(["low", "medium", "high", "urgent"]),
+        "status": rng.choice(["pending", "pending", "pending", "completed"]),
+    }
+    if rng.random() < 0.3:
+        payload["deadline_at"] = (datetime.datetime.now() + datetime.timedelta(days=rng.randint(1, 30))).isoformat()
+    project_id = pool.project()
+    if project_id is not None and rng.random() < 0.5:
+        payload["project_id"] = project_id
+    return payload
+
+
+async def list_todos(client: httpx.AsyncClient, pool: DataPool) -> Tuple[int, bool]:
+    params = {"limit": 50}
+    project_id = pool.project()
+    if project_id is not None and pool.rng.random() < 0.5:
+        params["project_id"] = project_id
+    response = await client.get("/todos", params=params)
+    return response.status_code, response.status_code == 200
+
+
+async def get_todo(client: httpx.AsyncClient, pool: DataPool) -> Tuple[int, bool]:
+    response = await client.get(f"/todos/{pool.todo()}")
+    # The todo may have been deleted by a concurrent request
+    return response.status_code, response.status_code in (200, 404)
+
+
+async def create_todo(client: httpx.AsyncClient, pool: DataPool) -> Tuple[int, bool]:
+    response = await client.post("/todos", json=todo_payload(pool))
+    if response.status_code == 201:
+        pool.add_todos([response.json()])
+    return response.status_code, response.status_code == 201
+
+
+async def patch_todo(client: httpx.AsyncClient, pool: DataPool) -> Tuple[int, bool]:
+    status = pool.rng.choice(["pending", "completed"])
+    response = await client.patch(f"/todos/{pool.todo()}", json={"status": status})
+    if response.status_code == 200:
+        pool.add_todos([response.json()])
+    return response.status_code, response.status_code in (200, 404)
+
+
+async def update_todo(client: httpx.AsyncClient, pool: DataPool) -> Tuple[int, bool]:
+    response = await client.put(f"/todos/{pool.todo()}", json=todo_payload(pool))
+    if response.status_code == 200:
+        pool.add_todos([response.json()])
+    return response.status_code, response.status_code in (200, 404)
+
+
+async def move_todo(client: httpx.AsyncClient, pool: DataPool) -> Tuple[int, bool]:
+    todo_id = pool.todo()
+    neighbours = pool.neighbours(todo_id) if todo_id is not None else None
+    if neighbours is None:
+        return await create_todo(client, pool)
+    after_id, before_id = neighbours
+    response = await client.put(f"/todos/{todo_id}/move", json={"after_id": after_id, "before_id": before_id})
+    if response.status_code == 200:
+        pool.moved(response.json(), neighbours)
+    # Concurrent writes or a re-rank may have deleted, moved or re-homed a neighbour since it was seen
+    return response.status_code, response.status_code in (200, 400, 404)
+
+
+async def delete_todo(client: httpx.AsyncClient, pool: DataPool) -> Tuple[int, bool]:
+    todo_id = pool.take_todo()
+    if todo_id is None:
+        return await create_todo(client, pool)
+    response = await client.delete(f"/todos/{todo_id}")
+    return response.status_code, response.status_code in (200, 404)
+
+
+async def read_projects(client: httpx.AsyncClient, pool: DataPool) -> Tuple[int, bool]:
+    project_id = pool.project()
+    if project_id is not None and pool.rng.random() < 0.5:
+        response = await client.get(f"/projects/{project_id}")
+    else:
+        response = await client.get("/projects")
+    return response.status_code, response.status_code == 200
+
+
+async def error_cases(client: httpx.AsyncClient, pool: DataPool) -> Tuple[int, bool]:
+    """Deliberate client errors (unknown ids, invalid bodies) to exercise 4xx metrics and alerts."""
+    case = pool.rng.randrange(3)
+    if case == 0:
+        response = await client.get("/todos/0")
+        return response.status_code, response.status_code == 404
+    if case == 1:
+        response = await client.post("/todos", json={"wrong_field": "Invalid Todo"})
+    else:
+        response = await client.post("/todos", json={"title": "Bad status", "status": "in_progress"})
+    return response.status_code, response.status_code == 422
+
+
+SCENARIOS: Dict[str, Scenario] = {
+    "list": list_todos,
+    "get": get_todo,
+    "create": create_todo,
+    "patch": patch_todo,
+    "update": update_todo,
+    "move": move_todo,
+    "delete": delete_todo,
+    "projects": read_projects,
+    "errors": error_cases,
+}
+
+
+def parse_mix(value: str) -> Dict[str, float]:
+    """Parse ``name=weight,...`` into scenario weights."""
+    mix = {}
+    for item in value.split(","):
+        name, _, weight = item.partition("=")
+        name = name.strip()
+        if name not in SCENARIOS:
+            raise argparse.ArgumentTypeError(f"unknown scenario {name!r}; choose from {', '.join(SCENARIOS)}")
         try:
-            response = self.session.delete(f"{self.base_url}/todos/{todo_id}")
-            elapsed = time.time() - start_time
-            self._log_request("DELETE", f"/todos/{todo_id}", response.status_code, elapsed)
-
-            if response.status_code == 200:
-                # 從列表中移除已刪除的待辦事項 ID
-                if todo_id in self.todo_ids:
-                    self.todo_ids.remove(todo_id)
-                return {"success": True}
-        except Exception as e:
-            elapsed = time.time() - start_time
-            self._log_error("DELETE", f"/todos/{todo_id}", str(e), elapsed)
-
-        return None
-
-    def _log_request(self, method: str, endpoint: str, status_code: int, elapsed: float):
-        """記錄 API 請求"""
-        logger.info(
-            json.dumps(
-                {
-                    "type": "API request",
-                    "method": method,
-                    "endpoint": endpoint,
-                    "status_code": status_code,
-                    "response_time": round(elapsed, 4),
-                    "timestamp": datetime.datetime.now().isoformat(),
-                }
-            )
-        )
-
-    def _log_error(self, method: str, endpoint: str, error: str, elapsed: float):
-        """記錄 API 錯誤"""
-        logger.error(
-            json.dumps(
-                {
-                    "type": "API error",
-                    "method": method,
-                    "endpoint": endpoint,
-                    "error": error,
-                    "response_time": round(elapsed, 4),
-                    "timestamp": datetime.datetime.now().isoformat(),
-                }
-            )
+            mix[name] = float(weight)
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"invalid weight for {name!r}: {weight!r}")
+    if not any(weight > 0 for weight in mix.values()):
+        raise argparse.ArgumentTypeError("at least one scenario needs a positive weight")
+    return mix
+
+
+class LoadGenerator:
+    """Issues scenarios at a fixed arrival rate and records their latency from the scheduled start."""
+
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        mix: Dict[str, float],
+        rate: float,
+        arrival: str = "poisson",
+        max_in_flight: int = 256,
+        seed: Optional[int] = None,
+    ):
+        self.client = client
+        self.names = [name for name, weight in mix.items() if weight > 0]
+        self.weights = [mix[name] for name in self.names]
+        self.rate = rate
+        self.arrival = arrival
+        self.rng = random.Random(seed)
+        self.pool = DataPool(self.rng)
+        self.in_flight = asyncio.Semaphore(max_in_flight)
+        self.stats: Dict[str, ScenarioStats] = {}
+
+    async def prime(self, min_todos: int = 20) -> None:
+        """Collect existing ids, creating a few todos if the database is empty."""
+        projects = await self.client.get("/projects", params={"limit": 500})
+        projects.raise_for_status()
+        self.pool.project_ids = [project["id"] for project in projects.json()]
+        todos = await self.client.get("/todos", params={"limit": 1000})
+        todos.raise_for_status()
+        self.pool.add_todos(todos.json())
+        while len(self.pool.todo_ids) < min_todos:
+            await create_todo(self.client, self.pool)
+
+    def _next_interval(self) -> float:
+        if self.arrival == "constant":
+            return 1.0 / self.rate
+        return self.rng.expovariate(self.rate)
+
+    async def _issue(self, name: str, scheduled: float) -> None:
+        stats = self.stats.setdefault(name, ScenarioStats())
+        loop = asyncio.get_running_loop()
+        async with self.in_flight:
+            try:
+                status, expected = await SCENARIOS[name](self.client, self.pool)
+            except httpx.HTTPError as exc:
+                stats.statuses[type(exc).__name__] += 1
+                stats.errors += 1
+            else:
+                stats.statuses[status] += 1
+                if not expected:
+                    stats.errors += 1
+        stats.latency.record(loop.time() - scheduled)
+
+    async def run_phase(self, duration: float) -> Tuple[Dict[str, ScenarioStats], float]:
+        """Run the mix for ``duration`` seconds and return per-scenario stats and the elapsed time."""
+        self.stats = {}
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        scheduled = start
+        tasks = set()
+        while True:
+            scheduled += self._next_interval()
+            if scheduled - start >= duration:
+                break
+            delay = scheduled - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            name = self.rng.choices(self.names, self.weights)[0]
+            task = asyncio.create_task(self._issue(name, scheduled))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+        if tasks:
+            await asyncio.gather(*tasks)
+        return self.stats, loop.time() - start
+
+
+def summarize(stats: Dict[str, ScenarioStats], elapsed: float) -> dict:
+    total = ScenarioStats()
+    for scenario_stats in stats.values():
+        total.merge(scenario_stats)
+    return {
+        "elapsed_seconds": elapsed,
+        "total": total.summary(elapsed),
+        "scenarios": {name: stats[name].summary(elapsed) for name in sorted(stats)},
+    }
+
+
+def print_report(results: dict, target_rate: float) -> None:
+    total = results["total"]
+    print(
+        f"\n{total['requests']} requests in {results['elapsed_seconds']:.1f}s: "
+        f"{total['rps']:.1f} req/s (target {target_rate:.1f}), {total['errors']} errors"
+    )
+    header = (
+        f"{'scenario':<10} {'reqs':>7} {'errors':>7} {'p50 ms':>9} {'p90 ms':>9} "
+        f"{'p99 ms':>9} {'p99.9 ms':>9} {'max ms':>9}"
+    )
+    print(header)
+    print("-" * len(header))
+    rows = list(results["scenarios"].items()) + [("total", total)]
+    for name, summary in rows:
+        latency = summary["latency_ms"]
+        print(
+            f"{name:<10} {summary['requests']:>7} {summary['errors']:>7} {latency['p50']:>9.2f} "
+            f"{latency['p90']:>9.2f} {latency['p99']:>9.2f} {latency['p999']:>9.2f} {latency['max']:>9.2f}"
         )
 
 
-if __name__ == "__main__":
-    parser = argparse.ArgumentParser(description="Load testing tool for MyTodoApp API")
-    parser.add_argument("duration", nargs="?", type=int, default=5, help="Test duration in minutes (default: 5)")
+async def run(args) -> dict:
+    limits = httpx.Limits(max_connections=args.max_in_flight, max_keepalive_connections=args.max_in_flight)
+    async with httpx.AsyncClient(base_url=args.url, timeout=args.timeout, limits=limits) as client:
+        generator = LoadGenerator(client, args.mix, args.rate, args.arrival, args.max_in_flight, args.seed)
+        await generator.prime()
+        if args.warmup > 0:
+            logger.info(f"Warming up for {args.warmup}s at {args.rate} req/s")
+            await generator.run_phase(args.warmup)
+        logger.info(f"Measuring for {args.duration}s at {args.rate} req/s")
+        stats, elapsed = await generator.run_phase(args.duration)
+    return summarize(stats, elapsed)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Open-loop load generator for the MyTodoApp API")
+    parser.add_argument("--url", default="http://localhost:8000", help="API base URL (default: http://localhost:8000)")
+    parser.add_argument("--rate", type=float, default=50.0, help="Target requests per second (default: 50)")
+    parser.add_argument("--duration", type=float, default=60.0, help="Measured seconds (default: 60)")
+    parser.add_argument("--warmup", type=float, default=10.0, help="Unmeasured warm-up seconds (default: 10)")
     parser.add_argument(
-        "interval", nargs="?", type=float, default=0.5, help="Request interval in seconds (default: 0.5)"
+        "--arrival", choices=["poisson", "constant"], default="poisson", help="Inter-arrival times (default: poisson)"
     )
     parser.add_argument(
-        "--url", type=str, default="http://localhost:8000", help="API base URL (default: http://localhost:8000)"
+        "--mix", type=parse_mix, default=parse_mix(DEFAULT_MIX), help=f"Scenario weights (default: {DEFAULT_MIX})"
     )
+    parser.add_argument("--max-in-flight", type=int, default=256, help="Concurrent request limit (default: 256)")
+    parser.add_argument("--timeout", type=float, default=10.0, help="Per-request timeout in seconds (default: 10)")
+    parser.add_argument("--seed", type=int, default=None, help="Random seed for arrivals and scenario choice")
+    parser.add_argument("--json", dest="json_path", help="Write the results to this JSON file")
+    args = parser.parse_args(argv)
+    if args.rate <= 0:
+        parser.error("--rate must be positive")
+
+    started_at = datetime.datetime.now(datetime.timezone.utc).isoformat()
+    results = asyncio.run(run(args))
+    print_report(results, args.rate)
+    if args.json_path:
+        output = {
+            "config": {
+                "url": args.url,
+                "rate": args.rate,
+                "duration": args.duration,
+                "warmup": args.warmup,
+                "arrival": args.arrival,
+                "mix": args.mix,
+                "max_in_flight": args.max_in_flight,
+                "seed": args.seed,
+                "started_at": started_at,
+            },
+            "results": results,
+        }
+        with open(args.json_path, "w") as f:
+            json.dump(output, f, indent=2)
+        logger.info(f"Results written to {args.json_path}")
+    return 0
 
-    args = parser.parse_args()
-
-    print(f"Starting load test for {args.duration} minutes with request interval {args.interval}s")
 
-    load_tester = ApiLoadTest(base_url=args.url, request_interval=args.interval)
-    load_tester.run_test(duration_minutes=args.duration)
+if __name__ == "__main__":
+    sys.exit(main())
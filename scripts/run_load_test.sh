@@ -5,7 +5,7 @@ echo "This will generate metrics for Prometheus and logs for the ELK stack."
 
 # 設置默認參數
 DURATION=${1:-5}  # 預設運行 5 分鐘
-INTERVAL=${2:-0.5}  # 預設 0.5 秒請求間隔
+RATE=${2:-20}  # 預設每秒 20 個請求
 API_URL="http://localhost:8000"  # 預設 API URL
 
 # 檢查 Python 是否安裝
@@ -16,11 +16,11 @@ fi
 
 # 安裝必要的 Python 套件（如果尚未安裝）
 echo "Checking and installing required Python packages..."
-pip3 install requests --quiet
+pip3 install httpx --quiet
 
 # 執行負載測試
-echo "Running load test for $DURATION minutes with $INTERVAL second intervals..."
-python3 "$(dirname "$0")/load_test.py" $DURATION $INTERVAL --url $API_URL
+echo "Running load test for $DURATION minutes at $RATE requests/second..."
+python3 "$(dirname "$0")/load_test.py" --duration $((DURATION * 60)) --rate $RATE --url $API_URL
 
 echo "Load test completed!"
 echo ""